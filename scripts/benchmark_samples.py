@@ -0,0 +1,254 @@
+"""
+Times `ssort` on each of the samples in `test_data/samples`, end to end and
+in each phase, and compares the results of two runs.
+
+Typical use is to record a baseline on one commit, and a candidate on
+another, on the same machine:
+
+    $ python scripts/benchmark_samples.py run -o baseline.json
+    $ git checkout my-branch
+    $ python scripts/benchmark_samples.py run -o candidate.json
+    $ python scripts/benchmark_samples.py compare baseline.json candidate.json
+
+`compare` exits with an error status if any timing got significantly slower.
+"""
+
+import argparse
+import json
+import math
+import pathlib
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from ssort import ssort
+from ssort._phases import PhaseRecorder, recording
+
+_SAMPLES_DIR = pathlib.Path(__file__).parent.parent / "test_data" / "samples"
+
+
+def _ignore(**kwargs):
+    pass
+
+
+def _commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            encoding="utf-8",
+            check=True,
+            cwd=pathlib.Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def _time_sample(text, *, filename, warmup, repeat):
+    def _run():
+        recorder = PhaseRecorder()
+        start = time.perf_counter()
+        with recording(recorder):
+            ssort(text, filename=filename, on_wildcard_import=_ignore)
+        return time.perf_counter() - start, recorder.totals()
+
+    for _ in range(warmup):
+        _run()
+
+    totals = []
+    phases = {}
+    for _ in range(repeat):
+        total, phase_totals = _run()
+        totals.append(total)
+        for name, seconds in phase_totals.items():
+            phases.setdefault(name, []).append(seconds)
+
+    return {"total": totals, "phases": phases}
+
+
+def _run_command(args):
+    paths = sorted(_SAMPLES_DIR.glob("*_input.py"))
+    if args.sample:
+        paths = [
+            path
+            for path in paths
+            if path.name[: -len("_input.py")] in args.sample
+        ]
+
+    samples = {}
+    for path in paths:
+        name = path.name[: -len("_input.py")]
+        samples[name] = _time_sample(
+            path.read_bytes(),
+            filename=str(path),
+            warmup=args.warmup,
+            repeat=args.repeat,
+        )
+        sys.stderr.write(
+            f"{name}: {statistics.median(samples[name]['total']) * 1e3:.2f}"
+            " ms\n"
+        )
+
+    document = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "samples": samples,
+    }
+    args.output.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def _mann_whitney_p(baseline, candidate):
+    """
+    Returns the probability of timings at least as much slower as `candidate`
+    is than `baseline` if there was no real difference, using a one-sided
+    Mann-Whitney U test with the normal approximation.  The test makes no
+    assumptions about the distribution of timings, which are usually skewed
+    by outliers.
+    """
+    combined = sorted(
+        [(value, 0) for value in baseline]
+        + [(value, 1) for value in candidate]
+    )
+
+    # Assign ranks, averaging over ties.
+    ranks = [0.0] * len(combined)
+    start = 0
+    while start < len(combined):
+        end = start
+        while end < len(combined) and combined[end][0] == combined[start][0]:
+            end += 1
+        for index in range(start, end):
+            ranks[index] = (start + end + 1) / 2
+        start = end
+
+    n1 = len(candidate)
+    n2 = len(baseline)
+    rank_sum = sum(
+        rank for rank, (_, group) in zip(ranks, combined) if group == 1
+    )
+    u = rank_sum - n1 * (n1 + 1) / 2
+
+    mean = n1 * n2 / 2
+    deviation = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    if not deviation:
+        return 1.0
+    z = (u - mean) / deviation
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _compare_timings(label, baseline, candidate, *, alpha, threshold):
+    baseline_median = statistics.median(baseline)
+    candidate_median = statistics.median(candidate)
+    ratio = candidate_median / baseline_median if baseline_median else 1.0
+    p = _mann_whitney_p(baseline, candidate)
+
+    regressed = p < alpha and ratio > 1 + threshold
+    marker = "REGRESSION" if regressed else ""
+    sys.stdout.write(
+        f"{label:<50}{baseline_median * 1e3:>10.3f}"
+        f"{candidate_median * 1e3:>10.3f}{ratio:>8.2f}x{p:>8.3f}  {marker}\n"
+    )
+    return regressed
+
+
+def _compare_command(args):
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+
+    sys.stdout.write(
+        f"{'timing':<50}{'base ms':>10}{'cand ms':>10}{'ratio':>9}{'p':>8}\n"
+    )
+
+    regressions = 0
+    for name, candidate_sample in sorted(candidate["samples"].items()):
+        baseline_sample = baseline["samples"].get(name)
+        if baseline_sample is None:
+            continue
+
+        regressions += _compare_timings(
+            name,
+            baseline_sample["total"],
+            candidate_sample["total"],
+            alpha=args.alpha,
+            threshold=args.threshold,
+        )
+        for phase, timings in sorted(candidate_sample["phases"].items()):
+            if phase not in baseline_sample["phases"]:
+                continue
+            regressions += _compare_timings(
+                f"  {phase}",
+                baseline_sample["phases"][phase],
+                timings,
+                alpha=args.alpha,
+                threshold=args.threshold,
+            )
+
+    if regressions:
+        sys.stdout.write(f"{regressions} significant regressions\n")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks ssort against the bundled samples"
+    )
+    subparsers = parser.add_subparsers(required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="Time each sample and write the results as JSON"
+    )
+    run_parser.set_defaults(command=_run_command)
+    run_parser.add_argument(
+        "-o",
+        "--output",
+        type=pathlib.Path,
+        default=pathlib.Path("benchmark.json"),
+        help="Where to write the results",
+    )
+    run_parser.add_argument(
+        "--warmup",
+        type=int,
+        default=3,
+        help="Number of untimed runs of each sample before timing it",
+    )
+    run_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=20,
+        help="Number of timed runs of each sample",
+    )
+    run_parser.add_argument(
+        "--sample",
+        action="append",
+        help="Only time the named sample.  Can be given more than once",
+    )
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare the results of two runs"
+    )
+    compare_parser.set_defaults(command=_compare_command)
+    compare_parser.add_argument("baseline", type=pathlib.Path)
+    compare_parser.add_argument("candidate", type=pathlib.Path)
+    compare_parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.01,
+        help="Significance level below which a slowdown is reported",
+    )
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.05,
+        help="Smallest relative slowdown in the median that is reported",
+    )
+
+    args = parser.parse_args()
+    args.command(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Measures how the time and memory taken by `ssort` grow with the size of its
+input, using modules from `generate_module.py`.
+
+For each size, prints the best time from several runs, the peak memory
+allocated during a separate run, and the exponent `k` such that the cost grows
+like `size ** k` since the previous size.  An exponent that creeps towards 2
+means that something has become quadratic.
+
+    $ python scripts/benchmark_scaling.py --sizes 500 1000 2000 4000
+    $ python scripts/benchmark_scaling.py --classes 0.1 --methods 20
+
+`--output` also writes the results as CSV, for plotting.
+"""
+
+import argparse
+import csv
+import math
+import pathlib
+import sys
+import time
+import tracemalloc
+
+from generate_module import generate
+
+from ssort import ssort
+from ssort._phases import PhaseRecorder, recording
+
+
+def _ignore(**kwargs):
+    pass
+
+
+def _sort(text):
+    ssort(text, on_unresolved=_ignore, on_wildcard_import=_ignore)
+
+
+def _measure(text, *, repeat):
+    times = []
+    for _ in range(repeat):
+        recorder = PhaseRecorder()
+        start = time.perf_counter()
+        with recording(recorder):
+            _sort(text)
+        times.append((time.perf_counter() - start, recorder.totals()))
+    seconds, phases = min(times, key=lambda result: result[0])
+
+    # Tracing allocations slows everything down, so memory is measured
+    # separately from time.
+    tracemalloc.start()
+    try:
+        _sort(text)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return seconds, peak, phases
+
+
+def _exponent(size, value, previous):
+    if previous is None:
+        return ""
+    previous_size, previous_value = previous
+    if not previous_value or not value:
+        return ""
+    exponent = math.log(value / previous_value) / math.log(
+        size / previous_size
+    )
+    return f"{exponent:.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measures how ssort scales with the size of its input"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[250, 500, 1000, 2000, 4000],
+        help="Numbers of top level functions to generate",
+    )
+    parser.add_argument(
+        "--classes",
+        type=float,
+        default=0.0,
+        help="Number of classes to generate per function",
+    )
+    parser.add_argument(
+        "--methods", type=int, default=0, help="Number of methods per class"
+    )
+    parser.add_argument(
+        "--density",
+        type=float,
+        default=2.0,
+        help="Average number of dependencies of each function and method",
+    )
+    parser.add_argument(
+        "--cycles",
+        type=float,
+        default=0.01,
+        help="Number of rings of mutually recursive functions per function",
+    )
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=0,
+        help="Number of blocks nested inside each function",
+    )
+    parser.add_argument(
+        "--overloads",
+        type=int,
+        default=0,
+        help="Number of overload stubs before each function",
+    )
+    parser.add_argument(
+        "--literals",
+        type=float,
+        default=0.0,
+        help="Number of list literals per function",
+    )
+    parser.add_argument(
+        "--literal-size",
+        type=int,
+        default=10,
+        help="Number of items in each list literal",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of timed runs at each size",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=pathlib.Path,
+        help="Also write the results to this CSV file",
+    )
+
+    args = parser.parse_args()
+
+    rows = []
+    previous_time = None
+    previous_memory = None
+    sys.stdout.write(
+        f"{'size':>8}{'bytes':>12}{'seconds':>10}{'k':>6}"
+        f"{'peak MB':>10}{'k':>6}  slowest phase\n"
+    )
+    for size in args.sizes:
+        text = generate(
+            statements=size,
+            classes=round(size * args.classes),
+            methods=args.methods,
+            density=args.density,
+            cycles=round(size * args.cycles),
+            depth=args.depth,
+            overloads=args.overloads,
+            literals=round(size * args.literals),
+            literal_size=args.literal_size,
+        )
+        seconds, peak, phases = _measure(text, repeat=args.repeat)
+        slowest = max(phases, key=phases.__getitem__)
+
+        sys.stdout.write(
+            f"{size:>8}{len(text):>12}{seconds:>10.3f}"
+            f"{_exponent(size, seconds, previous_time):>6}"
+            f"{peak / 1e6:>10.1f}"
+            f"{_exponent(size, peak, previous_memory):>6}"
+            f"  {slowest} {phases[slowest]:.3f}s\n"
+        )
+        previous_time = size, seconds
+        previous_memory = size, peak
+        rows.append(
+            {
+                "size": size,
+                "bytes": len(text),
+                "seconds": seconds,
+                "peak_bytes": peak,
+                **{f"{name}_seconds": value for name, value in phases.items()},
+            }
+        )
+
+    if args.output is not None:
+        fieldnames = list(dict.fromkeys(name for row in rows for name in row))
+        with args.output.open("w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
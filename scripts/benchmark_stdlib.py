@@ -0,0 +1,201 @@
+"""
+Measures the throughput of `ssort --check` over the standard library of the
+interpreter that runs this script, which is a large and varied corpus that is
+available everywhere without a network connection.
+
+Each configuration runs ssort in a fresh process, with `--stats` so that time
+can be broken down by phase, and reports files and megabytes per second, the
+number of files that were unsorted, unchanged or could not be sorted, and the
+total time spent in each phase:
+
+    $ python scripts/benchmark_stdlib.py
+    $ python scripts/benchmark_stdlib.py --config serial --config processes
+
+Installed packages in `site-packages` are not part of the corpus.
+"""
+
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+import sysconfig
+import tempfile
+import time
+
+from ssort._phases import phase_order
+
+_EXCLUDED = {"site-packages", "dist-packages", "__pycache__"}
+
+_CONFIGURATIONS = {
+    "serial": lambda jobs, cache_dir: [],
+    "threads": lambda jobs, cache_dir: [
+        f"--jobs={jobs}",
+        "--executor=thread",
+    ],
+    "processes": lambda jobs, cache_dir: [
+        f"--jobs={jobs}",
+        "--executor=process",
+    ],
+    "cold-cache": lambda jobs, cache_dir: [f"--cache-dir={cache_dir}"],
+    "warm-cache": lambda jobs, cache_dir: [f"--cache-dir={cache_dir}"],
+}
+
+
+def _corpus(stdlib):
+    # Files are passed to ssort explicitly, rather than as directories, so
+    # that they are not skipped if the interpreter happens to be installed in
+    # a directory that git ignores.
+    return sorted(
+        path
+        for path in stdlib.rglob("*.py")
+        if _EXCLUDED.isdisjoint(path.relative_to(stdlib).parts)
+        and path.is_file()
+    )
+
+
+def _parse_stats(stderr):
+    # The table printed by `--stats` starts with a header row and ends with the
+    # total, after any messages about individual files.
+    lines = stderr.splitlines()
+    start = max(
+        index for index, line in enumerate(lines) if line.startswith("phase ")
+    )
+    phases = {}
+    for line in lines[start + 1 :]:
+        name, seconds = line.split()[:2]
+        if name == "total":
+            break
+        phases[name] = float(seconds.rstrip("s"))
+    return phases
+
+
+def _run_ssort(paths, options):
+    with tempfile.TemporaryDirectory() as directory:
+        summary_path = pathlib.Path(directory) / "summary.json"
+        start = time.perf_counter()
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "ssort",
+                "--check",
+                "--stats",
+                "--top=0",
+                f"--summary-json={summary_path}",
+                *options,
+                *map(str, paths),
+            ],
+            capture_output=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+        seconds = time.perf_counter() - start
+        if process.returncode not in (0, 1):
+            raise RuntimeError(
+                f"ssort exited with status {process.returncode}:\n"
+                f"{process.stderr}"
+            )
+        summary = json.loads(summary_path.read_text())
+    return seconds, summary, _parse_stats(process.stderr)
+
+
+def _benchmark(name, paths, *, jobs, repeat):
+    results = []
+    with tempfile.TemporaryDirectory() as warm_cache_dir:
+        if name == "warm-cache":
+            _run_ssort(paths, _CONFIGURATIONS[name](jobs, warm_cache_dir))
+
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as cold_cache_dir:
+                cache_dir = (
+                    cold_cache_dir if name == "cold-cache" else warm_cache_dir
+                )
+                results.append(
+                    _run_ssort(paths, _CONFIGURATIONS[name](jobs, cache_dir))
+                )
+
+    return min(results, key=lambda result: result[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measures the throughput of ssort on the standard library"
+    )
+    parser.add_argument(
+        "--config",
+        action="append",
+        choices=sorted(_CONFIGURATIONS),
+        help=(
+            "Configuration to measure.  Can be given more than once.  "
+            "Defaults to all of them"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Number of jobs for parallel configurations.  Defaults to 0",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Number of timed runs of each configuration, of which the "
+        "fastest is reported",
+    )
+    parser.add_argument(
+        "--stdlib",
+        type=pathlib.Path,
+        default=pathlib.Path(sysconfig.get_paths()["stdlib"]),
+        help="Directory to use instead of the standard library",
+    )
+
+    args = parser.parse_args()
+
+    paths = _corpus(args.stdlib)
+    size = sum(path.stat().st_size for path in paths)
+
+    sys.stdout.write(
+        f"{'configuration':<14}{'seconds':>9}{'files/s':>9}{'MB/s':>7}"
+        f"{'unsorted':>10}{'unchanged':>11}{'errors':>8}\n"
+    )
+    phases = {}
+    for name in args.config or list(_CONFIGURATIONS):
+        seconds, summary, phases[name] = _benchmark(
+            name, paths, jobs=args.jobs, repeat=args.repeat
+        )
+        files = (
+            summary["unsorted"] + summary["unchanged"] + summary["unsortable"]
+        )
+        sys.stdout.write(
+            f"{name:<14}{seconds:>9.2f}{files / seconds:>9.1f}"
+            f"{size / seconds / 1e6:>7.2f}{summary['unsorted']:>10}"
+            f"{summary['unchanged']:>11}{summary['unsortable']:>8}\n"
+        )
+
+    # Phase totals are summed over all files, so with parallel jobs they can
+    # add up to more than the time the run took.
+    names = sorted(
+        {name for totals in phases.values() for name in totals},
+        key=phase_order,
+    )
+    sys.stdout.write(
+        "\n"
+        + f"{'phase':<18}"
+        + "".join(f"{name:>14}" for name in phases)
+        + "\n"
+    )
+    for phase in names:
+        sys.stdout.write(
+            f"{phase:<18}"
+            + "".join(
+                f"{totals.get(phase, 0.0):>13.3f}s"
+                for totals in phases.values()
+            )
+            + "\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Generates python modules of a controllable size and shape, for benchmarking
+ssort on inputs much larger than the bundled samples.
+
+Statements are first generated in an order in which every statement comes
+after the statements it depends on, and then a fraction of them are moved to
+random positions, so that ssort has something to do.  The same arguments and
+seed always produce the same module.
+
+    $ python scripts/generate_module.py --statements 5000 --cycles 50 > big.py
+"""
+
+import argparse
+import random
+import sys
+
+_BLOCKS = ("if x:", "for x in x:", "with x:", "while x:")
+
+
+def _function(name, dependencies, *, depth, overloads):
+    lines = []
+    for _ in range(overloads):
+        lines.append("@overload\n")
+        lines.append(f"def {name}(x: int) -> int: ...\n")
+
+    lines.append(f"def {name}(x):\n")
+    indent = "    "
+    for level in range(depth):
+        lines.append(f"{indent}{_BLOCKS[level % len(_BLOCKS)]}\n")
+        indent += "    "
+    if dependencies:
+        calls = " + ".join(f"{dependency}(x)" for dependency in dependencies)
+        lines.append(f"{indent}return {calls}\n")
+    else:
+        lines.append(f"{indent}return x\n")
+    return "".join(lines)
+
+
+def _class(name, dependencies, *, methods, density, rng):
+    lines = [f"class {name}:\n"]
+    for method in range(methods):
+        lines.append(f"    def m_{method}(self, x):\n")
+        calls = [f"self.m_{other}(x)" for other in range(method + 1, methods)]
+        calls = rng.sample(calls, min(len(calls), round(density)))
+        if method == 0:
+            calls.extend(f"{dependency}(x)" for dependency in dependencies)
+        lines.append(f"        return {' + '.join(calls) or 'x'}\n")
+    if not methods:
+        lines.append("    pass\n")
+    return "".join(lines)
+
+
+def _literal(name, size):
+    return f"{name} = [{', '.join(str(index) for index in range(size))}]\n"
+
+
+def _pick(rng, names, density):
+    # `density` is the average number of dependencies, so round it up or down
+    # at random in proportion to its fractional part.
+    count = int(density) + (rng.random() < density % 1)
+    return rng.sample(names, min(len(names), count))
+
+
+def generate(
+    *,
+    statements=100,
+    classes=0,
+    methods=0,
+    density=2.0,
+    cycles=0,
+    depth=0,
+    overloads=0,
+    literals=0,
+    literal_size=10,
+    shuffle=0.5,
+    seed=0,
+):
+    """
+    Returns the text of a module with `statements` top level functions and
+    `classes` classes of `methods` methods each.
+
+    On average each function calls `density` of the functions before it and
+    each method calls `density` of the methods after it.  `cycles` adds that
+    many groups of three functions that call each other in a ring.  Each
+    function body is nested `depth` blocks deep and preceded by `overloads`
+    `typing.overload` stubs.  `literals` adds that many lists of
+    `literal_size` integers.  `shuffle` is the fraction of statements that
+    are moved out of dependency order.
+    """
+    rng = random.Random(seed)
+
+    functions = []
+    blocks = []
+    for index in range(statements):
+        name = f"f_{index}"
+        blocks.append(
+            _function(
+                name,
+                _pick(rng, functions, density),
+                depth=depth,
+                overloads=overloads,
+            )
+        )
+        functions.append(name)
+
+    for index in range(classes):
+        position = rng.randint(0, len(blocks))
+        blocks.insert(
+            position,
+            _class(
+                f"C_{index}",
+                _pick(rng, functions[:position], density),
+                methods=methods,
+                density=density,
+                rng=rng,
+            ),
+        )
+
+    for index in range(cycles):
+        ring = [f"g_{index}_{member}" for member in range(3)]
+        position = rng.randint(0, len(blocks))
+        for member, name in enumerate(ring):
+            blocks.insert(
+                position + member,
+                _function(
+                    name,
+                    [ring[(member + 1) % len(ring)]],
+                    depth=depth,
+                    overloads=overloads,
+                ),
+            )
+
+    for index in range(literals):
+        blocks.insert(
+            rng.randint(0, len(blocks)), _literal(f"L_{index}", literal_size)
+        )
+
+    for _ in range(round(len(blocks) * shuffle)):
+        block = blocks.pop(rng.randrange(len(blocks)))
+        blocks.insert(rng.randint(0, len(blocks)), block)
+
+    header = "from typing import overload\n\n\n" if overloads else ""
+    return header + "\n\n".join(blocks)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generates a synthetic python module for benchmarking"
+    )
+    parser.add_argument(
+        "--statements",
+        type=int,
+        default=100,
+        help="Number of top level functions",
+    )
+    parser.add_argument(
+        "--classes", type=int, default=0, help="Number of classes"
+    )
+    parser.add_argument(
+        "--methods", type=int, default=0, help="Number of methods per class"
+    )
+    parser.add_argument(
+        "--density",
+        type=float,
+        default=2.0,
+        help="Average number of dependencies of each function and method",
+    )
+    parser.add_argument(
+        "--cycles",
+        type=int,
+        default=0,
+        help="Number of rings of mutually recursive functions",
+    )
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=0,
+        help="Number of blocks nested inside each function",
+    )
+    parser.add_argument(
+        "--overloads",
+        type=int,
+        default=0,
+        help="Number of overload stubs before each function",
+    )
+    parser.add_argument(
+        "--literals", type=int, default=0, help="Number of list literals"
+    )
+    parser.add_argument(
+        "--literal-size",
+        type=int,
+        default=10,
+        help="Number of items in each list literal",
+    )
+    parser.add_argument(
+        "--shuffle",
+        type=float,
+        default=0.5,
+        help="Fraction of statements to move out of dependency order",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed for the random generator"
+    )
+
+    args = parser.parse_args()
+
+    sys.stdout.write(
+        generate(
+            statements=args.statements,
+            classes=args.classes,
+            methods=args.methods,
+            density=args.density,
+            cycles=args.cycles,
+            depth=args.depth,
+            overloads=args.overloads,
+            literals=args.literals,
+            literal_size=args.literal_size,
+            shuffle=args.shuffle,
+            seed=args.seed,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,12 @@ from ssort._exceptions import (
     UnknownEncodingError,
     WildcardImportError,
 )
-from ssort._ssort import ssort
+
+# Type checkers treat any name called `TYPE_CHECKING` as true.  Importing it
+# from `typing` instead would make `typing` the slowest import in the package.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from ssort._ssort import ssort, ssort_many
 
 # Let linting tools know that we do mean to re-export exception classes.
 assert DecodingError is not None
@@ -23,4 +28,18 @@ try:
 except ImportError:
     __version__ = "0.0.1+dev"
 
-__all__ = ["ssort"]
+__all__ = ["ssort", "ssort_many"]
+
+
+def __getattr__(name):
+    # The sorting machinery is slow to import relative to the time it takes to
+    # sort a small file, so it is only loaded when first accessed.  This keeps
+    # startup fast for command line invocations that never need it.
+    if name in ("ssort", "ssort_many"):
+        from ssort import _ssort
+
+        value = getattr(_ssort, name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
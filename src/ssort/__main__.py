@@ -1,3 +1,6 @@
 from ssort._main import main
 
-main()
+# Guarded so that worker processes started using the `spawn` method, which
+# re-import the main module, don't start sorting files themselves.
+if __name__ == "__main__":
+    main()
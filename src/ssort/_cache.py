@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+
+from ssort import __version__
+
+
+def blob_sha(content: bytes) -> str:
+    """
+    Returns the SHA that git would assign to a blob with the given content.
+
+    Using the same hash as git means that content hashed by ssort and blob SHAs
+    read from the git index can share cache entries.
+    """
+    digest = hashlib.sha1(b"blob %d\0" % len(content))
+    digest.update(content)
+    return digest.hexdigest()
+
+
+class Cache:
+    """
+    Records the hashes of file contents that are known to already be sorted.
+
+    Results can change between releases so each version of ssort gets its own
+    cache file.  The time taken to sort each file is also recorded, so that
+    parallel runs can schedule the slowest files first.
+    """
+
+    def __init__(self, directory: pathlib.Path) -> None:
+        self.directory = directory
+        self._path = directory / f"sorted-{__version__}.txt"
+
+        self._sorted: set[str] = set()
+        self._new: set[str] = set()
+
+        self._timings_path = directory / "timings.json"
+        self._timings: dict[str, float] | None = None
+        self._new_timings: dict[str, float] = {}
+
+        try:
+            with self._path.open(encoding="ascii") as f:
+                self._sorted.update(line.strip() for line in f)
+        except (FileNotFoundError, UnicodeDecodeError):
+            pass
+
+    def is_sorted(self, key: str) -> bool:
+        return key in self._sorted
+
+    def mark_sorted(self, key: str) -> None:
+        if key not in self._sorted:
+            self._sorted.add(key)
+            self._new.add(key)
+
+    def _load_timings(self) -> dict[str, float]:
+        timings: dict[str, float] = {}
+        try:
+            with self._timings_path.open(encoding="utf-8") as f:
+                document = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return timings
+
+        if isinstance(document, dict):
+            for path, seconds in document.items():
+                if isinstance(seconds, (int, float)):
+                    timings[path] = float(seconds)
+        return timings
+
+    def get_timing(self, path: str) -> float | None:
+        # Timings are only needed when sorting in parallel, so they are loaded
+        # on first use.
+        if self._timings is None:
+            self._timings = self._load_timings()
+        return self._timings.get(path)
+
+    def record_timing(self, path: str, seconds: float) -> None:
+        self._new_timings[path] = seconds
+
+    def _save_timings(self) -> None:
+        timings = self._load_timings()
+        timings.update(self._new_timings)
+
+        # Written to a temporary file and then moved into place so that
+        # concurrent runs never see a partially written file.
+        temporary_path = self._timings_path.with_name(
+            f".timings-{os.getpid()}.json"
+        )
+        with temporary_path.open("w", encoding="utf-8") as f:
+            json.dump(timings, f, sort_keys=True)
+        os.replace(temporary_path, self._timings_path)
+
+        self._timings = timings
+        self._new_timings.clear()
+
+    def save(self) -> None:
+        if not self._new and not self._new_timings:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        if self._new:
+            # Appending in a single write means that concurrent runs can share
+            # a cache directory without clobbering each other's results.
+            with self._path.open("a", encoding="ascii") as f:
+                f.write("".join(f"{key}\n" for key in sorted(self._new)))
+            self._new.clear()
+
+        if self._new_timings:
+            self._save_timings()
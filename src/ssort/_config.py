@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import dataclasses
+import pathlib
+import sys
+from typing import Any
+
+
+class ConfigError(Exception):
+    pass
+
+
+@dataclasses.dataclass(frozen=True)
+class Config:
+    """
+    Settings read from the `[tool.ssort]` table in `pyproject.toml`, or the
+    `[ssort]` section in `setup.cfg`.
+
+    Relative paths in the configuration are resolved relative to `root`, the
+    directory containing the configuration file.  Configurations are plain
+    immutable values and so can safely be shared between threads and sent to
+    worker processes.
+    """
+
+    root: pathlib.Path | None = None
+    exclude: tuple[str, ...] = ()
+    cache_dir: pathlib.Path | None = None
+    jobs: int = 1
+
+
+def _parse_exclude(value: Any, *, source: pathlib.Path) -> tuple[str, ...]:
+    if isinstance(value, str):
+        value = value.splitlines()
+    if not isinstance(value, list) or not all(
+        isinstance(pattern, str) for pattern in value
+    ):
+        raise ConfigError(f"'exclude' in {source} must be a list of strings")
+    return tuple(pattern.strip() for pattern in value if pattern.strip())
+
+
+def _parse_path(
+    value: Any, *, name: str, root: pathlib.Path, source: pathlib.Path
+) -> pathlib.Path:
+    if not isinstance(value, str):
+        raise ConfigError(f"{name!r} in {source} must be a string")
+    return root / value
+
+
+def _parse_jobs(value: Any, *, source: pathlib.Path) -> int:
+    # Values read from `setup.cfg` are always strings.
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ConfigError(f"'jobs' in {source} must be a non-negative integer")
+    return value
+
+
+def _parse_config(
+    options: dict[str, Any], *, root: pathlib.Path, source: pathlib.Path
+) -> Config:
+    kwargs: dict[str, Any] = {}
+    for name, value in options.items():
+        if name == "exclude":
+            kwargs["exclude"] = _parse_exclude(value, source=source)
+        elif name == "cache-dir":
+            kwargs["cache_dir"] = _parse_path(
+                value, name=name, root=root, source=source
+            )
+        elif name == "jobs":
+            kwargs["jobs"] = _parse_jobs(value, source=source)
+        else:
+            raise ConfigError(f"unknown option {name!r} in {source}")
+    return Config(root=root, **kwargs)
+
+
+def _load_pyproject_toml(path: pathlib.Path) -> dict[str, Any] | None:
+    if not path.is_file():
+        return None
+
+    # Imported lazily as most directories searched won't have a config file.
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        import tomli as tomllib
+
+    try:
+        with path.open("rb") as f:
+            document = tomllib.load(f)
+    except FileNotFoundError:
+        return None
+    except (tomllib.TOMLDecodeError, UnicodeDecodeError) as exc:
+        raise ConfigError(f"could not parse {path}: {exc}") from exc
+
+    options = document.get("tool", {}).get("ssort")
+    if options is None:
+        return None
+    if not isinstance(options, dict):
+        raise ConfigError(f"'tool.ssort' in {path} must be a table")
+    return options
+
+
+def _load_setup_cfg(path: pathlib.Path) -> dict[str, Any] | None:
+    if not path.is_file():
+        return None
+
+    import configparser
+
+    parser = configparser.ConfigParser()
+    try:
+        with path.open(encoding="utf-8") as f:
+            parser.read_file(f)
+    except FileNotFoundError:
+        return None
+    except (configparser.Error, UnicodeDecodeError) as exc:
+        raise ConfigError(f"could not parse {path}: {exc}") from exc
+
+    if not parser.has_section("ssort"):
+        return None
+    return dict(parser.items("ssort"))
+
+
+def load_config(directory: pathlib.Path) -> Config | None:
+    """
+    Reads ssort configuration from `pyproject.toml` or `setup.cfg` in the given
+    directory, in that order of preference.  Returns `None` if neither file is
+    present or neither contains a section for ssort.
+    """
+    pyproject_toml = directory / "pyproject.toml"
+    options = _load_pyproject_toml(pyproject_toml)
+    if options is not None:
+        return _parse_config(options, root=directory, source=pyproject_toml)
+
+    setup_cfg = directory / "setup.cfg"
+    options = _load_setup_cfg(setup_cfg)
+    if options is not None:
+        return _parse_config(options, root=directory, source=setup_cfg)
+
+    return None
@@ -1,8 +1,21 @@
+import functools
+
+# Exceptions with keyword only arguments can't be rebuilt from `args` alone, so
+# each defines `__reduce__` to survive being pickled, such as when raised in a
+# worker process.
+
+
 class UnknownEncodingError(Exception):
     def __init__(self, msg, *, encoding):
         super().__init__(msg)
         self.encoding = encoding
 
+    def __reduce__(self):
+        return (
+            functools.partial(type(self), encoding=self.encoding),
+            self.args,
+        )
+
 
 class DecodingError(Exception):
     pass
@@ -14,6 +27,14 @@ class ParseError(Exception):
         self.lineno = lineno
         self.col_offset = col_offset
 
+    def __reduce__(self):
+        return (
+            functools.partial(
+                type(self), lineno=self.lineno, col_offset=self.col_offset
+            ),
+            self.args,
+        )
+
 
 class ResolutionError(Exception):
     def __init__(self, msg, *, name, lineno, col_offset):
@@ -22,9 +43,28 @@ class ResolutionError(Exception):
         self.lineno = lineno
         self.col_offset = col_offset
 
+    def __reduce__(self):
+        return (
+            functools.partial(
+                type(self),
+                name=self.name,
+                lineno=self.lineno,
+                col_offset=self.col_offset,
+            ),
+            self.args,
+        )
+
 
 class WildcardImportError(Exception):
     def __init__(self, msg, *, lineno, col_offset):
         super().__init__(msg)
         self.lineno = lineno
         self.col_offset = col_offset
+
+    def __reduce__(self):
+        return (
+            functools.partial(
+                type(self), lineno=self.lineno, col_offset=self.col_offset
+            ),
+            self.args,
+        )
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import sys
+from typing import Any, Callable, TypeVar
+
+_T = TypeVar("_T")
+
+
+class SerialExecutor(concurrent.futures.Executor):
+    """
+    An executor that runs each task immediately, in the calling thread, when
+    it is submitted.
+    """
+
+    def submit(  # type: ignore[override]
+        self, fn: Callable[..., _T], /, *args: Any, **kwargs: Any
+    ) -> concurrent.futures.Future[_T]:
+        future: concurrent.futures.Future[_T] = concurrent.futures.Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def completed(result: _T) -> concurrent.futures.Future[_T]:
+    """
+    Returns a future that has already resolved to `result`.
+    """
+    future: concurrent.futures.Future[_T] = concurrent.futures.Future()
+    future.set_result(result)
+    return future
+
+
+def cancel(executor: concurrent.futures.Executor) -> None:
+    """
+    Cancels all tasks that are waiting to run and, for process pools on
+    python 3.14 or later, kills tasks that are already running.  Running
+    threads can't be interrupted, and so are left to finish.
+    """
+    terminate_workers = getattr(executor, "terminate_workers", None)
+    if terminate_workers is not None:
+        terminate_workers()
+    else:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def is_free_threaded() -> bool:
+    """
+    Returns `True` if running on a build of python with the GIL disabled.
+    """
+    # Only exists from python 3.13.  Looked up dynamically so that linters
+    # running on older versions don't flag it.
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+    return not is_gil_enabled()
+
+
+def default_backend() -> str:
+    # Threads are much cheaper to start than processes and don't need to
+    # pickle their results, but only run in parallel if there is no GIL.
+    if is_free_threaded():
+        return "thread"
+    return "process"
+
+
+def resolve_jobs(jobs: int) -> int:
+    if jobs == 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def create_executor(
+    backend: str | None, jobs: int
+) -> concurrent.futures.Executor:
+    """
+    Returns an executor that will run up to `jobs` tasks in parallel using
+    the named backend.  Running a single job doesn't need a pool at all.
+    """
+    if jobs == 1:
+        return SerialExecutor()
+
+    if backend is None:
+        backend = default_backend()
+
+    if backend == "thread":
+        return concurrent.futures.ThreadPoolExecutor(max_workers=jobs)
+    if backend == "process":
+        return concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+    if backend == "interpreter":
+        if sys.version_info < (3, 14):
+            raise ValueError(
+                "the interpreter executor requires python 3.14 or later"
+            )
+        # Each worker is an isolated subinterpreter in this process.  Tasks
+        # and results are pickled across, as with processes, but workers
+        # are cheaper to start and share the memory of the parent.
+        return concurrent.futures.InterpreterPoolExecutor(max_workers=jobs)
+    raise ValueError(f"unknown executor backend {backend!r}")
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import ast
+import dataclasses
+import time
+from typing import Any, Iterator, Mapping, Sequence
+
+from ssort._dependencies import (
+    class_statements_initialisation_graph,
+    class_statements_runtime_graph,
+    module_statements_graph,
+)
+from ssort._graphs import Graph
+from ssort._parsing import parse, split_class
+from ssort._statements import Statement
+
+
+@dataclasses.dataclass(frozen=True)
+class StatementCost:
+    """
+    What it cost to analyse a single statement, and how connected it is in the
+    dependency graph of the module or class body that contains it.  Degrees
+    are `None` if the graph couldn't be built, for example because of an
+    unresolved name.
+    """
+
+    name: str
+    lineno: int
+    seconds: float
+    requirements: int
+    dependencies: int | None
+    dependants: int | None
+
+
+def _ignore(*args: Any, **kwargs: Any) -> None:
+    pass
+
+
+def _describe(statement: Statement, prefix: str) -> str:
+    bindings = statement.bindings()
+    if bindings:
+        return prefix + ", ".join(bindings)
+    # Statements that don't bind anything, such as bare calls, are identified
+    # by the start of their text.
+    lines = statement.text.strip().splitlines()
+    return prefix + (lines[0][:40] if lines else "")
+
+
+def _analyse(statement: Statement, *, methods: bool) -> float:
+    # Each of these is cached on the statement, so this is the only time that
+    # the work is done.
+    start = time.perf_counter()
+    statement.requirements()
+    statement.bindings()
+    if methods:
+        statement.method_requirements()
+    return time.perf_counter() - start
+
+
+def _explain_class(
+    statement: Statement, *, prefix: str
+) -> Iterator[StatementCost]:
+    assert isinstance(statement.node, ast.ClassDef)
+    _, statements = split_class(statement)
+
+    seconds = {
+        body_statement: _analyse(body_statement, methods=True)
+        for body_statement in statements
+    }
+
+    graph = class_statements_runtime_graph(statements, ignore_public=True)
+    graph.update(class_statements_initialisation_graph(statements))
+
+    yield from _explain_statements(
+        statements,
+        graph,
+        seconds=seconds,
+        prefix=f"{prefix}{statement.node.name}.",
+    )
+
+
+def _explain_statements(
+    statements: Sequence[Statement],
+    graph: Graph[Statement] | None,
+    *,
+    seconds: Mapping[Statement, float],
+    prefix: str,
+) -> Iterator[StatementCost]:
+    for statement in statements:
+        node = statement.node
+        assert isinstance(node, ast.stmt)
+        yield StatementCost(
+            name=_describe(statement, prefix),
+            lineno=node.lineno,
+            seconds=seconds[statement],
+            requirements=len(tuple(statement.requirements())),
+            dependencies=(
+                len(graph.dependencies[statement])
+                if graph is not None
+                else None
+            ),
+            dependants=(
+                len(graph.dependants[statement]) if graph is not None else None
+            ),
+        )
+        if isinstance(node, ast.ClassDef):
+            yield from _explain_class(statement, prefix=prefix)
+
+
+def explain(text: str, *, filename: str = "<unknown>") -> list[StatementCost]:
+    """
+    Returns the cost of every statement in `text`, including those in class
+    bodies, ranked from most to least expensive to analyse.  The cost of a
+    class includes analysing its whole body, and the statements in the body
+    are listed again separately.
+
+    Raises `ParseError` if `text` can't be parsed.
+    """
+    statements = list(parse(text, filename=filename))
+
+    seconds = {
+        statement: _analyse(statement, methods=False)
+        for statement in statements
+    }
+
+    graph = module_statements_graph(
+        statements, on_unresolved=_ignore, on_wildcard_import=_ignore
+    )
+
+    costs = list(
+        _explain_statements(statements, graph, seconds=seconds, prefix="")
+    )
+    costs.sort(key=lambda cost: cost.seconds, reverse=True)
+    return costs
+
+
+def format_explanation(
+    costs: Sequence[StatementCost], *, top: int
+) -> list[str]:
+    def _degree(degree: int | None) -> str:
+        return "-" if degree is None else str(degree)
+
+    lines = [
+        f"{'seconds':>10}{'reqs':>7}{'deps':>7}{'users':>7}{'line':>7}"
+        "  statement\n"
+    ]
+    for cost in costs[:top]:
+        lines.append(
+            f"{cost.seconds:>10.4f}{cost.requirements:>7}"
+            f"{_degree(cost.dependencies):>7}{_degree(cost.dependants):>7}"
+            f"{cost.lineno:>7}  {cost.name}\n"
+        )
+    return lines
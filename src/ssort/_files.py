@@ -2,12 +2,16 @@ from __future__ import annotations
 
 import os
 import pathlib
+import sys
 from functools import cache
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable
 
-import pathspec
+from ssort._config import Config, ConfigError, load_config
 
-_EMPTY_PATH_SPEC = pathspec.PathSpec([])
+if TYPE_CHECKING:
+    # `pathspec` is slow to import and is only needed when there are patterns
+    # to match, so it is imported on demand.
+    import pathspec
 
 
 @cache
@@ -22,13 +26,64 @@ def _is_project_root(path: pathlib.Path) -> bool:
 
 
 @cache
-def _get_ignore_patterns(path: pathlib.Path) -> pathspec.PathSpec:
+def _get_ignore_patterns(path: pathlib.Path) -> pathspec.PathSpec | None:
     git_ignore = path / ".gitignore"
     if git_ignore.is_file():
+        import pathspec
+
         with git_ignore.open() as f:
             return pathspec.PathSpec.from_lines("gitwildmatch", f)
 
-    return _EMPTY_PATH_SPEC
+    return None
+
+
+@cache
+def get_config(path: pathlib.Path, *, strict: bool = True) -> Config:
+    """
+    Returns the configuration that applies to the contents of the directory
+    at `path`.
+
+    Configuration is taken from the nearest parent directory with a config
+    file, stopping at the project root.  Results are memoized so that each
+    configuration file is only read once per run.
+
+    If `strict` is false then configuration files that can't be used are
+    skipped, with a warning, rather than raising `ConfigError`.  Discovery
+    uses this so that a broken `pyproject.toml` belonging to a test fixture or
+    vendored package doesn't stop the whole run.
+    """
+    try:
+        config = load_config(path)
+    except ConfigError as exc:
+        if strict:
+            raise
+        sys.stderr.write(f"WARNING: ignoring configuration: {exc}\n")
+        config = None
+    if config is not None:
+        return config
+
+    if _is_project_root(path):
+        return Config()
+
+    return get_config(path.parent, strict=strict)
+
+
+@cache
+def _get_exclude_patterns(config: Config) -> pathspec.PathSpec:
+    import pathspec
+
+    return pathspec.PathSpec.from_lines("gitwildmatch", config.exclude)
+
+
+def is_excluded(path: str | os.PathLike) -> bool:
+    path = pathlib.Path(os.path.abspath(path))
+
+    config = get_config(path.parent, strict=False)
+    if config.root is None or not config.exclude:
+        return False
+
+    patterns = _get_exclude_patterns(config)
+    return patterns.match_file(path.relative_to(config.root))
 
 
 def is_ignored(path: str | os.PathLike) -> bool:
@@ -38,7 +93,9 @@ def is_ignored(path: str | os.PathLike) -> bool:
 
     for part in (path, *path.parents):
         patterns = _get_ignore_patterns(part)
-        if patterns.match_file(path.relative_to(part)):
+        if patterns is not None and patterns.match_file(
+            path.relative_to(part)
+        ):
             return True
 
         if _is_project_root(part):
@@ -62,7 +119,9 @@ def find_python_files(
             subpaths = [
                 subpath
                 for subpath in path.glob("**/*.py")
-                if not is_ignored(subpath) and subpath.is_file()
+                if not is_ignored(subpath)
+                and not is_excluded(subpath)
+                and subpath.is_file()
             ]
 
         for subpath in sorted(subpaths):
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import subprocess
+
+_REGULAR_FILE_MODES = {"100644", "100755"}
+
+
+class GitError(Exception):
+    pass
+
+
+def _git(*args: str) -> bytes:
+    try:
+        result = subprocess.run(["git", *args], capture_output=True)
+    except FileNotFoundError as exc:
+        raise GitError("could not find git executable") from exc
+
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", errors="replace").strip()
+        raise GitError(message or f"git {args[0]} failed")
+
+    return result.stdout
+
+
+def _split_null_terminated(output: bytes) -> list[str]:
+    return [os.fsdecode(entry) for entry in output.split(b"\0") if entry]
+
+
+def get_toplevel() -> pathlib.Path:
+    output = _git("rev-parse", "--show-toplevel")
+    return pathlib.Path(os.fsdecode(output.rstrip(b"\r\n")))
+
+
+def get_changed_files(
+    ref: str | None = None, *, staged: bool = False
+) -> set[pathlib.Path]:
+    """
+    Returns the set of files, as absolute paths with symlinks resolved, that
+    have changed relative to `ref`.
+
+    If `staged` is set then only changes that have been added to the index
+    will be considered, otherwise changes in the working tree are included.
+    Deleted files are never returned.
+    """
+    args = ["diff", "--name-only", "-z", "--diff-filter=d"]
+    if staged:
+        args.append("--cached")
+    if ref is not None:
+        args.append(ref)
+    args.append("--")
+
+    toplevel = get_toplevel()
+    return {
+        pathlib.Path(os.path.realpath(toplevel / name))
+        for name in _split_null_terminated(_git(*args))
+    }
+
+
+def get_index_blobs() -> dict[pathlib.Path, str]:
+    """
+    Returns a dictionary mapping from the absolute path of every regular file
+    in the git index to the SHA of its staged blob.
+    """
+    toplevel = get_toplevel()
+    output = _git("ls-files", "--stage", "-z", "--full-name", "--", ":/")
+
+    blobs = {}
+    for entry in _split_null_terminated(output):
+        info, name = entry.split("\t", 1)
+        mode, sha, _ = info.split(" ")
+        # Skip symlinks and submodules, the content of which is not the content
+        # of the file in the working tree.
+        if mode not in _REGULAR_FILE_MODES:
+            continue
+        blobs[toplevel / name] = sha
+    return blobs
+
+
+def get_clean_blobs() -> dict[pathlib.Path, str]:
+    """
+    Returns a dictionary mapping from the absolute path of every file in the
+    working tree that exactly matches the git index to the SHA of its blob.
+
+    Git uses cached stat information to check whether files are dirty, so this
+    does not require reading the contents of any files.
+    """
+    blobs = get_index_blobs()
+    for path in get_changed_files():
+        blobs.pop(path, None)
+    return blobs
+
+
+class BlobReader:
+    """
+    Reads the contents of blobs, by SHA, through a single long running
+    `git cat-file --batch` process that is started on the first read.
+
+    Blobs can be requested in any order, so callers don't need to know up
+    front which blobs they will need.
+    """
+
+    def __init__(self) -> None:
+        self._process: subprocess.Popen[bytes] | None = None
+
+    def _start(self) -> subprocess.Popen[bytes]:
+        if self._process is None:
+            try:
+                self._process = subprocess.Popen(
+                    ["git", "cat-file", "--batch"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+            except FileNotFoundError as exc:
+                raise GitError("could not find git executable") from exc
+        return self._process
+
+    def read(self, sha: str) -> bytes:
+        process = self._start()
+        assert process.stdin is not None
+        assert process.stdout is not None
+
+        process.stdin.write(sha.encode("ascii") + b"\n")
+        process.stdin.flush()
+
+        header = process.stdout.readline().split()
+        if len(header) != 3 or header[1] != b"blob":
+            raise GitError(f"could not read blob {sha}")
+
+        content = process.stdout.read(int(header[2]))
+        # Each object is followed by a single newline.
+        process.stdout.read(1)
+
+        return content
+
+    def close(self) -> None:
+        if self._process is not None:
+            assert self._process.stdin is not None
+            assert self._process.stdout is not None
+            self._process.stdin.close()
+            self._process.stdout.close()
+            self._process.wait()
+            self._process = None
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Callable, Generic, Hashable, TypeVar
+import heapq
+from typing import Callable, Generic, Hashable, Iterator, TypeVar
 
 from ssort._utils import sort_key_from_iter
 
@@ -8,52 +9,41 @@ _T = TypeVar("_T", bound=Hashable)
 
 
 class Graph(Generic[_T]):
+    # Nodes and edges are kept in dictionaries, used as sets that remember
+    # insertion order, so that adding, removing and looking up either is
+    # constant time.
     def __init__(self) -> None:
-        self.nodes: list[_T] = []
-        self.dependencies: dict[_T, list[_T]] = {}
-        self.dependants: dict[_T, list[_T]] = {}
+        self.nodes: dict[_T, None] = {}
+        self.dependencies: dict[_T, dict[_T, None]] = {}
+        self.dependants: dict[_T, dict[_T, None]] = {}
 
     def add_node(self, identifier: _T) -> None:
         if identifier not in self.nodes:
-            self.nodes.append(identifier)
-            self.dependencies[identifier] = []
-            self.dependants[identifier] = []
+            self.nodes[identifier] = None
+            self.dependencies[identifier] = {}
+            self.dependants[identifier] = {}
 
     def add_dependency(self, node: _T, dependency: _T) -> None:
         assert dependency in self.nodes
 
-        if dependency not in self.dependencies[node]:
-            self.dependencies[node].append(dependency)
-            self.dependants[dependency].append(node)
+        self.dependencies[node][dependency] = None
+        self.dependants[dependency][node] = None
 
     def remove_node(self, node: _T) -> None:
-        self.nodes.remove(node)
+        for dependency in self.dependencies[node]:
+            self.dependants[dependency].pop(node, None)
+        for dependant in self.dependants[node]:
+            self.dependencies[dependant].pop(node, None)
+
+        del self.nodes[node]
         del self.dependencies[node]
         del self.dependants[node]
 
-        for other in self.nodes:
-            try:
-                self.dependencies[other].remove(node)
-            except ValueError:
-                pass
-
-            try:
-                self.dependants[other].remove(node)
-            except ValueError:
-                pass
-
     def remove_dependency(self, node: _T, dependency: _T) -> None:
         assert dependency in self.nodes
 
-        try:
-            self.dependencies[node].remove(dependency)
-        except ValueError:
-            pass
-
-        try:
-            self.dependants[dependency].remove(node)
-        except ValueError:
-            pass
+        self.dependencies[node].pop(dependency, None)
+        self.dependants[dependency].pop(node, None)
 
     def update(self, other: Graph[_T]) -> None:
         for node in other.nodes:
@@ -74,52 +64,81 @@ def _remove_self_references(graph: Graph[_T]) -> None:
         graph.remove_dependency(node, node)
 
 
-def _find_cycle(graph: Graph[_T]) -> list[_T] | None:
+def _find_cycles(graph: Graph[_T]) -> Iterator[list[_T]]:
+    """
+    Yields cycles in `graph` one at a time.  The caller must break each cycle
+    before asking for the next.
+
+    Rather than starting the search again from scratch after each cycle, the
+    search resumes from the first node in the cycle, which is the only place
+    where it can have been invalidated.  No cycle can be reachable from a
+    node that has been fully processed, and breaking a cycle only changes the
+    dependencies of the nodes in it, none of which have been processed, so
+    processed nodes never need to be visited again.
+
+    Nodes and dependencies are visited in the order in which they were added,
+    so the cycles found don't depend on how nodes hash.
+    """
     processed = set()
     for node in graph.nodes:
         if node in processed:
             continue
 
         in_stack = {node}
-        stack = [(node, set(graph.dependencies[node]))]
+        stack: list[tuple[_T, Iterator[_T]]] = [
+            (node, iter(list(graph.dependencies[node])))
+        ]
 
         while stack:
             top_node, top_dependencies = stack[-1]
 
-            if not top_dependencies:
+            for dependency in top_dependencies:
+                if dependency in in_stack or dependency not in processed:
+                    break
+            else:
                 processed.add(top_node)
                 in_stack.remove(top_node)
                 stack.pop()
                 continue
 
-            dependency = top_dependencies.pop()
             if dependency in in_stack:
                 cycle = [dependency]
+                index = len(stack) - 1
+                while stack[index][0] != dependency:
+                    cycle.append(stack[index][0])
+                    index -= 1
+                yield cycle
+
+                # Unwind to the first node in the cycle and visit it afresh.
                 while stack[-1][0] != dependency:
-                    cycle.append(stack[-1][0])
-                    stack.pop()
-                return cycle
-            if dependency not in processed:
-                stack.append((dependency, set(graph.dependencies[dependency])))
-                in_stack.add(dependency)
+                    in_stack.remove(stack.pop()[0])
+                stack[-1] = (
+                    dependency,
+                    iter(list(graph.dependencies[dependency])),
+                )
+                continue
 
-    return None
+            stack.append(
+                (dependency, iter(list(graph.dependencies[dependency])))
+            )
+            in_stack.add(dependency)
 
 
-def replace_cycles(graph: Graph[_T], *, key: Callable[[_T], int]) -> None:
+def replace_cycles(graph: Graph[_T], *, key: Callable[[_T], int]) -> int:
     """
     Finds all cycles and replaces them with forward links that keep them from
-    being re-ordered.
+    being re-ordered.  Returns the number of cycles that were replaced.
     """
+    replaced = 0
     _remove_self_references(graph)
-    while True:
-        cycle = _find_cycle(graph)
-        if not cycle:
-            break
+    for cycle in _find_cycles(graph):
+        replaced += 1
 
+        members = set(cycle)
         for node in cycle:
-            for dependency in cycle:
-                graph.remove_dependency(node, dependency)
+            for dependency in list(graph.dependencies[node]):
+                if dependency in members:
+                    graph.remove_dependency(node, dependency)
 
         # TODO this is a bit of an abstraction leak.  Need a better way to tell
         # this function what the safe order is.
@@ -129,6 +148,8 @@ def replace_cycles(graph: Graph[_T], *, key: Callable[[_T], int]) -> None:
             graph.add_dependency(node, prev)
             prev = node
 
+    return replaced
+
 
 def is_topologically_sorted(nodes: list[_T], graph: Graph[_T]) -> bool:
     visited = set()
@@ -147,37 +168,37 @@ def topological_sort(
         if not isinstance(target, Graph):
             raise TypeError("target must be a Graph")
         graph = target
-        nodes = target.nodes
+        nodes = list(target.nodes)
     else:
         if not isinstance(target, list):
             raise TypeError("target must be a list")
         nodes = target
 
-    # Create a mutable copy of the graph so that we can pop edges from it as we
-    # traverse.
-    remaining = graph.copy()
-
     key = sort_key_from_iter(nodes)
 
-    pending = [node for node in graph.nodes if not graph.dependants[node]]
+    # Statements are emitted in reverse, each as soon as nothing that remains
+    # depends on it, choosing the one that came last in `nodes` whenever there
+    # is a choice.
+    remaining = {node: len(graph.dependants[node]) for node in graph.nodes}
+    pending = [
+        (-key(node), node) for node in graph.nodes if not remaining[node]
+    ]
+    heapq.heapify(pending)
 
     result = []
     while pending:
-        pending = list(sorted(pending, key=key))
-        node = pending.pop()
-        dependencies = remaining.dependencies[node]
-        remaining.remove_node(node)
-
-        for dependency in dependencies:
-            if not remaining.dependants[dependency]:
-                if dependency not in pending:
-                    pending.append(dependency)
+        _, node = heapq.heappop(pending)
+        for dependency in graph.dependencies[node]:
+            remaining[dependency] -= 1
+            if not remaining[dependency]:
+                heapq.heappush(pending, (-key(dependency), dependency))
 
         result.append(node)
 
     result.reverse()
 
-    assert not remaining.nodes
+    assert len(result) == len(graph.nodes)
     assert is_topologically_sorted(result, graph)
 
-    return [node for node in result if node in nodes]
+    included = set(nodes)
+    return [node for node in result if node in included]
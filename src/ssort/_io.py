@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import pathlib
+from typing import Callable, Iterable, Iterator, Sequence
+
+# Reading and writing files spends most of its time waiting on the operating
+# system, with the GIL released, so a handful of threads is enough to keep
+# storage busy whatever the number of jobs.
+_IO_THREADS = 4
+
+
+def create_io_executor() -> concurrent.futures.ThreadPoolExecutor:
+    return concurrent.futures.ThreadPoolExecutor(
+        max_workers=_IO_THREADS, thread_name_prefix="ssort-io"
+    )
+
+
+class ReadAhead:
+    """
+    Reads files on a pool of threads ahead of the point at which they are
+    needed, so that waiting for storage overlaps with sorting.
+
+    Iterating over a `ReadAhead` yields the indices in `order`, with reads for
+    up to `count` of the following paths already started.  Paths for which
+    `should_read` returns `False` are passed over.
+
+    If `max_bytes` is given then files are only read ahead while the `sizes`
+    of every file that has been read, ahead or not, and not yet passed to
+    `release`, add up to no more than `max_bytes`.  A file that doesn't fit is
+    read ahead once enough have been released, and nothing after it is read
+    ahead before it.
+    """
+
+    def __init__(
+        self,
+        executor: concurrent.futures.Executor,
+        paths: Sequence[pathlib.Path],
+        order: Iterable[int],
+        *,
+        count: int,
+        should_read: Callable[[int], bool],
+        sizes: Sequence[int] | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        self._executor = executor
+        self._paths = paths
+        self._order = order
+        self._count = count
+        self._should_read = should_read
+        self._sizes = sizes
+        self._max_bytes = max_bytes
+        self._reads: dict[int, concurrent.futures.Future[bytes]] = {}
+        self._consumed: set[int] = set()
+        self._held: dict[int, int] = {}
+        self._in_flight = 0
+        self._stopped = False
+
+    def _hold(self, index: int) -> None:
+        if self._sizes is not None and index not in self._held:
+            self._held[index] = self._sizes[index]
+            self._in_flight += self._sizes[index]
+
+    def _fits(self, index: int) -> bool:
+        if self._max_bytes is None or self._sizes is None:
+            return True
+        return self._in_flight + self._sizes[index] <= self._max_bytes
+
+    def read(self, index: int) -> bytes:
+        """
+        Returns the contents of the path at `index`, waiting for it to be read
+        if it was read ahead and otherwise reading it immediately.  Errors are
+        raised exactly as if the file had been read directly.
+        """
+        self._consumed.add(index)
+        future = self._reads.pop(index, None)
+        if future is None:
+            content = self._paths[index].read_bytes()
+            self._hold(index)
+            return content
+        return future.result()
+
+    def release(self, index: int) -> None:
+        """
+        Marks the file at `index` as no longer held in memory, making room for
+        more files to be read ahead.
+        """
+        self._in_flight -= self._held.pop(index, 0)
+
+    def stop(self) -> None:
+        """
+        Stops yielding indices, including any that have already been read
+        ahead, and cancels reads that haven't started yet.
+        """
+        self._stopped = True
+        for future in self._reads.values():
+            future.cancel()
+
+    def _read_ahead(self, waiting: collections.deque[int]) -> None:
+        # Files are read ahead strictly in order, so that a file that is held
+        # back is always read before any of the files that come after it.
+        while waiting:
+            index = waiting[0]
+            if index not in self._consumed:
+                if not self._fits(index):
+                    return
+                self._hold(index)
+                self._reads[index] = self._executor.submit(
+                    self._paths[index].read_bytes
+                )
+            waiting.popleft()
+
+    def __iter__(self) -> Iterator[int]:
+        buffer: collections.deque[int] = collections.deque()
+        waiting: collections.deque[int] = collections.deque()
+
+        def _next() -> int:
+            self._read_ahead(waiting)
+            index = buffer.popleft()
+            if waiting and waiting[0] == index:
+                # It didn't fit, so it will be read when it is needed.
+                waiting.popleft()
+            return index
+
+        for index in self._order:
+            if self._stopped:
+                return
+            if index not in self._consumed and self._should_read(index):
+                waiting.append(index)
+            buffer.append(index)
+            if len(buffer) > self._count:
+                yield _next()
+        while buffer and not self._stopped:
+            yield _next()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import pathlib
+from typing import IO, Any
+
+from ssort import __version__
+from ssort._worker import FileResult, Status
+
+
+@dataclasses.dataclass(frozen=True)
+class JournalEntry:
+    """
+    The recorded outcome of a file that was completed by an earlier run.
+
+    `key` is the blob SHA of the file's content once the run was done with it,
+    so that entries for files that have since been modified can be detected.
+    """
+
+    key: str
+    result: FileResult
+
+
+def run_id(options: dict[str, Any]) -> str:
+    """
+    Returns an identifier for a run of ssort with the given options.  Only a
+    run with exactly the same options can be resumed from a journal.
+    """
+    document = json.dumps(
+        {"version": __version__, **options}, sort_keys=True, default=str
+    )
+    return hashlib.sha1(document.encode("utf-8")).hexdigest()[:16]
+
+
+def _parse_entry(line: str) -> tuple[str, JournalEntry] | None:
+    try:
+        document = json.loads(line)
+        entry = JournalEntry(
+            key=str(document["key"]),
+            result=FileResult(
+                Status(document["status"]),
+                messages=tuple(
+                    str(message) for message in document["messages"]
+                ),
+                diff=tuple(str(line) for line in document["diff"]),
+            ),
+        )
+        return str(document["path"]), entry
+    except (ValueError, KeyError, TypeError):
+        # The last line will be truncated if the run was killed while writing
+        # it.  Any file without a valid entry is simply done again.
+        return None
+
+
+class Journal:
+    """
+    Records the outcome of each file as soon as it is complete, so that a run
+    that is interrupted can be resumed without redoing finished work.
+
+    Each distinct run gets its own journal file in the cache directory, which
+    is removed once the run finishes.
+    """
+
+    def __init__(self, directory: pathlib.Path, run: str) -> None:
+        self.directory = directory
+        self._path = directory / f"journal-{run}.jsonl"
+        self._file: IO[str] | None = None
+
+    def load(self) -> dict[str, JournalEntry]:
+        entries: dict[str, JournalEntry] = {}
+        try:
+            with self._path.open(encoding="utf-8") as f:
+                for line in f:
+                    parsed = _parse_entry(line)
+                    if parsed is not None:
+                        path, entry = parsed
+                        entries[path] = entry
+        except (FileNotFoundError, UnicodeDecodeError):
+            pass
+        return entries
+
+    def open(self, *, resume: bool) -> None:
+        """
+        Opens the journal for writing, either keeping the entries of an
+        interrupted run to add to them, or starting from scratch.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._file = self._path.open("a" if resume else "w", encoding="utf-8")
+
+    def record(self, path: str, key: str, result: FileResult) -> None:
+        assert self._file is not None
+        document = {
+            "path": path,
+            "key": key,
+            "status": result.status.value,
+            "messages": list(result.messages),
+            "diff": list(result.diff),
+        }
+        # Flushed after every entry so that nothing is lost if the process is
+        # killed.  Entries are written in a single call, so an interruption
+        # can at worst truncate the last line.
+        self._file.write(json.dumps(document) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        self.close()
+        self._path.unlink(missing_ok=True)
@@ -1,18 +1,261 @@
 import argparse
-import difflib
-import re
+import functools
+import os
+import pathlib
 import sys
+import time
 
 from ssort import __version__
-from ssort._exceptions import UnknownEncodingError
-from ssort._files import find_python_files
-from ssort._ssort import ssort
-from ssort._utils import (
-    detect_encoding,
-    detect_newline,
-    escape_path,
-    normalize_newlines,
-)
+
+# Parsed syntax trees take up a large multiple of the size of the source they
+# were parsed from, so this is kept well below the memory actually available.
+_DEFAULT_MAX_IN_FLIGHT_BYTES = 32 * 1024 * 1024
+
+
+@functools.cache
+def _realpath(dirpath):
+    return os.path.realpath(dirpath)
+
+
+def _git_path(path):
+    """
+    Returns the absolute path that git would use to refer to `path`.  Symlinks
+    in parent directories are resolved, but not the file itself.
+    """
+    # Each directory is only resolved once, which is significantly faster than
+    # resolving every file in a large tree.
+    return pathlib.Path(
+        _realpath(os.path.dirname(os.path.abspath(path))), path.name
+    )
+
+
+def _filter_changed(paths, *, ref, staged):
+    from ssort._git import GitError, get_changed_files
+
+    try:
+        changed = get_changed_files(ref, staged=staged)
+    except GitError as exc:
+        sys.stderr.write(f"ERROR: could not list changed files: {exc}\n")
+        sys.exit(1)
+
+    return [
+        path
+        for path in paths
+        if str(path) == "-" or _git_path(path) in changed
+    ]
+
+
+def _get_known_blobs(paths, *, staged):
+    from ssort._git import GitError, get_clean_blobs, get_index_blobs
+
+    if staged:
+        try:
+            blobs = get_index_blobs()
+        except GitError as exc:
+            sys.stderr.write(f"ERROR: could not read git index: {exc}\n")
+            sys.exit(1)
+    else:
+        try:
+            blobs = get_clean_blobs()
+        except GitError:
+            # Not inside a git repository.  Fall back to hashing content.
+            blobs = {}
+
+    known_blobs = {}
+    for path in paths:
+        if str(path) != "-" and _git_path(path) in blobs:
+            known_blobs[path] = blobs[_git_path(path)]
+    return known_blobs
+
+
+def _read_staged_blob(blobs, sha):
+    from ssort._git import GitError
+
+    try:
+        return blobs.read(sha)
+    except GitError as exc:
+        sys.stderr.write(f"ERROR: could not read staged blob: {exc}\n")
+        sys.exit(1)
+
+
+def _read_error_message(path, exc):
+    from ssort._utils import escape_path
+
+    if isinstance(exc, FileNotFoundError):
+        return f"ERROR: {escape_path(path)} does not exist\n"
+    if isinstance(exc, IsADirectoryError):
+        return f"ERROR: {escape_path(path)} is a directory\n"
+    if isinstance(exc, PermissionError):
+        return f"ERROR: {escape_path(path)} is not readable\n"
+    return f"ERROR: could not read {escape_path(path)}: {exc}\n"
+
+
+def _file_size(path):
+    if str(path) == "-":
+        return 0
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+def _timed_write(path, data):
+    """
+    Writes `data` to `path`, and returns when the write started, how long it
+    took and the id of the worker that did it.
+    """
+    from ssort._trace import worker_id
+
+    start = time.perf_counter()
+    path.write_bytes(data)
+    return start, time.perf_counter() - start, worker_id()
+
+
+def _profile_path(directory, path):
+    """
+    Returns the path in `directory` at which to save the profile for `path`.
+    Profiles are named after the whole path, joined with dots, so that files
+    with the same name in different directories don't collide.
+    """
+    pure = pathlib.PurePath(path)
+    parts = [part for part in pure.parts if part != pure.anchor]
+    return pathlib.Path(directory) / (".".join(parts) + ".pstats")
+
+
+def _report(summary):
+    """
+    Writes a human readable summary of a run to stderr and exits with an error
+    status if anything went wrong.
+    """
+    unsorted = summary.unsorted
+    unchanged = summary.unchanged
+    unsortable = summary.unsortable
+    skipped = summary.skipped
+
+    if summary.check:
+
+        def _fmt_count(count):
+            return f"{count} file" if count == 1 else f"{count} files"
+
+        parts = []
+        if unsorted:
+            parts.append(f"{_fmt_count(unsorted)} would be resorted")
+        if unchanged:
+            parts.append(f"{_fmt_count(unchanged)} would be left unchanged")
+        if unsortable:
+            parts.append(f"{_fmt_count(unsortable)} would not be sortable")
+        if skipped:
+            parts.append(f"{_fmt_count(skipped)} not checked")
+        if not unsorted and not unchanged and not unsortable:
+            parts.append("No files are present to be sorted. Nothing to do.")
+
+        sys.stderr.write(", ".join(parts) + "\n")
+
+        if unsorted or unsortable:
+            sys.exit(1)
+
+    else:
+
+        def _fmt_count_were(count):
+            if count == 1:
+                return f"{count} file was"
+            else:
+                return f"{count} files were"
+
+        parts = []
+        if unsorted:
+            parts.append(f"{_fmt_count_were(unsorted)} resorted")
+        if unchanged:
+            parts.append(f"{_fmt_count_were(unchanged)} left unchanged")
+        if unsortable:
+            parts.append(f"{_fmt_count_were(unsortable)} not sortable")
+        if not unsorted and not unchanged and not unsortable:
+            parts.append("No files are present to be sorted. Nothing to do.")
+
+        sys.stderr.write(", ".join(parts) + "\n")
+
+        if unsortable:
+            sys.exit(1)
+
+
+def _explain(paths, *, top):
+    """
+    Writes the statements in each file that were most expensive to analyse to
+    stdout, and exits with an error status if any file couldn't be analysed.
+    """
+    from ssort._exceptions import (
+        DecodingError,
+        ParseError,
+        UnknownEncodingError,
+    )
+    from ssort._explain import explain, format_explanation
+    from ssort._utils import detect_encoding, escape_path, normalize_newlines
+
+    errors = False
+    for path in paths:
+        try:
+            if str(path) == "-":
+                original_bytes = sys.stdin.buffer.read()
+            else:
+                original_bytes = path.read_bytes()
+            text = normalize_newlines(
+                original_bytes.decode(detect_encoding(original_bytes))
+            )
+            costs = explain(text, filename=escape_path(path))
+        except OSError as exc:
+            message = f"{escape_path(path)} could not be read: {exc.strerror}"
+        except UnknownEncodingError as exc:
+            message = (
+                f"unknown encoding, {exc.encoding!r}, in {escape_path(path)}"
+            )
+        except (UnicodeDecodeError, DecodingError) as exc:
+            message = f"encoding error in {escape_path(path)}: {exc}"
+        except ParseError as exc:
+            message = (
+                f"syntax error in {escape_path(path)}: "
+                f"line {exc.lineno}, column {exc.col_offset}"
+            )
+        else:
+            message = None
+
+        if message is not None:
+            sys.stderr.write(f"ERROR: {message}\n")
+            errors = True
+            continue
+
+        sys.stdout.write(f"{escape_path(path)}:\n")
+        sys.stdout.writelines(format_explanation(costs, top=top))
+
+    if errors:
+        sys.exit(1)
+
+
+def _parse_shard(value):
+    index, _, count = value.partition("/")
+    if (
+        not index.isdigit()
+        or not count.isdigit()
+        or not 1 <= int(index) <= int(count)
+    ):
+        raise argparse.ArgumentTypeError(
+            f"invalid shard {value!r}, expected INDEX/COUNT with "
+            "1 <= INDEX <= COUNT"
+        )
+    return int(index), int(count)
+
+
+def _merge_summaries(paths):
+    from ssort._summary import SummaryError, load_summary, merge_summaries
+
+    try:
+        summary = merge_summaries(
+            load_summary(pathlib.Path(path)) for path in paths
+        )
+    except SummaryError as exc:
+        sys.stderr.write(f"ERROR: {exc}\n")
+        sys.exit(1)
+
+    _report(summary)
 
 
 def main():
@@ -40,6 +283,168 @@ def main():
         help="Check the file for unsorted statements.  Returns 0 if nothing "
         "needs to be changed.  Otherwise returns 1.",
     )
+    parser.add_argument(
+        "--fail-fast",
+        dest="fail_fast",
+        action="store_true",
+        help="With --check, stop as soon as one file is found to be unsorted "
+        "or unsortable.",
+    )
+    parser.add_argument(
+        "--changed-since",
+        dest="changed_since",
+        metavar="REF",
+        help="Only sort files that differ from the given git revision.",
+    )
+    parser.add_argument(
+        "--staged",
+        dest="staged",
+        action="store_true",
+        help="Only sort files with staged changes, reading their contents "
+        "from the git index.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        metavar="DIR",
+        help="Directory in which to remember files that are already sorted.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        metavar="N",
+        help="Number of files to sort in parallel, or 0 to use one job per "
+        "CPU.  Defaults to 1.",
+    )
+    parser.add_argument(
+        "--executor",
+        dest="executor",
+        choices=["thread", "process", "interpreter"],
+        help="Whether parallel jobs are run in threads, in processes or in "
+        "subinterpreters.  Defaults to threads on free-threaded builds of "
+        "python, and to processes otherwise.",
+    )
+    parser.add_argument(
+        "--resume",
+        dest="resume",
+        action="store_true",
+        help="Carry on from where an interrupted run with the same arguments "
+        "left off, skipping files that it completed and that haven't changed "
+        "since.  Requires a cache directory.",
+    )
+    parser.add_argument(
+        "--progress",
+        dest="progress",
+        action="store_true",
+        help="Show the throughput, cache hit rate, estimated time remaining "
+        "and slowest file in progress on stderr.  Ignored if stderr is not a "
+        "terminal.",
+    )
+    parser.add_argument(
+        "--stats",
+        dest="stats",
+        action="store_true",
+        help="Print the time spent in each phase of sorting, from reading "
+        "files to writing them back, along with a breakdown of the slowest "
+        "files.",
+    )
+    parser.add_argument(
+        "--top",
+        dest="top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of files to break down with --stats and "
+        "--memory-report, or of statements to list with --explain.  "
+        "Defaults to 10.",
+    )
+    parser.add_argument(
+        "--explain",
+        dest="explain",
+        action="store_true",
+        help="Instead of sorting, list the statements in each file that take "
+        "longest to analyse, with the number of requirements that each has "
+        "and its degree in the dependency graph.",
+    )
+    parser.add_argument(
+        "--memory-report",
+        dest="memory_report",
+        action="store_true",
+        help="Print the peak memory allocated in each phase of sorting, "
+        "along with the files with the highest peaks and the lines that "
+        "allocated the most.  Files are measured one at a time in each "
+        "process.",
+    )
+    parser.add_argument(
+        "--trace",
+        dest="trace",
+        metavar="FILE",
+        help="Write a timeline of the run to FILE, in the Chrome trace event "
+        "format, for viewing in Perfetto or chrome://tracing.",
+    )
+    parser.add_argument(
+        "--profile-slow",
+        dest="profile_slow",
+        type=float,
+        metavar="SECONDS",
+        help="Sort each file under cProfile, and save the profiles of files "
+        "that take at least SECONDS to --profile-dir.  Profiling slows "
+        "sorting down, and only one file is profiled at a time in each "
+        "process.",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        dest="profile_dir",
+        default="ssort-profiles",
+        metavar="DIR",
+        help="Directory in which to save profiles for --profile-slow, named "
+        "after the path of each file.  Defaults to ssort-profiles.",
+    )
+    parser.add_argument(
+        "--max-in-flight-bytes",
+        dest="max_in_flight_bytes",
+        type=int,
+        default=_DEFAULT_MAX_IN_FLIGHT_BYTES,
+        metavar="BYTES",
+        help="When sorting in parallel, stop reading new files while the "
+        "files that have been read but not yet reported add up to more than "
+        f"this many bytes.  Defaults to {_DEFAULT_MAX_IN_FLIGHT_BYTES}.",
+    )
+    parser.add_argument(
+        "--shard",
+        dest="shard",
+        type=_parse_shard,
+        metavar="INDEX/COUNT",
+        help="Only sort one of COUNT disjoint slices of the files found, "
+        "counting from 1.  Used to split a run between several machines.",
+    )
+    parser.add_argument(
+        "--shard-by",
+        dest="shard_by",
+        choices=["path", "size"],
+        default="path",
+        help="Assign files to shards by a hash of their path, which is stable "
+        "as files are added and removed, or so as to balance the total size "
+        "of each shard.  Defaults to path.",
+    )
+    parser.add_argument(
+        "--summary-json",
+        dest="summary_json",
+        metavar="FILE",
+        help="Write a summary of the run to FILE, for use with "
+        "--merge-summaries.",
+    )
+    parser.add_argument(
+        "--merge-summaries",
+        dest="merge_summaries",
+        nargs="+",
+        metavar="FILE",
+        help="Combine the summaries written by --summary-json from several "
+        "runs, such as one per shard, and exit with the status of the "
+        "combined run.  No files are sorted.",
+    )
     parser.add_argument(
         "files",
         nargs="*",
@@ -52,186 +457,530 @@ def main():
         sys.stdout.write(f"ssort {__version__}\n")
         return
 
-    unsorted = 0
-    unsortable = 0
-    unchanged = 0
+    if args.jobs is not None and args.jobs < 0:
+        parser.error("argument -j/--jobs: must not be negative")
 
-    for path in find_python_files(args.files):
-        errors = False
+    if args.executor == "interpreter" and sys.version_info < (3, 14):
+        parser.error(
+            "argument --executor: interpreter requires python 3.14 or later"
+        )
 
+    if args.max_in_flight_bytes < 1:
+        parser.error("argument --max-in-flight-bytes: must be positive")
+
+    if args.fail_fast and not args.check:
+        parser.error("argument --fail-fast: can only be used with --check")
+
+    if args.merge_summaries is not None:
+        if args.files:
+            parser.error(
+                "argument --merge-summaries: can't be combined with files"
+            )
+        _merge_summaries(args.merge_summaries)
+        return
+
+    # Everything below is imported lazily so that trivial invocations, and
+    # invocations that don't need a particular feature, don't pay for loading
+    # it.  See `tests/test_imports.py`.
+    from ssort._config import ConfigError
+    from ssort._executors import (
+        cancel,
+        completed,
+        create_executor,
+        resolve_jobs,
+    )
+    from ssort._files import find_python_files, get_config
+    from ssort._io import ReadAhead, create_io_executor
+    from ssort._progress import Progress
+    from ssort._scheduling import estimate_costs, largest_first, run_in_order
+    from ssort._summary import Summary, dump_summary
+    from ssort._trace import Trace, worker_id
+    from ssort._utils import escape_path
+    from ssort._worker import FileResult, Status, sort_file
+
+    trace = Trace() if args.trace is not None else None
+    main_worker = worker_id()
+    discovery_start = time.perf_counter()
+
+    try:
+        config = get_config(pathlib.Path(os.getcwd()))
+        paths = list(find_python_files(args.files))
+    except ConfigError as exc:
+        sys.stderr.write(f"ERROR: {exc}\n")
+        sys.exit(1)
+
+    cache = None
+    if args.cache_dir is not None or config.cache_dir is not None:
+        from ssort._cache import Cache
+
+        cache = Cache(
+            pathlib.Path(args.cache_dir)
+            if args.cache_dir is not None
+            else config.cache_dir
+        )
+    elif args.resume:
+        parser.error("argument --resume: requires a cache directory")
+
+    if args.changed_since is not None or args.staged:
+        paths = _filter_changed(
+            paths, ref=args.changed_since, staged=args.staged
+        )
+
+    if args.shard is not None:
+        from ssort._shards import shard_by_path, shard_by_size
+
+        index, count = args.shard
+        if args.shard_by == "size":
+            paths = shard_by_size(
+                paths, [_file_size(path) for path in paths], index, count
+            )
+        else:
+            paths = shard_by_path(paths, index, count)
+
+    if args.explain:
+        _explain(paths, top=args.top)
+        return
+
+    # Git blob SHAs for files with content that can be identified without
+    # reading them.  These are used directly as cache keys.
+    known_blobs = {}
+    if args.staged or cache is not None:
+        known_blobs = _get_known_blobs(paths, staged=args.staged)
+
+    if trace is not None:
+        trace.add(
+            "discovery",
+            discovery_start,
+            time.perf_counter() - discovery_start,
+            worker=main_worker,
+            thread_name="main",
+            args={"files": len(paths)},
+        )
+
+    jobs = resolve_jobs(args.jobs if args.jobs is not None else config.jobs)
+
+    # Files are started in this order.  When sorting in parallel, the largest
+    # files go first so that they don't end up running alone at the end.
+    order = range(len(paths))
+    sizes = None
+    if jobs > 1:
+        sizes = [_file_size(path) for path in paths]
+        order = largest_first(
+            estimate_costs(
+                sizes,
+                [
+                    cache.get_timing(str(path)) if cache is not None else None
+                    for path in paths
+                ],
+            )
+        )
+
+    # When checking staged changes we want to look at the content that will
+    # actually be committed rather than whatever is in the working tree.  Blobs
+    # are read by SHA, as they are needed, from a single `git cat-file`
+    # process.
+    staged_blobs = None
+    if args.staged:
+        from ssort._git import BlobReader
+
+        staged_blobs = BlobReader()
+
+    # Outcomes of files that were completed by an interrupted run, keyed by
+    # path, that can be replayed rather than redone.
+    journal = None
+    journal_entries = {}
+    if cache is not None:
+        from ssort._journal import Journal, run_id
+
+        journal = Journal(
+            cache.directory,
+            run_id(
+                {
+                    "cwd": os.getcwd(),
+                    "files": args.files,
+                    "check": args.check,
+                    "diff": args.show_diff,
+                    "changed_since": args.changed_since,
+                    "staged": args.staged,
+                    "shard": args.shard,
+                    "shard_by": args.shard_by,
+                }
+            ),
+        )
+        if args.resume:
+            journal_entries = journal.load()
+        journal.open(resume=args.resume)
+
+    def _known_result(path, key):
+        """
+        Returns the result for the file at `path`, which has content with the
+        blob SHA `key`, if it is already known without sorting it.  The result
+        is paired with a flag that is set if it was replayed from the journal.
+        """
+        entry = journal_entries.get(str(path))
+        if entry is not None and entry.key == key:
+            return entry.result, True
+        if cache is not None and cache.is_sorted(key):
+            return FileResult(Status.UNCHANGED), False
+        return None
+
+    def _record(path, key, result):
+        if journal is not None and key is not None and str(path) != "-":
+            journal.record(str(path), key, result)
+
+    # Content read, cache key, and whether the result was replayed from the
+    # journal, for files that have been started but not yet reported.
+    reads = {}
+
+    def _start(index):
+        """
+        Reads the file at `paths[index]` and submits it to be sorted.  Returns
+        a future for the result.  Files that don't need sorting resolve
+        immediately.
+        """
+        path = paths[index]
+        reads[index] = None, None, False
+        progress.start(index, path)
+
+        key = known_blobs.get(path)
+        if key is not None:
+            known = _known_result(path, key)
+            if known is not None:
+                result, resumed = known
+                reads[index] = None, key, resumed
+                progress.cached()
+                return completed(result)
+
+        read_start = time.perf_counter()
         if str(path) == "-":
             original_bytes = sys.stdin.buffer.read()
+        elif staged_blobs is not None and path in known_blobs:
+            original_bytes = _read_staged_blob(staged_blobs, key)
         else:
             try:
-                original_bytes = path.read_bytes()
-            except FileNotFoundError:
-                sys.stderr.write(
-                    f"ERROR: {escape_path(path)} does not exist\n"
-                )
-                unsortable += 1
-                continue
-            except IsADirectoryError:
-                sys.stderr.write(
-                    f"ERROR: {escape_path(path)} is a directory\n"
-                )
-                unsortable += 1
-                continue
-            except PermissionError:
-                sys.stderr.write(
-                    f"ERROR: {escape_path(path)} is not readable\n"
-                )
-                unsortable += 1
-                continue
+                original_bytes = read_ahead.read(index)
+            except (
+                FileNotFoundError,
+                IsADirectoryError,
+                PermissionError,
+            ) as exc:
+                message = _read_error_message(path, exc)
+            else:
+                message = None
 
-        # The logic for converting from bytes to text is duplicated in `ssort`
-        # and here because we need access to the text to be able to compute a
-        # diff at the end.
-        try:
-            encoding = detect_encoding(original_bytes)
-        except UnknownEncodingError as exc:
-            sys.stderr.write(
-                f"ERROR: unknown encoding, {exc.encoding!r}, in {escape_path(path)}\n"
-            )
-            if str(path) == "-":
-                sys.stdout.buffer.write(original_bytes)
-            unsortable += 1
-            continue
+            if message is not None:
+                return completed(
+                    FileResult(Status.UNSORTABLE, messages=(message,))
+                )
 
-        try:
-            original = original_bytes.decode(encoding)
-        except UnicodeDecodeError as exc:
-            sys.stderr.write(
-                f"ERROR: encoding error in {escape_path(path)}: {exc}\n"
+        progress.read(len(original_bytes))
+        read_elapsed = time.perf_counter() - read_start
+        if args.stats:
+            file_phases[index] = {"read": read_elapsed}
+        if trace is not None:
+            trace.add(
+                "read",
+                read_start,
+                read_elapsed,
+                worker=main_worker,
+                thread_name="main",
+                args={"path": escape_path(path)},
             )
-            if str(path) == "-":
-                sys.stdout.buffer.write(original_bytes)
-            unsortable += 1
-            continue
-
-        newline = detect_newline(original)
-        original = normalize_newlines(original)
 
-        def _on_parse_error(message, *, lineno, col_offset, **kwargs):
-            nonlocal errors
-            errors = True
+        if cache is not None and key is None and str(path) != "-":
+            from ssort._cache import blob_sha
 
-            sys.stderr.write(
-                f"ERROR: syntax error in {escape_path(path)}: "
-                + f"line {lineno}, column {col_offset}\n"
-            )
+            key = blob_sha(original_bytes)
 
-        def _on_unresolved(message, *, name, lineno, col_offset, **kwargs):
-            nonlocal errors
-            errors = True
+        # The original content is only needed after sorting to pass through
+        # stdin, or to check for unstaged changes.  Otherwise it is dropped as
+        # soon as it has been handed to a worker.
+        if str(path) == "-" or staged_blobs is not None:
+            reads[index] = original_bytes, key, False
+        else:
+            reads[index] = None, key, False
+
+        if key is not None:
+            known = _known_result(path, key)
+            if known is not None:
+                result, resumed = known
+                reads[index] = reads[index][:2] + (resumed,)
+                progress.cached()
+                return completed(result)
+
+        if not original_bytes:
+            # Empty files are trivially sorted.  Skipping them here means that
+            # editor integrations piping in empty buffers never need to load
+            # the sorting machinery.
+            return completed(FileResult(Status.UNCHANGED))
+
+        return executor.submit(
+            sort_file,
+            path,
+            original_bytes,
+            diff=args.show_diff,
+            stats=args.stats,
+            trace=trace is not None,
+            memory=args.memory_report,
+            profile_slow=args.profile_slow,
+        )
 
-            sys.stderr.write(
-                f"ERROR: unresolved dependency {name!r} "
-                + f"in {escape_path(path)}: "
-                + f"line {lineno}, column {col_offset}\n"
-            )
+    unsorted = 0
+    unsortable = 0
+    unchanged = 0
 
-        def _on_wildcard_import(**kwargs):
-            sys.stderr.write(
-                "WARNING: can't determine dependencies on * import\n"
-            )
+    def _failed():
+        return args.fail_fast and bool(unsorted or unsortable)
+
+    def _should_read_ahead(index):
+        path = paths[index]
+        if (
+            str(path) == "-"
+            or staged_blobs is not None
+            and path in known_blobs
+        ):
+            return False
+        key = known_blobs.get(path)
+        return key is None or _known_result(path, key) is None
+
+    # Pending writes, paired with the index of the file being written and the
+    # cache key to record once they succeed.
+    writes = []
+
+    # Time spent in each phase by each file, for `--stats`.
+    file_phases = {}
+
+    # Memory allocated by each file, for `--memory-report`.
+    file_memory = {}
+
+    # The progress line is only useful to someone watching, and would litter
+    # logs with partial lines, so it is only shown on a terminal.
+    progress = Progress(
+        len(order),
+        sys.stderr if args.progress and sys.stderr.isatty() else None,
+    )
 
-        try:
-            updated = ssort(
-                original,
-                filename=escape_path(path),
-                on_parse_error=_on_parse_error,
-                on_unresolved=_on_unresolved,
-                on_wildcard_import=_on_wildcard_import,
+    executor = create_executor(args.executor, jobs)
+    io_executor = create_io_executor()
+    with executor, io_executor:
+        read_ahead = ReadAhead(
+            io_executor,
+            paths,
+            order,
+            count=max(4, 2 * jobs),
+            should_read=_should_read_ahead,
+            sizes=sizes,
+            max_bytes=args.max_in_flight_bytes,
+        )
+
+        def _until_failed(results):
+            # The outcome is checked after each result has been reported and
+            # before asking for the next, as asking can start more files.
+            for result in results:
+                yield result
+                if _failed():
+                    # Nothing that happens after this point can change the
+                    # outcome, so throw away any work that is still
+                    # outstanding.
+                    read_ahead.stop()
+                    cancel(executor)
+                    return
+
+        # Keep enough files in flight to keep every worker busy, while still
+        # reporting results in the order in which the files were found.
+        for index, future in progress.track(
+            _until_failed(
+                run_in_order(
+                    _start,
+                    read_ahead,
+                    window=2 * jobs,
+                    sizes=sizes,
+                    max_bytes=args.max_in_flight_bytes,
+                )
             )
+        ):
+            path = paths[index]
+            original_bytes, key, resumed = reads.pop(index)
+            read_ahead.release(index)
 
-            if errors:
+            try:
+                result = future.result()
+            except Exception as e:
                 if str(path) == "-":
                     sys.stdout.buffer.write(original_bytes)
-                unsortable += 1
-                continue
-
-        except Exception as e:
-            if str(path) == "-":
-                sys.stdout.buffer.write(original_bytes)
-            raise Exception(f"ERROR while sorting {path}\n") from e
-
-        if original != updated:
-            unsorted += 1
-            if args.check:
+                raise Exception(f"ERROR while sorting {path}\n") from e
+
+            if cache is not None and result.duration is not None:
+                cache.record_timing(str(path), result.duration)
+            if result.profile is not None:
+                profile_path = _profile_path(args.profile_dir, path)
+                profile_path.parent.mkdir(parents=True, exist_ok=True)
+                profile_path.write_bytes(result.profile)
                 sys.stderr.write(
-                    f"ERROR: {escape_path(path)} is incorrectly sorted\n"
+                    f"Profiled {escape_path(path)} in "
+                    f"{escape_path(profile_path)}\n"
                 )
-            else:
-                sys.stderr.write(f"Sorting {escape_path(path)}\n")
-
-                # The logic for converting from bytes to text is duplicated in
-                # `ssort` and here because we need access to the text to be able
-                # to compute a diff at the end.
-                # We rename a little prematurely to avoid shadowing `updated`,
-                # which we use later for printing the diff.
-                updated_bytes = updated
-                if newline != "\n":
-                    updated_bytes = re.sub("\n", newline, updated_bytes)
-                updated_bytes = updated_bytes.encode(encoding)
-
+            if result.memory is not None:
+                file_memory[index] = result.memory
+            if args.stats and result.phases:
+                file_phases.setdefault(index, {}).update(result.phases)
+            if trace is not None:
+                for name, start, duration in result.spans:
+                    trace.add(
+                        name,
+                        start,
+                        duration,
+                        worker=result.worker,
+                        thread_name="worker",
+                        args={"path": escape_path(path)},
+                    )
+
+            sys.stderr.writelines(result.messages)
+
+            if result.status == Status.UNSORTABLE:
                 if str(path) == "-":
-                    sys.stdout.buffer.write(updated_bytes)
+                    sys.stdout.buffer.write(original_bytes)
+                if not resumed:
+                    _record(path, key, result)
+                unsortable += 1
+                continue
+
+            if (
+                result.status == Status.UNSORTED
+                and not args.check
+                and staged_blobs is not None
+            ):
+                # Writing the sorted index content back to the working tree
+                # would clobber any unstaged changes, or recreate a file that
+                # has since been deleted.
+                try:
+                    working_bytes = path.read_bytes()
+                except OSError as exc:
+                    message = _read_error_message(path, exc)
                 else:
-                    path.write_bytes(updated_bytes)
-        else:
-            if str(path) == "-" and not args.check:
-                sys.stdout.buffer.write(original_bytes)
-            unchanged += 1
-
-        if args.show_diff:
-            sys.stderr.writelines(
-                difflib.unified_diff(
-                    original.splitlines(keepends=True),
-                    updated.splitlines(keepends=True),
-                    fromfile=f"{path}:before",
-                    tofile=f"{path}:after",
-                )
+                    message = None
+                    if working_bytes != original_bytes:
+                        message = (
+                            f"ERROR: {escape_path(path)} has unstaged "
+                            "changes\n"
+                        )
+                if message is not None:
+                    sys.stderr.write(message)
+                    unsortable += 1
+                    continue
+
+            if result.status == Status.UNSORTED:
+                unsorted += 1
+                if args.check:
+                    sys.stderr.write(
+                        f"ERROR: {escape_path(path)} is incorrectly sorted\n"
+                    )
+                    if not resumed:
+                        _record(path, key, result)
+                elif str(path) == "-":
+                    sys.stderr.write(f"Sorting {escape_path(path)}\n")
+                    sys.stdout.buffer.write(result.updated_bytes)
+                elif not resumed:
+                    sys.stderr.write(f"Sorting {escape_path(path)}\n")
+                    written_key = None
+                    if cache is not None:
+                        from ssort._cache import blob_sha
+
+                        written_key = blob_sha(result.updated_bytes)
+                        # Recorded before the write completes.  If the run is
+                        # interrupted before it does then the content won't
+                        # match the journal and the file will be redone.
+                        _record(path, written_key, result)
+                    writes.append(
+                        (
+                            index,
+                            io_executor.submit(
+                                _timed_write, path, result.updated_bytes
+                            ),
+                            written_key if not result.warnings else None,
+                        )
+                    )
+                else:
+                    sys.stderr.write(f"Sorting {escape_path(path)}\n")
+            else:
+                if str(path) == "-" and not args.check:
+                    sys.stdout.buffer.write(original_bytes)
+                if (
+                    cache is not None
+                    and key is not None
+                    and not result.warnings
+                ):
+                    cache.mark_sorted(key)
+                if not resumed:
+                    _record(path, key, result)
+                unchanged += 1
+
+            sys.stderr.writelines(result.diff)
+
+    for index, write, written_key in writes:
+        start, elapsed, worker = write.result()
+        if written_key is not None:
+            cache.mark_sorted(written_key)
+        if index in file_phases:
+            file_phases[index]["write"] = elapsed
+        if trace is not None:
+            trace.add(
+                "write",
+                start,
+                elapsed,
+                worker=worker,
+                thread_name="io",
+                args={"path": escape_path(paths[index])},
             )
 
-    if args.check:
+    if staged_blobs is not None:
+        staged_blobs.close()
 
-        def _fmt_count(count):
-            return f"{count} file" if count == 1 else f"{count} files"
-
-        summary = []
-        if unsorted:
-            summary.append(f"{_fmt_count(unsorted)} would be resorted")
-        if unchanged:
-            summary.append(f"{_fmt_count(unchanged)} would be left unchanged")
-        if unsortable:
-            summary.append(f"{_fmt_count(unsortable)} would not be sortable")
-        if not unsorted and not unchanged and not unsortable:
-            summary.append("No files are present to be sorted. Nothing to do.")
+    if cache is not None:
+        cache.save()
 
-        sys.stderr.write(", ".join(summary) + "\n")
+    # The run is complete, so there is nothing left to resume.
+    if journal is not None:
+        journal.remove()
 
-        if unsorted or unsortable:
-            sys.exit(1)
-
-    else:
-
-        def _fmt_count_were(count):
-            if count == 1:
-                return f"{count} file was"
-            else:
-                return f"{count} files were"
+    if trace is not None:
+        trace.dump(pathlib.Path(args.trace))
 
-        summary = []
-        if unsorted:
-            summary.append(f"{_fmt_count_were(unsorted)} resorted")
-        if unchanged:
-            summary.append(f"{_fmt_count_were(unchanged)} left unchanged")
-        if unsortable:
-            summary.append(f"{_fmt_count_were(unsortable)} not sortable")
-        if not unsorted and not unchanged and not unsortable:
-            summary.append("No files are present to be sorted. Nothing to do.")
+    if args.stats:
+        from ssort._phases import format_stats
 
-        sys.stderr.write(", ".join(summary) + "\n")
+        sys.stderr.writelines(
+            format_stats(
+                [
+                    (escape_path(paths[index]), phases)
+                    for index, phases in sorted(file_phases.items())
+                ],
+                top=args.top,
+            )
+        )
+
+    if args.memory_report:
+        from ssort._memory import format_memory_report
+
+        sys.stderr.writelines(
+            format_memory_report(
+                [
+                    (escape_path(paths[index]), usage)
+                    for index, usage in sorted(file_memory.items())
+                ],
+                top=args.top,
+            )
+        )
+
+    summary = Summary(
+        check=args.check,
+        unsorted=unsorted,
+        unchanged=unchanged,
+        unsortable=unsortable,
+        skipped=len(paths) - unsorted - unchanged - unsortable,
+        shard=args.shard,
+    )
+    if args.summary_json is not None:
+        dump_summary(summary, pathlib.Path(args.summary_json))
 
-        if unsortable:
-            sys.exit(1)
+    _report(summary)
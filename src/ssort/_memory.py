@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import tracemalloc
+from typing import Any, Iterator, Sequence
+
+from ssort._phases import Recorder, active_recorder, phase_order, recording
+
+# Number of lines that allocated the most memory to keep for each file.
+_SITES = 5
+
+
+@dataclasses.dataclass(frozen=True)
+class MemoryUsage:
+    """
+    The peak memory allocated while sorting a file, in bytes above what was
+    allocated before it started, overall and in each phase.  `sites` are the
+    lines responsible for the most memory at the high point of the sort.
+    """
+
+    peak: int
+    phases: tuple[tuple[str, int], ...] = ()
+    sites: tuple[tuple[str, int], ...] = ()
+
+
+class MemoryRecorder:
+    """
+    Measures the peak memory allocated in each phase with `tracemalloc`, and
+    passes every phase on to `parent`, the recorder that was active before.
+
+    `tracemalloc` counts allocations from every thread in the process, so
+    files must be measured one at a time.
+    """
+
+    def __init__(self, *, parent: Recorder | None) -> None:
+        self._parent = parent
+        self._peaks: dict[str, int] = {}
+        # The memory allocated at the start of each phase that is in
+        # progress, and the highest peak seen within it so far.
+        self._stack: list[list[int]] = []
+        self._baseline = 0
+        self._baseline_snapshot: tracemalloc.Snapshot | None = None
+        self._highest_peak = 0
+        self._highest_current = 0
+        self._sites: tuple[tuple[str, int], ...] = ()
+        self._started_tracing = False
+
+    def start(self) -> None:
+        # Tracing slows down every allocation, so it is only left running if
+        # something else had already started it.
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._baseline_snapshot = tracemalloc.take_snapshot()
+        self._baseline, _ = tracemalloc.get_traced_memory()
+        self._highest_current = self._baseline
+        tracemalloc.reset_peak()
+
+    def _take_sites(self) -> None:
+        assert self._baseline_snapshot is not None
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        differences = snapshot.compare_to(self._baseline_snapshot, "lineno")
+        self._sites = tuple(
+            (str(difference.traceback[0]), difference.size_diff)
+            for difference in differences[:_SITES]
+            if difference.size_diff > 0
+        )
+
+    def begin(self, name: str) -> None:
+        if self._parent is not None:
+            self._parent.begin(name)
+
+        # Resetting the peak for this phase would lose the peak so far in the
+        # phase that contains it, so it is saved first.
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        self._highest_peak = max(self._highest_peak, peak)
+        tracemalloc.reset_peak()
+        self._stack.append([current, current])
+
+    def end(self, name: str, counters: dict[str, Any]) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        baseline, seen = self._stack.pop()
+        peak = max(peak, seen)
+        self._peaks[name] = max(self._peaks.get(name, 0), peak - baseline)
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        self._highest_peak = max(self._highest_peak, peak)
+
+        # Snapshots are expensive, so are only taken when more memory is held
+        # than at the end of any phase before.
+        if current > self._highest_current:
+            self._highest_current = current
+            self._take_sites()
+
+        if self._parent is not None:
+            self._parent.end(name, counters)
+
+    def stop(self) -> None:
+        _, peak = tracemalloc.get_traced_memory()
+        self._highest_peak = max(self._highest_peak, peak)
+        self._baseline_snapshot = None
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    def usage(self) -> MemoryUsage:
+        return MemoryUsage(
+            peak=self._highest_peak - self._baseline,
+            phases=tuple(self._peaks.items()),
+            sites=self._sites,
+        )
+
+
+@contextlib.contextmanager
+def measuring_memory() -> Iterator[MemoryRecorder]:
+    """
+    Measures the memory allocated by the enclosed block, and by each phase
+    within it.
+    """
+    recorder = MemoryRecorder(parent=active_recorder())
+    recorder.start()
+    try:
+        with recording(recorder):
+            yield recorder
+    finally:
+        recorder.stop()
+
+
+def _format_size(size: int) -> str:
+    if size >= 1_000_000:
+        return f"{size / 1e6:.1f} MB"
+    return f"{size / 1e3:.1f} kB"
+
+
+def format_memory_report(
+    files: Sequence[tuple[str, MemoryUsage]], *, top: int
+) -> list[str]:
+    """
+    Formats a table of the highest peak in each phase across all `files`,
+    followed by the `top` files with the highest peaks overall and the lines
+    that allocated the most memory in each.
+    """
+    peaks: dict[str, int] = {}
+    for _, usage in files:
+        for name, size in usage.phases:
+            peaks[name] = max(peaks.get(name, 0), size)
+
+    lines = [f"{'phase':<20}{'peak':>12}\n"]
+    for name in sorted(peaks, key=phase_order):
+        lines.append(f"{name:<20}{_format_size(peaks[name]):>12}\n")
+
+    highest = sorted(files, key=lambda file: file[1].peak, reverse=True)[:top]
+    if highest:
+        lines.append("highest peaks:\n")
+    for path, usage in highest:
+        breakdown = ", ".join(
+            f"{name} {_format_size(size)}"
+            for name, size in sorted(
+                usage.phases, key=lambda item: item[1], reverse=True
+            )
+        )
+        lines.append(f"{_format_size(usage.peak):>12}  {path} ({breakdown})\n")
+        for site, size in usage.sites:
+            lines.append(f"{_format_size(size):>16}  {site}\n")
+    return lines
@@ -1,4 +1,7 @@
 import ast
+import contextlib
+import sys
+import threading
 import warnings
 from io import StringIO
 from token import NAME
@@ -203,8 +206,19 @@ def split_class(statement):
     return head_text, body_statements
 
 
+# `warnings.catch_warnings` swaps out global state, and so is not safe to use
+# from multiple threads at once unless warning filters are context aware.
+_WARNINGS_LOCK = threading.Lock()
+
+
+def _warnings_guard():
+    if getattr(sys.flags, "context_aware_warnings", False):
+        return contextlib.nullcontext()
+    return _WARNINGS_LOCK
+
+
 def parse(root_text, *, filename="<unknown>"):
-    with warnings.catch_warnings():
+    with _warnings_guard(), warnings.catch_warnings():
         warnings.simplefilter("ignore")
         try:
             root_node = ast.parse(root_text, filename)
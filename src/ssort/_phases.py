@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import time
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Mapping,
+    Protocol,
+    Sequence,
+    TypeVar,
+)
+
+# The order in which phases are listed in reports, which is roughly the order
+# in which they happen to each file.
+PHASES = (
+    "read",
+    "detect_encoding",
+    "decode",
+    "parse",
+    "split",
+    "requirements",
+    "graph",
+    "replace_cycles",
+    "topological_sort",
+    "sort_class",
+    "render",
+    "write",
+)
+
+
+class Recorder(Protocol):
+    def begin(self, name: str) -> None: ...
+
+    def end(self, name: str, counters: dict[str, Any]) -> None: ...
+
+
+_R = TypeVar("_R", bound=Recorder)
+
+
+class PhaseRecorder:
+    """
+    Accumulates the time spent in each phase of sorting a file.
+
+    Phases can be nested, for example when sorting a class while rendering the
+    module that contains it.  Time is only ever attributed to the innermost
+    phase, so the totals add up to the time spent in all phases.
+
+    If `spans` is set then every phase is also kept, as its name, start time
+    and duration, in the order in which they end.
+    """
+
+    def __init__(self, *, spans: bool = False) -> None:
+        self.spans: list[tuple[str, float, float]] = []
+        self._keep_spans = spans
+        self._totals: dict[str, float] = {}
+        self._stack: list[list] = []
+
+    def begin(self, name: str) -> None:
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def end(self, name: str, counters: dict[str, Any]) -> None:
+        name, start, nested = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        self._totals[name] = self._totals.get(name, 0.0) + elapsed - nested
+        if self._keep_spans:
+            self.spans.append((name, start, elapsed))
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def totals(self) -> dict[str, float]:
+        return dict(self._totals)
+
+
+class PhaseHook:
+    """
+    Passes the start and end of each phase to an `on_phase` callback, and on
+    to `parent`, the recorder that was active before, if there was one.
+    """
+
+    def __init__(
+        self, on_phase: Callable[..., Any], *, parent: Recorder | None
+    ) -> None:
+        self._on_phase = on_phase
+        self._parent = parent
+
+    def begin(self, name: str) -> None:
+        if self._parent is not None:
+            self._parent.begin(name)
+        self._on_phase(phase=name, event="start")
+
+    def end(self, name: str, counters: dict[str, Any]) -> None:
+        self._on_phase(phase=name, event="end", **counters)
+        if self._parent is not None:
+            self._parent.end(name, counters)
+
+
+_RECORDER: contextvars.ContextVar[Recorder | None] = contextvars.ContextVar(
+    "ssort_phase_recorder", default=None
+)
+
+
+def active_recorder() -> Recorder | None:
+    return _RECORDER.get()
+
+
+@contextlib.contextmanager
+def phase(name: str) -> Iterator[dict[str, Any] | None]:
+    """
+    Marks the enclosed block as part of the named phase for the recorder that
+    is active in the current context, if there is one.
+
+    Yields a dictionary into which the block can put counters describing the
+    work that it did, or `None` if nothing is recording, in which case there
+    is no need to count anything.
+    """
+    recorder = _RECORDER.get()
+    if recorder is None:
+        yield None
+        return
+
+    counters: dict[str, Any] = {}
+    recorder.begin(name)
+    try:
+        yield counters
+    finally:
+        recorder.end(name, counters)
+
+
+@contextlib.contextmanager
+def recording(recorder: _R) -> Iterator[_R]:
+    """
+    Makes `recorder` the active recorder for the enclosed block.  The recorder
+    is a context variable, so each worker thread records independently.
+    """
+    token = _RECORDER.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _RECORDER.reset(token)
+
+
+def hooked(on_phase: Callable[..., Any]) -> contextlib.AbstractContextManager:
+    """
+    Passes phase events from the enclosed block to `on_phase`, without
+    interrupting any recorder that is already active.
+    """
+    return recording(PhaseHook(on_phase, parent=active_recorder()))
+
+
+def phase_order(name: str) -> int:
+    return PHASES.index(name) if name in PHASES else len(PHASES)
+
+
+def format_stats(
+    files: Sequence[tuple[str, Mapping[str, float]]], *, top: int
+) -> list[str]:
+    """
+    Formats a table of the total time spent in each phase across all `files`,
+    followed by a breakdown of the `top` slowest files.  Each file is given as
+    its escaped path and the time it spent in each phase.
+    """
+    totals: dict[str, float] = {}
+    for _, phases in files:
+        for name, seconds in phases.items():
+            totals[name] = totals.get(name, 0.0) + seconds
+    grand_total = sum(totals.values())
+
+    lines = [f"{'phase':<20}{'total':>12}{'share':>8}\n"]
+    for name in sorted(totals, key=phase_order):
+        share = totals[name] / grand_total if grand_total else 0.0
+        lines.append(f"{name:<20}{totals[name]:>11.3f}s{share:>8.1%}\n")
+    lines.append(f"{'total':<20}{grand_total:>11.3f}s\n")
+
+    slowest = sorted(
+        files, key=lambda file: sum(file[1].values()), reverse=True
+    )[:top]
+    if slowest:
+        lines.append("slowest files:\n")
+    for path, phases in slowest:
+        breakdown = ", ".join(
+            f"{name} {seconds:.3f}s"
+            for name, seconds in sorted(
+                phases.items(), key=lambda item: item[1], reverse=True
+            )
+        )
+        lines.append(f"{sum(phases.values()):>11.3f}s  {path} ({breakdown})\n")
+    return lines
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import concurrent.futures
+import shutil
+import threading
+import time
+from typing import IO, Hashable, Iterable, Iterator, TypeVar
+
+from ssort._utils import escape_path
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02}s"
+    return f"{seconds // 3600}h{seconds // 60 % 60:02}m"
+
+
+class Progress:
+    """
+    Keeps a single line on `stream` up to date with the throughput of a run,
+    its cache hit rate, an estimate of the time remaining, and the file that
+    has been in progress for longest.
+
+    All methods must be called from the thread that reports results.  Workers
+    never touch a `Progress` directly, so it is safe to use with any executor.
+    While `track` is waiting for a result, a background thread keeps redrawing
+    the line so that the elapsed time and the slowest file stay current.  If
+    `stream` is `None` then nothing is displayed.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        stream: IO[str] | None,
+        *,
+        interval: float = 0.1,
+    ) -> None:
+        self._total = total
+        self._stream = stream
+        self._interval = interval
+        self._begun = time.monotonic()
+        self._rendered_at: float | None = None
+        self._width = 0
+        self._started: dict[Hashable, tuple[object, float]] = {}
+        self._finished = 0
+        self._cached = 0
+        self._bytes = 0
+        # Guards everything above against the redrawing thread, which only
+        # draws while `_waiting` is set.
+        self._lock = threading.Lock()
+        self._waiting = False
+
+    def start(self, key: Hashable, path: object) -> None:
+        with self._lock:
+            self._started[key] = path, time.monotonic()
+
+    def read(self, size: int) -> None:
+        with self._lock:
+            self._bytes += size
+
+    def cached(self) -> None:
+        with self._lock:
+            self._cached += 1
+
+    def line(self) -> str:
+        now = time.monotonic()
+        elapsed = max(now - self._begun, 1e-9)
+        rate = self._finished / elapsed
+
+        parts = [
+            f"{self._finished}/{self._total} files",
+            f"{rate:.1f} files/s",
+            f"{self._bytes / elapsed / 1e6:.1f} MB/s",
+        ]
+        if self._finished:
+            parts.append(f"{self._cached / self._finished:.0%} cached")
+        if rate:
+            remaining = (self._total - self._finished) / rate
+            parts.append(f"ETA {_format_duration(remaining)}")
+        if self._started:
+            path, started_at = min(
+                self._started.values(), key=lambda item: item[1]
+            )
+            parts.append(
+                f"slowest {escape_path(path)} "
+                f"({_format_duration(now - started_at)})"
+            )
+        return ", ".join(parts)
+
+    def _clear(self) -> None:
+        if self._stream is not None and self._width:
+            self._stream.write("\r" + " " * self._width + "\r")
+            self._stream.flush()
+            self._width = 0
+
+    def _render(self) -> None:
+        if self._stream is None:
+            return
+        now = time.monotonic()
+        if (
+            self._rendered_at is not None
+            and now - self._rendered_at < self._interval
+        ):
+            return
+        self._rendered_at = now
+
+        # The line must not wrap, or returning to its start won't erase it.
+        columns = shutil.get_terminal_size().columns
+        line = self.line()[: max(columns - 1, 0)]
+        self._clear()
+        self._stream.write(line)
+        self._stream.flush()
+        self._width = len(line)
+
+    def _redraw(self, stopped: threading.Event) -> None:
+        while not stopped.wait(self._interval):
+            with self._lock:
+                if self._waiting:
+                    self._render()
+
+    def _wait(self) -> None:
+        with self._lock:
+            self._waiting = True
+            self._render()
+
+    def track(
+        self, results: Iterable[tuple[_K, _V]]
+    ) -> Iterator[tuple[_K, _V]]:
+        """
+        Passes through `results`, keyed by the values passed to `start`,
+        counting each as finished.  The progress line is erased while the
+        caller handles each result, so that anything it writes isn't garbled,
+        and redrawn while waiting for the next.  A future that isn't done yet
+        is waited for before it is passed through.
+        """
+        stopped = threading.Event()
+        redrawing = None
+        if self._stream is not None:
+            redrawing = threading.Thread(
+                target=self._redraw, args=(stopped,), daemon=True
+            )
+            redrawing.start()
+
+        try:
+            self._wait()
+            for key, value in results:
+                if isinstance(value, concurrent.futures.Future):
+                    concurrent.futures.wait([value])
+                with self._lock:
+                    self._waiting = False
+                    self._started.pop(key, None)
+                    self._finished += 1
+                    self._clear()
+                yield key, value
+                self._wait()
+        finally:
+            stopped.set()
+            if redrawing is not None:
+                redrawing.join()
+            with self._lock:
+                self._waiting = False
+                self._clear()
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import concurrent.futures
+from typing import Callable, Iterable, Iterator, Sequence, TypeVar
+
+_T = TypeVar("_T")
+
+
+def estimate_costs(
+    sizes: Sequence[int], timings: Sequence[float | None]
+) -> list[float]:
+    """
+    Estimates the relative time it will take to sort each file.
+
+    Files that were timed on a previous run are assumed to take the same time
+    again.  Other files are estimated from their size, scaled by the average
+    rate of the timed files so that the two kinds of estimate are comparable.
+    """
+    timed_size = 0
+    timed_total = 0.0
+    for size, timing in zip(sizes, timings):
+        if timing is not None:
+            timed_size += size
+            timed_total += timing
+
+    rate = timed_total / timed_size if timed_size and timed_total else 1.0
+
+    return [
+        timing if timing is not None else size * rate
+        for size, timing in zip(sizes, timings)
+    ]
+
+
+def largest_first(costs: Sequence[float]) -> list[int]:
+    """
+    Returns the indices of `costs` ordered from most to least expensive.  Ties
+    are kept in their original order.
+    """
+    return sorted(range(len(costs)), key=lambda index: -costs[index])
+
+
+def run_in_order(
+    start: Callable[[int], concurrent.futures.Future[_T]],
+    order: Iterable[int],
+    *,
+    window: int,
+    sizes: Sequence[int] | None = None,
+    max_bytes: int | None = None,
+) -> Iterator[tuple[int, concurrent.futures.Future[_T]]]:
+    """
+    Calls `start` with each index in `order` and yields the resulting futures,
+    paired with their index, in index order.
+
+    No more than `window` tasks are left running at once.  Idle workers take
+    the next task from the executor's shared queue, so if the most expensive
+    tasks are started first then no worker is left with a long straggler at
+    the end of a run.  Futures are yielded as soon as they, and every future
+    before them, are done.  Any left over once all tasks have been started are
+    yielded immediately, and will block when their results are requested.
+
+    If `max_bytes` is given then a task is only started if the `sizes` of the
+    tasks that have been started but not yet yielded, including it, add up to
+    no more than `max_bytes`.  To guarantee progress, the task that is next to
+    be yielded is allowed to go over the limit, and is started out of order if
+    needed, so `start` must not rely on being called in the order given.
+    """
+    started: dict[int, concurrent.futures.Future[_T]] = {}
+    running: set[concurrent.futures.Future[_T]] = set()
+    seen: set[int] = set()
+    next_index = 0
+    in_flight = 0
+
+    def _fits(index: int) -> bool:
+        if max_bytes is None or sizes is None or not in_flight:
+            return True
+        return in_flight + sizes[index] <= max_bytes
+
+    def _ready() -> Iterator[tuple[int, concurrent.futures.Future[_T]]]:
+        nonlocal next_index, in_flight
+        while next_index in started and started[next_index].done():
+            if sizes is not None:
+                in_flight -= sizes[next_index]
+            yield next_index, started.pop(next_index)
+            next_index += 1
+
+    remaining = iter(order)
+    pending: int | None = None
+    while True:
+        if pending is None or pending in seen:
+            pending = next(
+                (index for index in remaining if index not in seen), None
+            )
+            if pending is None:
+                break
+
+        if _fits(pending):
+            index, pending = pending, None
+        elif next_index not in seen:
+            # Nothing can be released until the next task to be yielded has
+            # run, so it jumps the queue.
+            index = next_index
+        else:
+            concurrent.futures.wait([started[next_index]])
+            yield from _ready()
+            continue
+
+        seen.add(index)
+        future = start(index)
+        started[index] = future
+        if sizes is not None:
+            in_flight += sizes[index]
+        if not future.done():
+            running.add(future)
+
+        while running and len(running) >= window:
+            _, running = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+
+        yield from _ready()
+
+    while next_index in started:
+        yield next_index, started.pop(next_index)
+        next_index += 1
+
+
+def run_as_completed(
+    start: Callable[[int], concurrent.futures.Future[_T]],
+    order: Iterable[int],
+    *,
+    window: int,
+) -> Iterator[tuple[int, concurrent.futures.Future[_T]]]:
+    """
+    Calls `start` with each index in `order` and yields the resulting futures,
+    paired with their index, as soon as they are done.  No more than `window`
+    tasks are left running at once, and `order` is only consumed as tasks
+    finish.
+    """
+    started: dict[int, concurrent.futures.Future[_T]] = {}
+    remaining = iter(order)
+    while True:
+        for index in remaining:
+            started[index] = start(index)
+            if len(started) >= window:
+                break
+        if not started:
+            return
+
+        done, _ = concurrent.futures.wait(
+            set(started.values()),
+            return_when=concurrent.futures.FIRST_COMPLETED,
+        )
+        for index, future in list(started.items()):
+            if future in done:
+                del started[index]
+                yield index, future
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import hashlib
+import pathlib
+from typing import Sequence
+
+
+def _path_hash(path: pathlib.Path) -> int:
+    # Python's builtin `hash` is randomised per process, so it can't be used to
+    # agree on a partition between machines.
+    digest = hashlib.sha1(path.as_posix().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def shard_by_path(
+    paths: Sequence[pathlib.Path], index: int, count: int
+) -> list[pathlib.Path]:
+    """
+    Returns the paths belonging to shard `index` of `count`, counting from 1,
+    assigning each path to a shard based on a hash of the path.
+
+    The assignment of a path doesn't depend on what other files are present,
+    so adding or removing a file never moves other files between shards.
+    """
+    return [path for path in paths if _path_hash(path) % count == index - 1]
+
+
+def shard_by_size(
+    paths: Sequence[pathlib.Path],
+    sizes: Sequence[int],
+    index: int,
+    count: int,
+) -> list[pathlib.Path]:
+    """
+    Returns the paths belonging to shard `index` of `count`, counting from 1,
+    assigning paths so that each shard gets roughly the same number of bytes.
+
+    Files are assigned, largest first, to whichever shard has the fewest bytes
+    so far.  Ties are broken by path and then by shard number, so every
+    machine computes the same partition from the same checkout.
+    """
+    loads = [0] * count
+    selected = set()
+    for position in sorted(
+        range(len(paths)),
+        key=lambda position: (-sizes[position], paths[position].as_posix()),
+    ):
+        shard = min(range(count), key=lambda shard: (loads[shard], shard))
+        loads[shard] += sizes[position]
+        if shard == index - 1:
+            selected.add(position)
+
+    return [
+        path for position, path in enumerate(paths) if position in selected
+    ]
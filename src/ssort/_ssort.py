@@ -1,4 +1,7 @@
 import ast
+import contextlib
+import functools
+import os
 import re
 import sys
 
@@ -14,12 +17,15 @@ from ssort._exceptions import (
     UnknownEncodingError,
     WildcardImportError,
 )
+from ssort._executors import SerialExecutor
 from ssort._graphs import (
     is_topologically_sorted,
     replace_cycles,
     topological_sort,
 )
 from ssort._parsing import parse, split_class
+from ssort._phases import hooked, phase
+from ssort._scheduling import run_as_completed, run_in_order
 from ssort._utils import (
     detect_encoding,
     detect_newline,
@@ -335,7 +341,12 @@ def _statement_text_sorted_class(statement):
 def statement_text_sorted(statement):
     node = statement.node
     if isinstance(node, ast.ClassDef):
-        return _statement_text_sorted_class(statement)
+        with phase("sort_class") as counters:
+            text = _statement_text_sorted_class(statement)
+            if counters is not None:
+                counters["name"] = node.name
+                counters["resorted"] = text != statement.text
+        return text
     return statement.text
 
 
@@ -438,36 +449,30 @@ def _interpret_on_wildcard_import_action(on_wildcard_import):
     return on_wildcard_import
 
 
-def ssort(
+def _sort_text(
     text,
     *,
-    filename="<unknown>",
-    on_unknown_encoding_error="raise",
-    on_decoding_error="raise",
-    on_parse_error="raise",
-    on_unresolved="raise",
-    on_wildcard_import="raise",
+    filename,
+    on_unknown_encoding_error,
+    on_decoding_error,
+    on_parse_error,
+    on_unresolved,
+    on_wildcard_import,
 ):
-    on_unknown_encoding_error = _interpret_on_unknown_encoding_action(
-        on_unknown_encoding_error
-    )
-    on_decoding_error = _interpret_on_decoding_error_action(on_decoding_error)
-    on_parse_error = _interpret_on_parse_error_action(on_parse_error)
-    on_unresolved = _interpret_on_unresolved_action(on_unresolved)
-    on_wildcard_import = _interpret_on_wildcard_import_action(
-        on_wildcard_import
-    )
-
     try:
         encoding = None
         if isinstance(text, bytes):
-            encoding = detect_encoding(text)
-            text = text.decode(encoding)
+            with phase("detect_encoding") as counters:
+                encoding = detect_encoding(text)
+                if counters is not None:
+                    counters["encoding"] = encoding
+            with phase("decode"):
+                text = text.decode(encoding)
     except UnknownEncodingError as exc:
         on_unknown_encoding_error(str(exc), encoding=exc.encoding)
         return text
 
-    except UnicodeDecodeError as exc:
+    except (UnicodeDecodeError, DecodingError) as exc:
         on_decoding_error(str(exc))
         return text
 
@@ -475,36 +480,219 @@ def ssort(
     text = normalize_newlines(text)
 
     try:
-        statements = list(parse(text, filename=filename))
+        with phase("parse"):
+            statements = parse(text, filename=filename)
     except ParseError as exc:
         on_parse_error(str(exc), lineno=exc.lineno, col_offset=exc.col_offset)
         return text
 
+    # `parse` returns a generator that splits the text lazily.
+    with phase("split") as counters:
+        statements = list(statements)
+        if counters is not None:
+            counters["statements"] = len(statements)
+
     if not statements:
         return text
 
-    graph = module_statements_graph(
-        statements,
-        on_unresolved=on_unresolved,
-        on_wildcard_import=on_wildcard_import,
-    )
+    # The requirements and bindings of each statement are cached, so working
+    # them out up front costs nothing extra but lets the analysis be timed
+    # separately from building the graph.
+    with phase("requirements") as counters:
+        requirements = 0
+        bindings = 0
+        for statement in statements:
+            requirements += len(statement.requirements())
+            bindings += len(statement.bindings())
+        if counters is not None:
+            counters["requirements"] = requirements
+            counters["bindings"] = bindings
+
+    with phase("graph") as counters:
+        graph = module_statements_graph(
+            statements,
+            on_unresolved=on_unresolved,
+            on_wildcard_import=on_wildcard_import,
+        )
+        if counters is not None:
+            if graph is not None:
+                counters["nodes"] = len(graph.nodes)
+                counters["edges"] = sum(
+                    len(dependencies)
+                    for dependencies in graph.dependencies.values()
+                )
     if graph is None:
         return text
 
-    replace_cycles(graph, key=sort_key_from_iter(statements))
+    with phase("replace_cycles") as counters:
+        cycles = replace_cycles(graph, key=sort_key_from_iter(statements))
+        if counters is not None:
+            counters["cycles"] = cycles
 
-    sorted_statements = topological_sort(statements, graph=graph)
+    with phase("topological_sort"):
+        sorted_statements = topological_sort(statements, graph=graph)
 
-    assert is_topologically_sorted(sorted_statements, graph=graph)
+        assert is_topologically_sorted(sorted_statements, graph=graph)
 
-    output = "\n".join(
-        statement_text_sorted(statement) for statement in sorted_statements
-    )
-    if output:
-        output += "\n"
+    with phase("render"):
+        output = "\n".join(
+            statement_text_sorted(statement) for statement in sorted_statements
+        )
+        if output:
+            output += "\n"
+
+        # Release the syntax trees and dependency graph before re-encoding the
+        # output so that the two are never held in memory at the same time.
+        del statements, graph, sorted_statements
 
-    if newline != "\n":
-        output = re.sub("\n", newline, output)
-    if encoding is not None:
-        output = output.encode(encoding)
+        if newline != "\n":
+            output = re.sub("\n", newline, output)
+        if encoding is not None:
+            output = output.encode(encoding)
     return output
+
+
+def ssort(
+    text,
+    *,
+    filename="<unknown>",
+    on_unknown_encoding_error="raise",
+    on_decoding_error="raise",
+    on_parse_error="raise",
+    on_unresolved="raise",
+    on_wildcard_import="raise",
+    on_phase=None,
+):
+    """
+    Sorts the statements in `text`, which may be either `str` or `bytes`, and
+    returns the result as the same type.
+
+    The `on_*` arguments control what happens when a file can't safely be
+    sorted.  Each can be "raise", "ignore", or a callback.
+
+    If given, `on_phase` is called with the keyword arguments `phase`, the
+    name of a stage of sorting, and `event`, "start" or "end", as each stage
+    begins and ends.  Any counters describing the stage are passed with its
+    end event:
+
+    - "detect_encoding": `encoding`
+    - "split": `statements`
+    - "requirements": `requirements` and `bindings`
+    - "graph": `nodes` and `edges` of the dependency graph
+    - "replace_cycles": `cycles`, the number of cycles that were broken
+    - "sort_class": `name` and `resorted`, once for each class
+
+    Callbacks should accept and ignore any other keyword arguments, so that
+    new phases and counters can be added.
+    """
+    on_unknown_encoding_error = _interpret_on_unknown_encoding_action(
+        on_unknown_encoding_error
+    )
+    on_decoding_error = _interpret_on_decoding_error_action(on_decoding_error)
+    on_parse_error = _interpret_on_parse_error_action(on_parse_error)
+    on_unresolved = _interpret_on_unresolved_action(on_unresolved)
+    on_wildcard_import = _interpret_on_wildcard_import_action(
+        on_wildcard_import
+    )
+
+    with contextlib.nullcontext() if on_phase is None else hooked(on_phase):
+        return _sort_text(
+            text,
+            filename=filename,
+            on_unknown_encoding_error=on_unknown_encoding_error,
+            on_decoding_error=on_decoding_error,
+            on_parse_error=on_parse_error,
+            on_unresolved=on_unresolved,
+            on_wildcard_import=on_wildcard_import,
+        )
+
+
+def ssort_many(
+    texts,
+    *,
+    on_unknown_encoding_error="raise",
+    on_decoding_error="raise",
+    on_parse_error="raise",
+    on_unresolved="raise",
+    on_wildcard_import="raise",
+    executor=None,
+    ordered=True,
+    max_pending=None,
+):
+    """
+    Sorts each of `texts`, an iterable of `(name, text)` pairs, and yields a
+    `(name, result)` pair for each, where `result` is what `ssort` would
+    return for `text` with `name` as its filename.
+
+    `texts` is consumed lazily, with no more than `max_pending` texts, by
+    default twice the number of CPUs, being sorted or waiting to be yielded at
+    any one time.  Results are yielded in the same order as `texts` unless
+    `ordered` is false, in which case they are yielded as they are ready.
+
+    If given, texts are sorted by submitting them to `executor`, so that they
+    can be sorted in parallel.  The `on_*` arguments are as for `ssort`,
+    except that callbacks are also passed the name of the text as `filename`,
+    are called in the executor's workers and must be picklable when using a
+    process pool.
+
+    An exception raised while sorting a text is raised when its result would
+    have been yielded, which ends the batch.  To carry on past texts that
+    can't be sorted, pass callbacks that record the errors instead.
+    """
+    actions = {
+        "on_unknown_encoding_error": _interpret_on_unknown_encoding_action(
+            on_unknown_encoding_error
+        ),
+        "on_decoding_error": _interpret_on_decoding_error_action(
+            on_decoding_error
+        ),
+        "on_parse_error": _interpret_on_parse_error_action(on_parse_error),
+        "on_unresolved": _interpret_on_unresolved_action(on_unresolved),
+        "on_wildcard_import": _interpret_on_wildcard_import_action(
+            on_wildcard_import
+        ),
+    }
+    if executor is None:
+        executor = SerialExecutor()
+    if max_pending is None:
+        max_pending = 2 * (os.cpu_count() or 1)
+
+    names = {}
+    unstarted = {}
+
+    # Each text counts as one towards `max_pending` until it has been yielded,
+    # including texts that are done but waiting on an earlier, slower one.
+    sizes = []
+
+    def _order():
+        for index, (name, text) in enumerate(texts):
+            names[index] = name
+            unstarted[index] = text
+            sizes.append(1)
+            yield index
+
+    def _start(index):
+        name = names[index]
+        return executor.submit(
+            _sort_text,
+            unstarted.pop(index),
+            filename=name,
+            **{
+                key: functools.partial(action, filename=name)
+                for key, action in actions.items()
+            },
+        )
+
+    if ordered:
+        results = run_in_order(
+            _start,
+            _order(),
+            window=max_pending,
+            sizes=sizes,
+            max_bytes=max_pending,
+        )
+    else:
+        results = run_as_completed(_start, _order(), window=max_pending)
+
+    for index, future in results:
+        yield names.pop(index), future.result()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import json
+import pathlib
+from typing import Any, Iterable
+
+
+class SummaryError(Exception):
+    pass
+
+
+@dataclasses.dataclass(frozen=True)
+class Summary:
+    """
+    Counts of the files processed by a run of ssort, in a form that can be
+    written to disk and combined with the summaries of other shards.
+    """
+
+    check: bool
+    unsorted: int = 0
+    unchanged: int = 0
+    unsortable: int = 0
+    skipped: int = 0
+    shard: tuple[int, int] | None = None
+
+
+def dump_summary(summary: Summary, path: pathlib.Path) -> None:
+    document = dataclasses.asdict(summary)
+    if summary.shard is not None:
+        document["shard"] = list(summary.shard)
+
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def _parse_count(
+    document: dict[str, Any], name: str, *, source: pathlib.Path
+) -> int:
+    value = document.get(name, 0)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise SummaryError(
+            f"{name!r} in {source} must be a non-negative integer"
+        )
+    return value
+
+
+def load_summary(path: pathlib.Path) -> Summary:
+    try:
+        with path.open(encoding="utf-8") as f:
+            document = json.load(f)
+    except OSError as exc:
+        raise SummaryError(f"could not read {path}: {exc.strerror}") from exc
+    except ValueError as exc:
+        raise SummaryError(f"could not parse {path}: {exc}") from exc
+
+    if not isinstance(document, dict):
+        raise SummaryError(f"{path} does not contain a summary")
+
+    check = document.get("check")
+    if not isinstance(check, bool):
+        raise SummaryError(f"'check' in {path} must be a boolean")
+
+    shard = document.get("shard")
+    if shard is not None:
+        if (
+            not isinstance(shard, list)
+            or len(shard) != 2
+            or not all(
+                isinstance(value, int) and not isinstance(value, bool)
+                for value in shard
+            )
+            or not 1 <= shard[0] <= shard[1]
+        ):
+            raise SummaryError(f"'shard' in {path} must be [index, count]")
+        shard = (shard[0], shard[1])
+
+    return Summary(
+        check=check,
+        unsorted=_parse_count(document, "unsorted", source=path),
+        unchanged=_parse_count(document, "unchanged", source=path),
+        unsortable=_parse_count(document, "unsortable", source=path),
+        skipped=_parse_count(document, "skipped", source=path),
+        shard=shard,
+    )
+
+
+def merge_summaries(summaries: Iterable[Summary]) -> Summary:
+    """
+    Combines the summaries of several runs into one.
+
+    If the summaries come from sharded runs then there must be exactly one
+    summary for every shard, so that a shard that failed to report can't be
+    mistaken for one that found nothing wrong.
+    """
+    summaries = list(summaries)
+    if not summaries:
+        raise SummaryError("no summaries to merge")
+
+    if len({summary.check for summary in summaries}) != 1:
+        raise SummaryError(
+            "cannot merge summaries from runs with and without --check"
+        )
+
+    shards = [
+        summary.shard for summary in summaries if summary.shard is not None
+    ]
+    if shards:
+        if len(shards) != len(summaries):
+            raise SummaryError(
+                "cannot merge summaries from sharded and unsharded runs"
+            )
+
+        counts = {count for _, count in shards}
+        if len(counts) != 1:
+            raise SummaryError(
+                "cannot merge summaries with different shard counts"
+            )
+        (count,) = counts
+
+        indexes = collections.Counter(index for index, _ in shards)
+        for index in range(1, count + 1):
+            if not indexes[index]:
+                raise SummaryError(
+                    f"missing summary for shard {index}/{count}"
+                )
+            if indexes[index] > 1:
+                raise SummaryError(
+                    f"duplicate summaries for shard {index}/{count}"
+                )
+
+    return Summary(
+        check=summaries[0].check,
+        unsorted=sum(summary.unsorted for summary in summaries),
+        unchanged=sum(summary.unchanged for summary in summaries),
+        unsortable=sum(summary.unsortable for summary in summaries),
+        skipped=sum(summary.skipped for summary in summaries),
+    )
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import threading
+import time
+from typing import Any
+
+
+def worker_id() -> tuple[int, int]:
+    """
+    Returns the process and thread ids of the caller, which together identify
+    a worker whatever kind of executor it belongs to.
+    """
+    return os.getpid(), threading.get_native_id()
+
+
+class Trace:
+    """
+    Collects spans covering a run, to be written out in the Chrome trace event
+    format that can be opened in Perfetto or `chrome://tracing`.
+
+    Span start times are `time.perf_counter` values.  The clock behind it is
+    shared between processes on all supported platforms, so spans recorded by
+    worker processes line up with those recorded by the main process.
+    """
+
+    def __init__(self) -> None:
+        self._origin = time.perf_counter()
+        self._events: list[dict[str, Any]] = []
+        self._threads: set[tuple[int, int]] = set()
+
+    def add(
+        self,
+        name: str,
+        start: float,
+        duration: float,
+        *,
+        worker: tuple[int, int],
+        thread_name: str,
+        args: dict[str, Any] | None = None,
+    ) -> None:
+        pid, tid = worker
+        if worker not in self._threads:
+            self._threads.add(worker)
+            self._events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": thread_name},
+                }
+            )
+
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": duration * 1e6,
+            "pid": pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        self._events.append(event)
+
+    def dump(self, path: pathlib.Path) -> None:
+        document = {"traceEvents": self._events, "displayTimeUnit": "ms"}
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(document, f)
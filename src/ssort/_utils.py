@@ -8,7 +8,7 @@ import sys
 import tokenize
 from typing import Any, Callable, Generic, TypeVar
 
-from ssort._exceptions import UnknownEncodingError
+from ssort._exceptions import DecodingError, UnknownEncodingError
 
 
 def sort_key_from_iter(values):
@@ -21,7 +21,12 @@ _T = TypeVar("_T")
 
 
 class _SingleDispatch(Generic[_T]):
-    """A more performant implementation of functools.singledispatch."""
+    """
+    A more performant implementation of functools.singledispatch.
+
+    Implementations are only registered while modules are being imported, so
+    dispatch can safely be called from multiple threads without locking.
+    """
 
     def __init__(self, function: Callable[..., _T]) -> None:
         functools.update_wrapper(self, function)
@@ -47,6 +52,8 @@ single_dispatch = _SingleDispatch
 def cached_method(function: Callable[[Any], _T]) -> Callable[[Any], _T]:
     cached_attribute_name = f"_{function.__name__}_cache"
 
+    # Cached values are pure functions of the instance, so if two threads race
+    # to fill the cache then both will compute and store the same value.
     @functools.wraps(function)
     def wrapper(self) -> _T:
         try:
@@ -79,9 +86,12 @@ def detect_encoding(bytestring):
     try:
         encoding, _ = tokenize.detect_encoding(io.BytesIO(bytestring).readline)
     except SyntaxError as exc:
-        raise UnknownEncodingError(
-            exc.msg, encoding=re.match("unknown encoding: (.*)", exc.msg)[1]
-        ) from exc
+        match = re.match("unknown encoding: (.*)", exc.msg)
+        if match is None:
+            # For example, a coding comment that contradicts a byte order
+            # mark, or a first line that can't be decoded to look for one.
+            raise DecodingError(exc.msg) from exc
+        raise UnknownEncodingError(exc.msg, encoding=match[1]) from exc
     return encoding
 
 
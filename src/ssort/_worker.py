@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import dataclasses
+import enum
+import importlib
+import pathlib
+import re
+import threading
+import time
+
+from ssort._exceptions import DecodingError, UnknownEncodingError
+from ssort._memory import MemoryUsage, measuring_memory
+from ssort._phases import PhaseRecorder, phase, recording
+from ssort._trace import worker_id
+from ssort._utils import (
+    detect_encoding,
+    detect_newline,
+    escape_path,
+    normalize_newlines,
+)
+
+
+class Status(enum.Enum):
+    UNCHANGED = "unchanged"
+    UNSORTED = "unsorted"
+    UNSORTABLE = "unsortable"
+
+
+@dataclasses.dataclass(frozen=True)
+class FileResult:
+    """
+    The outcome of sorting a single file.
+
+    Results are plain values so that they can be returned from worker threads,
+    processes or subinterpreters and reported, in order, by the main thread.
+    """
+
+    status: Status
+    messages: tuple[str, ...] = ()
+    updated_bytes: bytes | None = None
+    diff: tuple[str, ...] = ()
+    warnings: bool = False
+    duration: float | None = None
+    phases: tuple[tuple[str, float], ...] = ()
+    spans: tuple[tuple[str, float, float], ...] = ()
+    worker: tuple[int, int] | None = None
+    profile: bytes | None = None
+    memory: MemoryUsage | None = None
+
+
+def _sort_file(
+    path: pathlib.Path, original_bytes: bytes, *, diff: bool = False
+) -> FileResult:
+    messages = []
+    errors = False
+    warnings = False
+
+    # The logic for converting from bytes to text is duplicated in `ssort`
+    # and here because we need access to the text to be able to compute a
+    # diff at the end.
+    try:
+        with phase("detect_encoding"):
+            encoding = detect_encoding(original_bytes)
+    except UnknownEncodingError as exc:
+        return FileResult(
+            Status.UNSORTABLE,
+            messages=(
+                f"ERROR: unknown encoding, {exc.encoding!r}, in {escape_path(path)}\n",
+            ),
+        )
+    except DecodingError as exc:
+        return FileResult(
+            Status.UNSORTABLE,
+            messages=(
+                f"ERROR: encoding error in {escape_path(path)}: {exc}\n",
+            ),
+        )
+
+    try:
+        with phase("decode"):
+            original = original_bytes.decode(encoding)
+    except UnicodeDecodeError as exc:
+        return FileResult(
+            Status.UNSORTABLE,
+            messages=(
+                f"ERROR: encoding error in {escape_path(path)}: {exc}\n",
+            ),
+        )
+
+    newline = detect_newline(original)
+    original = normalize_newlines(original)
+
+    def _on_parse_error(message, *, lineno, col_offset, **kwargs):
+        nonlocal errors
+        errors = True
+
+        messages.append(
+            f"ERROR: syntax error in {escape_path(path)}: "
+            + f"line {lineno}, column {col_offset}\n"
+        )
+
+    def _on_unresolved(message, *, name, lineno, col_offset, **kwargs):
+        nonlocal errors
+        errors = True
+
+        messages.append(
+            f"ERROR: unresolved dependency {name!r} "
+            + f"in {escape_path(path)}: "
+            + f"line {lineno}, column {col_offset}\n"
+        )
+
+    def _on_wildcard_import(**kwargs):
+        nonlocal warnings
+        warnings = True
+
+        messages.append("WARNING: can't determine dependencies on * import\n")
+
+    # Imported here, rather than at the top of the module, so that runs that
+    # never need to sort anything don't pay for loading the analysis stack.
+    from ssort._ssort import ssort
+
+    updated = ssort(
+        original,
+        filename=escape_path(path),
+        on_parse_error=_on_parse_error,
+        on_unresolved=_on_unresolved,
+        on_wildcard_import=_on_wildcard_import,
+    )
+
+    if errors:
+        return FileResult(
+            Status.UNSORTABLE, messages=tuple(messages), warnings=warnings
+        )
+
+    if original == updated:
+        return FileResult(
+            Status.UNCHANGED, messages=tuple(messages), warnings=warnings
+        )
+
+    updated_bytes = updated
+    if newline != "\n":
+        updated_bytes = re.sub("\n", newline, updated_bytes)
+    updated_bytes = updated_bytes.encode(encoding)
+
+    diff_lines: tuple[str, ...] = ()
+    if diff:
+        import difflib
+
+        diff_lines = tuple(
+            difflib.unified_diff(
+                original.splitlines(keepends=True),
+                updated.splitlines(keepends=True),
+                fromfile=f"{path}:before",
+                tofile=f"{path}:after",
+            )
+        )
+
+    return FileResult(
+        Status.UNSORTED,
+        messages=tuple(messages),
+        updated_bytes=updated_bytes,
+        diff=diff_lines,
+        warnings=warnings,
+    )
+
+
+def _measured_sort_file(
+    path: pathlib.Path, original_bytes: bytes, *, diff: bool, memory: bool
+) -> FileResult:
+    if not memory:
+        return _sort_file(path, original_bytes, diff=diff)
+
+    # Modules that `_sort_file` loads lazily are loaded before measuring
+    # starts, so that the first file sorted in each process isn't charged for
+    # importing them.
+    importlib.import_module("ssort._ssort")
+    if diff:
+        importlib.import_module("difflib")
+
+    with measuring_memory() as recorder:
+        result = _sort_file(path, original_bytes, diff=diff)
+    return dataclasses.replace(result, memory=recorder.usage())
+
+
+def _timed_sort_file(
+    path: pathlib.Path,
+    original_bytes: bytes,
+    *,
+    diff: bool,
+    stats: bool,
+    trace: bool,
+    memory: bool,
+) -> FileResult:
+    start = time.perf_counter()
+    if not stats and not trace:
+        result = _measured_sort_file(
+            path, original_bytes, diff=diff, memory=memory
+        )
+        return dataclasses.replace(
+            result, duration=time.perf_counter() - start
+        )
+
+    with recording(PhaseRecorder(spans=trace)) as recorder:
+        result = _measured_sort_file(
+            path, original_bytes, diff=diff, memory=memory
+        )
+    duration = time.perf_counter() - start
+
+    spans: tuple[tuple[str, float, float], ...] = ()
+    if trace:
+        spans = (("sort_file", start, duration), *recorder.spans)
+    return dataclasses.replace(
+        result,
+        duration=duration,
+        phases=tuple(recorder.totals().items()),
+        spans=spans,
+        worker=worker_id(),
+    )
+
+
+# Both `tracemalloc` and, from python 3.12, `cProfile` measure every thread in
+# the process at once, so sorts that use them are run one at a time in each
+# process.
+_EXCLUSIVE_LOCK = threading.Lock()
+
+
+def _profiled_sort_file(
+    path: pathlib.Path,
+    original_bytes: bytes,
+    *,
+    diff: bool,
+    stats: bool,
+    trace: bool,
+    memory: bool,
+    profile_slow: float,
+) -> FileResult:
+    import cProfile
+    import marshal
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = _timed_sort_file(
+            path,
+            original_bytes,
+            diff=diff,
+            stats=stats,
+            trace=trace,
+            memory=memory,
+        )
+    finally:
+        profiler.disable()
+
+    if result.duration is None or result.duration < profile_slow:
+        return result
+
+    # The same format that `pstats.Stats.dump_stats` writes.
+    profiler.create_stats()
+    return dataclasses.replace(result, profile=marshal.dumps(profiler.stats))
+
+
+def sort_file(
+    path: pathlib.Path,
+    original_bytes: bytes,
+    *,
+    diff: bool = False,
+    stats: bool = False,
+    trace: bool = False,
+    memory: bool = False,
+    profile_slow: float | None = None,
+) -> FileResult:
+    """
+    Sorts the contents of the file at `path`, passed in as `original_bytes`.
+
+    Doesn't touch the filesystem or write any output, and so is safe to call
+    from any worker.  Messages that should be written to stderr are returned
+    as part of the result, along with the sorted bytes if the file was not
+    already sorted and the time taken to sort it.  If `stats` is set then the
+    time taken by each phase is returned as well, and if `trace` is set then
+    so is every span of time spent in a phase, tagged with the worker.
+
+    If `memory` is set then the peak memory allocated, in total and by each
+    phase, is measured and returned.  If `profile_slow` is set then the sort
+    is run under `cProfile`, and the profile is returned if it took at least
+    that many seconds.
+    """
+    if profile_slow is not None:
+        with _EXCLUSIVE_LOCK:
+            return _profiled_sort_file(
+                path,
+                original_bytes,
+                diff=diff,
+                stats=stats,
+                trace=trace,
+                memory=memory,
+                profile_slow=profile_slow,
+            )
+    if memory:
+        with _EXCLUSIVE_LOCK:
+            return _timed_sort_file(
+                path,
+                original_bytes,
+                diff=diff,
+                stats=stats,
+                trace=trace,
+                memory=memory,
+            )
+    return _timed_sort_file(
+        path,
+        original_bytes,
+        diff=diff,
+        stats=stats,
+        trace=trace,
+        memory=memory,
+    )
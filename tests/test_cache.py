@@ -0,0 +1,88 @@
+import subprocess
+
+from ssort._cache import Cache, blob_sha
+
+
+def test_blob_sha_matches_git(tmp_path):
+    path = tmp_path / "file.py"
+    path.write_bytes(b"a = 1\n")
+
+    expected = subprocess.run(
+        ["git", "hash-object", str(path)],
+        capture_output=True,
+        check=True,
+        encoding="ascii",
+    ).stdout.strip()
+
+    assert blob_sha(b"a = 1\n") == expected
+
+
+def test_blob_sha_empty():
+    assert blob_sha(b"") == "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+
+
+def test_cache_roundtrip(tmp_path):
+    cache = Cache(tmp_path / "cache")
+    assert not cache.is_sorted("a")
+
+    cache.mark_sorted("a")
+    assert cache.is_sorted("a")
+
+    cache.save()
+
+    cache = Cache(tmp_path / "cache")
+    assert cache.is_sorted("a")
+    assert not cache.is_sorted("b")
+
+
+def test_cache_not_saved(tmp_path):
+    cache = Cache(tmp_path / "cache")
+    cache.mark_sorted("a")
+
+    cache = Cache(tmp_path / "cache")
+    assert not cache.is_sorted("a")
+
+
+def test_cache_concurrent_saves(tmp_path):
+    first = Cache(tmp_path)
+    second = Cache(tmp_path)
+
+    first.mark_sorted("a")
+    second.mark_sorted("b")
+
+    first.save()
+    second.save()
+
+    cache = Cache(tmp_path)
+    assert cache.is_sorted("a")
+    assert cache.is_sorted("b")
+
+
+def test_cache_timings_roundtrip(tmp_path):
+    cache = Cache(tmp_path)
+    assert cache.get_timing("a.py") is None
+
+    cache.record_timing("a.py", 0.5)
+    cache.save()
+
+    assert Cache(tmp_path).get_timing("a.py") == 0.5
+
+
+def test_cache_timings_merge(tmp_path):
+    first = Cache(tmp_path)
+    second = Cache(tmp_path)
+
+    first.record_timing("a.py", 0.5)
+    first.save()
+    second.record_timing("b.py", 0.25)
+    second.save()
+
+    cache = Cache(tmp_path)
+    assert cache.get_timing("a.py") == 0.5
+    assert cache.get_timing("b.py") == 0.25
+
+
+def test_cache_timings_corrupt(tmp_path):
+    (tmp_path / "timings.json").write_text("[1, 2")
+
+    assert Cache(tmp_path).get_timing("a.py") is None
@@ -0,0 +1,164 @@
+"""
+Checks that the cost of building, de-cycling and sorting a dependency graph
+grows linearly with the number of statements.
+
+Cost is measured by counting operations rather than time, so that these tests
+are stable on shared hardware: each line of ssort's graph code that runs is
+one operation, as is each time a statement is hashed or compared.  The latter
+catches linear scans hidden inside builtins, such as `in` on a list.
+"""
+
+import random
+import sys
+
+import pytest
+
+from ssort import _dependencies, _graphs, _utils
+from ssort._dependencies import module_statements_graph
+from ssort._graphs import replace_cycles, topological_sort
+from ssort._requirements import Requirement
+from ssort._utils import sort_key_from_iter
+
+_TRACED_FILES = {_dependencies.__file__, _graphs.__file__, _utils.__file__}
+
+# Doubling the number of statements should roughly double the work, with a
+# little slack for logarithmic factors and for the randomness of the input.
+_MAX_RATIO = 2.5
+
+
+class _Counter:
+    def __init__(self):
+        self.operations = 0
+
+
+class _Statement:
+    """
+    Stands in for a parsed statement, and counts each time it is hashed or
+    compared.
+    """
+
+    def __init__(self, index, counter, *, requirements, bindings):
+        self._index = index
+        self._counter = counter
+        self._requirements = requirements
+        self._bindings = bindings
+
+    def requirements(self):
+        return self._requirements
+
+    def bindings(self):
+        return self._bindings
+
+    def __eq__(self, other):
+        self._counter.operations += 1
+        return self is other
+
+    def __hash__(self):
+        self._counter.operations += 1
+        return hash(self._index)
+
+
+def _ignore(*args, **kwargs):
+    pass
+
+
+def _statements(size, counter):
+    """
+    Generates a shuffled module of `size` statements that each depend on a
+    few statements from earlier in dependency order, with a ring of three
+    mutually dependent statements in every hundred.  The last statement
+    depends on all of the others, like an `__all__` declaration.
+    """
+    rng = random.Random(size)
+
+    names = [f"f_{index}" for index in range(size)]
+    requirements = []
+    for index in range(size - 1):
+        required = rng.sample(names[:index], min(index, 3))
+        if index % 100 == 2:
+            # Close a ring with the two previous statements.
+            required.append(names[index - 2])
+        requirements.append(required)
+    requirements.append(names[:-1])
+
+    statements = [
+        _Statement(
+            index,
+            counter,
+            requirements=[
+                Requirement(name=name, lineno=index + 1, col_offset=0)
+                for name in required
+            ],
+            bindings=[names[index]],
+        )
+        for index, required in enumerate(requirements)
+    ]
+    rng.shuffle(statements)
+    return statements
+
+
+def _count(function, counter):
+    lines = 0
+
+    def _trace_lines(frame, event, arg):
+        nonlocal lines
+        if event == "line":
+            lines += 1
+        return _trace_lines
+
+    def _trace_calls(frame, event, arg):
+        if frame.f_code.co_filename in _TRACED_FILES:
+            return _trace_lines
+        return None
+
+    previous = sys.gettrace()
+    counter.operations = 0
+    sys.settrace(_trace_calls)
+    try:
+        function()
+    finally:
+        sys.settrace(previous)
+    return lines + counter.operations
+
+
+def _graph(statements):
+    return module_statements_graph(
+        statements, on_unresolved=_ignore, on_wildcard_import=_ignore
+    )
+
+
+def _module_statements_graph_work(size):
+    counter = _Counter()
+    statements = _statements(size, counter)
+    return _count(lambda: _graph(statements), counter)
+
+
+def _replace_cycles_work(size):
+    counter = _Counter()
+    statements = _statements(size, counter)
+    graph = _graph(statements)
+    return _count(
+        lambda: replace_cycles(graph, key=sort_key_from_iter(statements)),
+        counter,
+    )
+
+
+def _topological_sort_work(size):
+    counter = _Counter()
+    statements = _statements(size, counter)
+    graph = _graph(statements)
+    replace_cycles(graph, key=sort_key_from_iter(statements))
+    return _count(lambda: topological_sort(statements, graph=graph), counter)
+
+
+@pytest.mark.parametrize(
+    "work",
+    [
+        _module_statements_graph_work,
+        _replace_cycles_work,
+        _topological_sort_work,
+    ],
+    ids=["module_statements_graph", "replace_cycles", "topological_sort"],
+)
+def test_work_scales_linearly(work):
+    assert work(10000) <= _MAX_RATIO * work(5000)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import pathlib
+
+import pytest
+
+from ssort._config import Config, ConfigError, load_config
+
+
+def test_load_config_missing(tmp_path: pathlib.Path) -> None:
+    assert load_config(tmp_path) is None
+
+
+def test_load_config_pyproject_toml(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.ssort]
+exclude = ["generated/", "*_pb2.py"]
+cache-dir = ".ssort_cache"
+jobs = 4
+""")
+
+    assert load_config(tmp_path) == Config(
+        root=tmp_path,
+        exclude=("generated/", "*_pb2.py"),
+        cache_dir=tmp_path / ".ssort_cache",
+        jobs=4,
+    )
+
+
+def test_load_config_pyproject_toml_no_section(
+    tmp_path: pathlib.Path,
+) -> None:
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.black]
+line_length = 79
+""")
+
+    assert load_config(tmp_path) is None
+
+
+def test_load_config_setup_cfg(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "setup.cfg").write_text("""
+[ssort]
+exclude =
+    generated/
+    *_pb2.py
+cache-dir = .ssort_cache
+jobs = 4
+""")
+
+    assert load_config(tmp_path) == Config(
+        root=tmp_path,
+        exclude=("generated/", "*_pb2.py"),
+        cache_dir=tmp_path / ".ssort_cache",
+        jobs=4,
+    )
+
+
+def test_load_config_prefers_pyproject_toml(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.ssort]
+exclude = ["pyproject"]
+""")
+    (tmp_path / "setup.cfg").write_text("""
+[ssort]
+exclude = setup
+""")
+
+    assert load_config(tmp_path) == Config(
+        root=tmp_path, exclude=("pyproject",)
+    )
+
+
+def test_load_config_unknown_option(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.ssort]
+line-length = 79
+""")
+
+    with pytest.raises(ConfigError, match="unknown option 'line-length'"):
+        load_config(tmp_path)
+
+
+def test_load_config_invalid_exclude(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "pyproject.toml").write_text("""
+[tool.ssort]
+exclude = [1, 2]
+""")
+
+    with pytest.raises(ConfigError, match="must be a list of strings"):
+        load_config(tmp_path)
+
+
+@pytest.mark.parametrize("value", ["-1", "true", '"many"'])
+def test_load_config_invalid_jobs(tmp_path: pathlib.Path, value: str) -> None:
+    (tmp_path / "pyproject.toml").write_text(f"""
+[tool.ssort]
+jobs = {value}
+""")
+
+    with pytest.raises(ConfigError, match="must be a non-negative integer"):
+        load_config(tmp_path)
+
+
+def test_load_config_invalid_toml(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "pyproject.toml").write_text("[tool.ssort\n")
+
+    with pytest.raises(ConfigError, match="could not parse"):
+        load_config(tmp_path)
@@ -58,6 +58,14 @@ def test_on_decoding_error_raise():
     )
 
 
+def test_on_decoding_error_byte_order_mark():
+    # A UTF-8 byte order mark contradicts the coding comment.
+    original = b"\xef\xbb\xbf# coding=latin-1\na = 1\n"
+    with pytest.raises(DecodingError) as exc_info:
+        ssort(original, on_decoding_error="raise")
+    assert str(exc_info.value) == "encoding problem: utf-8"
+
+
 def test_on_decoding_error_ignore():
     original = b"# coding=ascii\n\xfe = 2"
     actual = ssort(original, on_decoding_error="ignore")
@@ -1,3 +1,4 @@
+import json
 import os
 import pathlib
 import subprocess
@@ -33,6 +34,10 @@ _character = b"""
 \xfe = 2
 """
 
+_byte_order_mark = b"""\xef\xbb\xbf# coding=latin-1
+a = 1
+"""
+
 _syntax = b"""
 def _private(
     pass
@@ -77,9 +82,31 @@ def _messages(stderr):
     )
 
 
+def _git(cwd, *args):
+    subprocess.run(
+        [
+            "git",
+            "-c",
+            "user.name=ssort",
+            "-c",
+            "user.email=ssort@example.com",
+            *args,
+        ],
+        cwd=cwd,
+        capture_output=True,
+        check=True,
+    )
+
+
+def _git_init(dirpath):
+    _git(dirpath, "init", "--quiet")
+    _git(dirpath, "add", "--all")
+    _git(dirpath, "commit", "--quiet", "--allow-empty", "-m", "initial")
+
+
 @pytest.fixture(params=["entrypoint", "module"])
 def ssort(request):
-    def _ssort(*args, input=""):
+    def _ssort(*args, input="", cwd=None):
         ssort_exe = {
             "entrypoint": ["ssort"],
             "module": [sys.executable, "-m", "ssort"],
@@ -89,6 +116,7 @@ def ssort(request):
             [*ssort_exe, *args],
             capture_output=True,
             input=input,
+            cwd=cwd,
             env={**os.environ, "COLUMNS": "80"},
         )
         return result.stdout, result.stderr, result.returncode
@@ -343,6 +371,20 @@ def test_ssort_character_error(ssort, tmp_path):
     assert _read_fixtures(paths) == [_character]
 
 
+def test_ssort_byte_order_mark_error(ssort, tmp_path):
+    paths = _write_fixtures(tmp_path, [_byte_order_mark])
+
+    stdout, stderr, status = ssort(tmp_path)
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        f"ERROR: encoding error in {escape_path(paths[0])}: encoding problem: utf-8\n",
+        "1 file was not sortable\n",
+    ]
+    assert status == 1
+    assert _read_fixtures(paths) == [_byte_order_mark]
+
+
 def test_ssort_preserve_crlf_endlines(ssort, tmp_path):
     paths = _write_fixtures(tmp_path, [b"a = b\r\nb = 4"])
 
@@ -411,6 +453,827 @@ def test_ssort_unreadable_file(ssort, tmp_path):
     assert status == 1
 
 
+def test_check_changed_since(ssort, tmp_path):
+    paths = _write_fixtures(tmp_path, [_unsorted, _good, _good])
+    _git_init(tmp_path)
+    pathlib.Path(paths[1]).write_bytes(_unsorted)
+
+    stdout, stderr, status = ssort(
+        "--check", "--changed-since", "HEAD", cwd=tmp_path
+    )
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        "ERROR: file_0001.py is incorrectly sorted\n",
+        "1 file would be resorted\n",
+    ]
+    assert status == 1
+
+
+def test_check_changed_since_unchanged(ssort, tmp_path):
+    _write_fixtures(tmp_path, [_unsorted, _good])
+    _git_init(tmp_path)
+
+    stdout, stderr, status = ssort(
+        "--check", "--changed-since", "HEAD", cwd=tmp_path
+    )
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        "No files are present to be sorted. Nothing to do.\n"
+    ]
+    assert status == 0
+
+
+def test_check_staged(ssort, tmp_path):
+    paths = _write_fixtures(tmp_path, [_good, _good, _good])
+    _git_init(tmp_path)
+    pathlib.Path(paths[0]).write_bytes(_unsorted)
+    pathlib.Path(paths[2]).write_bytes(_unsorted)
+    _git(tmp_path, "add", paths[2])
+
+    stdout, stderr, status = ssort("--check", "--staged", cwd=tmp_path)
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        "ERROR: file_0002.py is incorrectly sorted\n",
+        "1 file would be resorted\n",
+    ]
+    assert status == 1
+
+
+def test_check_staged_reads_index(ssort, tmp_path):
+    paths = _write_fixtures(tmp_path, [_good, _good])
+    _git_init(tmp_path)
+    pathlib.Path(paths[0]).write_bytes(_unsorted)
+    _git(tmp_path, "add", paths[0])
+    pathlib.Path(paths[0]).write_bytes(_good)
+    pathlib.Path(paths[1]).write_bytes(_unsorted + b"\n")
+    _git(tmp_path, "add", paths[1])
+    pathlib.Path(paths[1]).write_bytes(_unsorted)
+
+    stdout, stderr, status = ssort("--check", "--staged", cwd=tmp_path)
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        "ERROR: file_0000.py is incorrectly sorted\n",
+        "ERROR: file_0001.py is incorrectly sorted\n",
+        "2 files would be resorted\n",
+    ]
+    assert status == 1
+
+
+def test_check_staged_duplicates_with_cache(ssort, tmp_path):
+    # Files with the same content share a cache key, so later duplicates are
+    # found in the cache part way through the run and never read.
+    paths = _write_fixtures(tmp_path, [_good] * 7)
+    _git_init(tmp_path)
+    pathlib.Path(paths[6]).write_bytes(_unsorted)
+    for path in paths[:6]:
+        pathlib.Path(path).write_bytes(_good + b"x = 1\n")
+    _git(tmp_path, "add", *paths)
+
+    stdout, stderr, status = ssort(
+        "--check", "--staged", "--cache-dir", "cache", cwd=tmp_path
+    )
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        "ERROR: file_0006.py is incorrectly sorted\n",
+        "1 file would be resorted, 6 files would be left unchanged\n",
+    ]
+    assert status == 1
+
+
+def test_check_staged_max_in_flight_bytes(ssort, tmp_path):
+    # With a tiny budget, small files jump the queue ahead of larger ones, so
+    # files are not started in the order in which they were listed.
+    paths = _write_fixtures(tmp_path, [_good] * 4)
+    _git_init(tmp_path)
+    pathlib.Path(paths[0]).write_bytes(_unsorted)
+    for index, path in enumerate(paths[1:]):
+        pathlib.Path(path).write_bytes(_good + b"x = 1\n" * (index * 50 + 1))
+    _git(tmp_path, "add", *paths)
+
+    stdout, stderr, status = ssort(
+        "--check",
+        "--staged",
+        "--jobs=2",
+        "--executor=thread",
+        "--max-in-flight-bytes=1",
+        cwd=tmp_path,
+    )
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        "ERROR: file_0000.py is incorrectly sorted\n",
+        "1 file would be resorted, 3 files would be left unchanged\n",
+    ]
+    assert status == 1
+
+
+def test_ssort_staged(ssort, tmp_path):
+    paths = _write_fixtures(tmp_path, [_good, _good])
+    _git_init(tmp_path)
+    pathlib.Path(paths[0]).write_bytes(_unsorted)
+    _git(tmp_path, "add", paths[0])
+
+    stdout, stderr, status = ssort("--staged", cwd=tmp_path)
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        "Sorting file_0000.py\n",
+        "1 file was resorted\n",
+    ]
+    assert status == 0
+    assert _read_fixtures(paths) == [_good, _good]
+
+
+def test_ssort_staged_deleted(ssort, tmp_path):
+    paths = _write_fixtures(tmp_path, [_good])
+    _git_init(tmp_path)
+    pathlib.Path(paths[0]).write_bytes(_unsorted)
+    _git(tmp_path, "add", paths[0])
+    pathlib.Path(paths[0]).unlink()
+
+    stdout, stderr, status = ssort("--staged", "file_0000.py", cwd=tmp_path)
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        "ERROR: file_0000.py does not exist\n",
+        "1 file was not sortable\n",
+    ]
+    assert status == 1
+    assert not pathlib.Path(paths[0]).exists()
+
+
+def test_ssort_staged_with_unstaged_changes(ssort, tmp_path):
+    paths = _write_fixtures(tmp_path, [_good])
+    _git_init(tmp_path)
+    pathlib.Path(paths[0]).write_bytes(_unsorted)
+    _git(tmp_path, "add", paths[0])
+    pathlib.Path(paths[0]).write_bytes(_unsorted + b"a = 1\n")
+
+    stdout, stderr, status = ssort("--staged", cwd=tmp_path)
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        "ERROR: file_0000.py has unstaged changes\n",
+        "1 file was not sortable\n",
+    ]
+    assert status == 1
+    assert _read_fixtures(paths) == [_unsorted + b"a = 1\n"]
+
+
+def test_check_cache(ssort, tmp_path):
+    (tmp_path / "src").mkdir()
+    paths = _write_fixtures(tmp_path / "src", [_good, _good, _unsorted])
+    cache_dir = tmp_path / "cache"
+
+    for _ in range(2):
+        stdout, stderr, status = ssort(
+            "--check", "--cache-dir", cache_dir, tmp_path / "src"
+        )
+
+        assert stdout == b""
+        assert _messages(stderr) == [
+            f"ERROR: {escape_path(paths[2])} is incorrectly sorted\n",
+            "1 file would be resorted, 2 files would be left unchanged\n",
+        ]
+        assert status == 1
+
+    pathlib.Path(paths[0]).write_bytes(_unsorted)
+
+    stdout, stderr, status = ssort(
+        "--check", "--cache-dir", cache_dir, tmp_path / "src"
+    )
+
+    assert _messages(stderr) == [
+        f"ERROR: {escape_path(paths[0])} is incorrectly sorted\n",
+        f"ERROR: {escape_path(paths[2])} is incorrectly sorted\n",
+        "2 files would be resorted, 1 file would be left unchanged\n",
+    ]
+    assert status == 1
+
+
+def test_check_cache_git(ssort, tmp_path):
+    paths = _write_fixtures(tmp_path, [_good, _good, _good])
+    _git_init(tmp_path)
+    cache_dir = tmp_path / "cache"
+
+    stdout, stderr, status = ssort(
+        "--check", "--cache-dir", cache_dir, ".", cwd=tmp_path
+    )
+    assert status == 0
+
+    pathlib.Path(paths[1]).write_bytes(_unsorted)
+
+    stdout, stderr, status = ssort(
+        "--check", "--cache-dir", cache_dir, ".", cwd=tmp_path
+    )
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        "ERROR: file_0001.py is incorrectly sorted\n",
+        "1 file would be resorted, 2 files would be left unchanged\n",
+    ]
+    assert status == 1
+
+
+def test_ssort_cache(ssort, tmp_path):
+    (tmp_path / "src").mkdir()
+    paths = _write_fixtures(tmp_path / "src", [_unsorted, _good])
+    cache_dir = tmp_path / "cache"
+
+    stdout, stderr, status = ssort("--cache-dir", cache_dir, tmp_path / "src")
+
+    assert _messages(stderr) == [
+        f"Sorting {escape_path(paths[0])}\n",
+        "1 file was resorted, 1 file was left unchanged\n",
+    ]
+    assert status == 0
+
+    stdout, stderr, status = ssort(
+        "--check", "--cache-dir", cache_dir, tmp_path / "src"
+    )
+
+    assert _messages(stderr) == ["2 files would be left unchanged\n"]
+    assert status == 0
+    assert _read_fixtures(paths) == [_good, _good]
+
+
+def test_check_config(ssort, tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.ssort]\nexclude = ["generated"]\ncache-dir = "cache"\n'
+    )
+    (tmp_path / "generated").mkdir()
+    _write_fixtures(tmp_path / "generated", [_unsorted])
+    _write_fixtures(tmp_path, [_good])
+
+    stdout, stderr, status = ssort("--check", cwd=tmp_path)
+
+    assert stdout == b""
+    assert _messages(stderr) == ["1 file would be left unchanged\n"]
+    assert status == 0
+    assert (tmp_path / "cache").is_dir()
+
+
+def test_check_invalid_config(ssort, tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.ssort]\nline-length = 79\n"
+    )
+    _write_fixtures(tmp_path, [_good])
+
+    stdout, stderr, status = ssort("--check", cwd=tmp_path)
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        f"ERROR: unknown option 'line-length' in {tmp_path / 'pyproject.toml'}\n"
+    ]
+    assert status == 1
+
+
+def test_check_invalid_nested_config(ssort, tmp_path):
+    fixture = tmp_path / "tests" / "fixtures" / "broken"
+    fixture.mkdir(parents=True)
+    (fixture / "pyproject.toml").write_text("[tool.ssort\n")
+    paths = _write_fixtures(fixture, [_unsorted])
+    _write_fixtures(tmp_path, [_good])
+
+    stdout, stderr, status = ssort("--check", ".", cwd=tmp_path)
+
+    assert stdout == b""
+    messages = _messages(stderr)
+    assert messages[0].startswith(
+        "WARNING: ignoring configuration: could not parse "
+        f"{fixture / 'pyproject.toml'}: "
+    )
+    assert messages[1:] == [
+        f"ERROR: {escape_path(os.path.relpath(paths[0], tmp_path))} "
+        "is incorrectly sorted\n",
+        "1 file would be resorted, 1 file would be left unchanged\n",
+    ]
+    assert status == 1
+
+
+@pytest.mark.parametrize(
+    "executor",
+    [
+        "thread",
+        "process",
+        pytest.param(
+            "interpreter",
+            marks=pytest.mark.skipif(
+                sys.version_info < (3, 14),
+                reason="subinterpreter pools require python 3.14",
+            ),
+        ),
+    ],
+)
+def test_ssort_jobs(ssort, tmp_path, executor):
+    texts = [_syntax, _unsorted, _good, _resolution, _unsorted, _good]
+    paths = _write_fixtures(tmp_path, texts)
+
+    stdout, stderr, status = ssort(
+        "--diff", "--jobs", "3", "--executor", executor, tmp_path
+    )
+    parallel_stderr = _messages(stderr)
+    parallel_results = _read_fixtures(paths)
+
+    paths = _write_fixtures(tmp_path, texts)
+    stdout, stderr, status = ssort("--diff", tmp_path)
+    serial_stderr = _messages(stderr)
+    serial_results = _read_fixtures(paths)
+
+    assert parallel_stderr == serial_stderr
+    assert parallel_results == serial_results
+    assert serial_results == [
+        _syntax,
+        _good,
+        _good,
+        _resolution,
+        _good,
+        _good,
+    ]
+
+
+def test_ssort_jobs_cache_timings(ssort, tmp_path):
+    (tmp_path / "src").mkdir()
+    paths = _write_fixtures(tmp_path / "src", [_unsorted, _good, _unsorted])
+    cache_dir = tmp_path / "cache"
+
+    stdout, stderr, status = ssort(
+        "--jobs", "2", "--cache-dir", cache_dir, tmp_path / "src"
+    )
+
+    assert _messages(stderr) == [
+        f"Sorting {escape_path(paths[0])}\n",
+        f"Sorting {escape_path(paths[2])}\n",
+        "2 files were resorted, 1 file was left unchanged\n",
+    ]
+    assert status == 0
+    timings = json.loads((cache_dir / "timings.json").read_text())
+    assert sorted(timings) == sorted(paths)
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_ssort_stats(ssort, tmp_path, jobs):
+    paths = _write_fixtures(tmp_path, [_good, _unsorted])
+
+    stdout, stderr, status = ssort(
+        "--stats", "--top", "1", "--jobs", jobs, tmp_path
+    )
+
+    messages = _messages(stderr)
+    assert messages[0] == f"Sorting {escape_path(paths[1])}\n"
+    assert messages[1].split() == ["phase", "total", "share"]
+    phases = [message.split()[0] for message in messages[2:-4]]
+    assert phases[0] == "read"
+    assert "parse" in phases
+    assert phases[-1] == "write"
+    assert messages[-3] == "slowest files:\n"
+    assert messages[-1] == ("1 file was resorted, 1 file was left unchanged\n")
+    assert status == 0
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_ssort_trace(ssort, tmp_path, jobs):
+    (tmp_path / "src").mkdir()
+    paths = _write_fixtures(
+        tmp_path / "src", [_good, b"class A:\n    pass\n", _unsorted]
+    )
+
+    stdout, stderr, status = ssort(
+        "--trace", tmp_path / "trace.json", "--jobs", jobs, tmp_path / "src"
+    )
+
+    assert status == 0
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    spans = {}
+    for event in events:
+        if event["ph"] == "X":
+            spans.setdefault(event["name"], []).append(event)
+
+    assert len(spans["discovery"]) == 1
+    assert len(spans["read"]) == 3
+    assert len(spans["sort_file"]) == 3
+    assert len(spans["sort_class"]) == 1
+    assert [span["args"]["path"] for span in spans["write"]] == [
+        escape_path(paths[2])
+    ]
+    assert {"parse", "topological_sort", "render"} <= spans.keys()
+
+    # Every span is on a thread that has been named.
+    named = {
+        (event["pid"], event["tid"]) for event in events if event["ph"] == "M"
+    }
+    assert {(event["pid"], event["tid"]) for event in events} == named
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_check_profile_slow(ssort, tmp_path, jobs):
+    import pstats
+
+    (tmp_path / "src").mkdir()
+    _write_fixtures(tmp_path / "src", [_good, _unsorted])
+
+    stdout, stderr, status = ssort(
+        "--check",
+        "--profile-slow",
+        "0",
+        "--profile-dir",
+        "profiles",
+        "--jobs",
+        jobs,
+        "src",
+        cwd=tmp_path,
+    )
+
+    expected = [
+        tmp_path / "profiles" / "src.file_0000.py.pstats",
+        tmp_path / "profiles" / "src.file_0001.py.pstats",
+    ]
+    assert _messages(stderr) == [
+        f"Profiled {escape_path('src/file_0000.py')} in "
+        f"{escape_path('profiles/src.file_0000.py.pstats')}\n",
+        f"Profiled {escape_path('src/file_0001.py')} in "
+        f"{escape_path('profiles/src.file_0001.py.pstats')}\n",
+        f"ERROR: {escape_path('src/file_0001.py')} is incorrectly sorted\n",
+        "1 file would be resorted, 1 file would be left unchanged\n",
+    ]
+    assert status == 1
+    assert sorted((tmp_path / "profiles").iterdir()) == expected
+    functions = {
+        function for _, _, function in pstats.Stats(str(expected[0])).stats
+    }
+    assert "ssort" in functions
+
+
+def test_check_profile_slow_threshold(ssort, tmp_path):
+    _write_fixtures(tmp_path, [_good])
+
+    stdout, stderr, status = ssort(
+        "--check", "--profile-slow", "1000", tmp_path, cwd=tmp_path
+    )
+
+    assert _messages(stderr) == ["1 file would be left unchanged\n"]
+    assert status == 0
+    assert not (tmp_path / "ssort-profiles").exists()
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_check_memory_report(ssort, tmp_path, jobs):
+    paths = _write_fixtures(tmp_path, [_good, _unsorted])
+
+    stdout, stderr, status = ssort(
+        "--check", "--memory-report", "--jobs", jobs, tmp_path
+    )
+
+    messages = _messages(stderr)
+    assert (
+        messages[0]
+        == f"ERROR: {escape_path(paths[1])} is incorrectly sorted\n"
+    )
+    assert messages[1].split() == ["phase", "peak"]
+    assert "parse" in {message.split()[0] for message in messages[2:]}
+    assert "highest peaks:\n" in messages
+    assert messages[-1] == (
+        "1 file would be resorted, 1 file would be left unchanged\n"
+    )
+    assert status == 1
+
+
+def test_explain(ssort, tmp_path):
+    paths = _write_fixtures(tmp_path, [_unsorted, _syntax])
+
+    stdout, stderr, status = ssort("--explain", tmp_path)
+
+    lines = stdout.decode("utf-8").splitlines()
+    assert lines[0] == f"{escape_path(paths[0])}:"
+    assert lines[1].split() == [
+        "seconds",
+        "reqs",
+        "deps",
+        "users",
+        "line",
+        "statement",
+    ]
+    assert sorted(line.split()[-1] for line in lines[2:]) == [
+        "_private",
+        "public",
+    ]
+    assert _messages(stderr) == [
+        f"ERROR: syntax error in {escape_path(paths[1])}: line 3, column 5\n"
+    ]
+    assert status == 1
+    assert _read_fixtures(paths) == [_unsorted, _syntax]
+
+
+def test_check_progress_not_a_terminal(ssort, tmp_path):
+    _write_fixtures(tmp_path, [_good, _unsorted])
+
+    stdout, stderr, status = ssort("--check", "--progress", tmp_path)
+
+    assert b"\r" not in stderr
+    assert _messages(stderr)[-1] == (
+        "1 file would be resorted, 1 file would be left unchanged\n"
+    )
+    assert status == 1
+
+
+def test_ssort_resume(ssort, tmp_path):
+    from ssort._cache import blob_sha
+    from ssort._journal import Journal, run_id
+    from ssort._worker import FileResult, Status
+
+    (tmp_path / "src").mkdir()
+    _write_fixtures(tmp_path / "src", [_good, _unsorted, _good])
+    paths = [f"src/file_{index:04}.py" for index in range(3)]
+    cache_dir = tmp_path / "cache"
+
+    # Simulate a run that was interrupted after sorting the first file and
+    # starting to write the second.
+    journal = Journal(
+        cache_dir,
+        run_id(
+            {
+                "cwd": os.path.realpath(tmp_path),
+                "files": ["src"],
+                "check": False,
+                "diff": False,
+                "changed_since": None,
+                "staged": False,
+                "shard": None,
+                "shard_by": "path",
+            }
+        ),
+    )
+    journal.open(resume=False)
+    journal.record(paths[0], blob_sha(_good), FileResult(Status.UNSORTED))
+    journal.record(paths[1], blob_sha(_good), FileResult(Status.UNSORTED))
+    journal.close()
+
+    stdout, stderr, status = ssort(
+        "--resume", "--cache-dir", "cache", "src", cwd=tmp_path
+    )
+
+    assert _messages(stderr) == [
+        f"Sorting {escape_path(paths[0])}\n",
+        f"Sorting {escape_path(paths[1])}\n",
+        "2 files were resorted, 1 file was left unchanged\n",
+    ]
+    assert status == 0
+    assert _read_fixtures(tmp_path / path for path in paths) == [_good] * 3
+    assert not list(cache_dir.glob("journal-*"))
+
+
+def test_check_resume_staged(ssort, tmp_path):
+    from ssort._cache import blob_sha
+    from ssort._journal import Journal, run_id
+    from ssort._worker import FileResult, Status
+
+    paths = _write_fixtures(tmp_path, [_good, _good])
+    _git_init(tmp_path)
+    pathlib.Path(paths[0]).write_bytes(_good + b"x = 1\n")
+    pathlib.Path(paths[1]).write_bytes(_unsorted)
+    _git(tmp_path, "add", *paths)
+
+    # Simulate a run that was interrupted after checking the first file.
+    journal = Journal(
+        tmp_path / "cache",
+        run_id(
+            {
+                "cwd": os.path.realpath(tmp_path),
+                "files": [],
+                "check": True,
+                "diff": False,
+                "changed_since": None,
+                "staged": True,
+                "shard": None,
+                "shard_by": "path",
+            }
+        ),
+    )
+    journal.open(resume=False)
+    journal.record(
+        "file_0000.py",
+        blob_sha(_good + b"x = 1\n"),
+        FileResult(Status.UNCHANGED),
+    )
+    journal.close()
+
+    stdout, stderr, status = ssort(
+        "--check", "--staged", "--resume", "--cache-dir", "cache", cwd=tmp_path
+    )
+
+    assert _messages(stderr) == [
+        "ERROR: file_0001.py is incorrectly sorted\n",
+        "1 file would be resorted, 1 file would be left unchanged\n",
+    ]
+    assert status == 1
+
+
+def test_ssort_resume_without_cache(ssort, tmp_path):
+    _write_fixtures(tmp_path, [_good])
+
+    stdout, stderr, status = ssort("--resume", tmp_path)
+
+    assert "--resume: requires a cache directory" in stderr.decode("utf-8")
+    assert status == 2
+
+
+def test_ssort_jobs_max_in_flight_bytes(ssort, tmp_path):
+    texts = [_unsorted, _good] * 5
+    paths = _write_fixtures(tmp_path, texts)
+
+    stdout, stderr, status = ssort(
+        "--jobs", "2", "--max-in-flight-bytes", "1", tmp_path
+    )
+
+    assert _messages(stderr) == [
+        *(f"Sorting {escape_path(path)}\n" for path in paths[::2]),
+        "5 files were resorted, 5 files were left unchanged\n",
+    ]
+    assert status == 0
+    assert _read_fixtures(paths) == [_good] * 10
+
+
+def test_check_jobs_config(ssort, tmp_path):
+    (tmp_path / "pyproject.toml").write_text("[tool.ssort]\njobs = 2\n")
+    _write_fixtures(tmp_path, [_good, _unsorted, _good])
+
+    stdout, stderr, status = ssort("--check", cwd=tmp_path)
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        "ERROR: file_0001.py is incorrectly sorted\n",
+        "1 file would be resorted, 2 files would be left unchanged\n",
+    ]
+    assert status == 1
+
+
+@pytest.mark.skipif(
+    sys.version_info >= (3, 14),
+    reason="subinterpreter pools are available from python 3.14",
+)
+def test_check_interpreter_executor_unavailable(ssort, tmp_path):
+    stdout, stderr, status = ssort(
+        "--check", "--jobs", "2", "--executor", "interpreter", tmp_path
+    )
+
+    assert stdout == b""
+    assert "requires python 3.14 or later" in stderr.decode("utf-8")
+    assert status == 2
+
+
+def test_check_negative_jobs(ssort, tmp_path):
+    stdout, stderr, status = ssort("--check", "--jobs", "-1", tmp_path)
+
+    assert stdout == b""
+    assert "must not be negative" in stderr.decode("utf-8")
+    assert status == 2
+
+
+@pytest.mark.parametrize("shard_by", ["path", "size"])
+def test_check_shard(ssort, tmp_path, shard_by):
+    paths = _write_fixtures(tmp_path, [_good] * 9 + [_unsorted])
+
+    checked = []
+    for index in range(1, 4):
+        stdout, stderr, status = ssort(
+            "--check",
+            "--shard",
+            f"{index}/3",
+            "--shard-by",
+            shard_by,
+            "--summary-json",
+            tmp_path / f"summary-{index}.json",
+            tmp_path,
+        )
+        assert stdout == b""
+        summary = json.loads((tmp_path / f"summary-{index}.json").read_text())
+        assert summary["shard"] == [index, 3]
+        checked.append(summary["unsorted"] + summary["unchanged"])
+
+    assert sum(checked) == len(paths)
+
+    stdout, stderr, status = ssort(
+        "--merge-summaries",
+        *(tmp_path / f"summary-{index}.json" for index in range(1, 4)),
+    )
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        "1 file would be resorted, 9 files would be left unchanged\n"
+    ]
+    assert status == 1
+
+
+def test_check_merge_summaries_missing_shard(ssort, tmp_path):
+    _write_fixtures(tmp_path, [_good, _good])
+
+    stdout, stderr, status = ssort(
+        "--check",
+        "--shard",
+        "1/2",
+        "--summary-json",
+        tmp_path / "summary-1.json",
+        tmp_path,
+    )
+    assert status == 0
+
+    stdout, stderr, status = ssort(
+        "--merge-summaries", tmp_path / "summary-1.json"
+    )
+
+    assert stdout == b""
+    assert _messages(stderr) == ["ERROR: missing summary for shard 2/2\n"]
+    assert status == 1
+
+
+@pytest.mark.parametrize("shard", ["0/2", "3/2", "1", "a/b"])
+def test_check_invalid_shard(ssort, tmp_path, shard):
+    stdout, stderr, status = ssort("--check", "--shard", shard, tmp_path)
+
+    assert stdout == b""
+    assert "invalid shard" in stderr.decode("utf-8")
+    assert status == 2
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_check_fail_fast(ssort, tmp_path, jobs):
+    paths = _write_fixtures(tmp_path, [_good, _unsorted, _good, _syntax])
+
+    stdout, stderr, status = ssort(
+        "--check", "--fail-fast", "--jobs", jobs, tmp_path
+    )
+
+    assert stdout == b""
+    assert _messages(stderr) == [
+        f"ERROR: {escape_path(paths[1])} is incorrectly sorted\n",
+        "1 file would be resorted, 1 file would be left unchanged, "
+        "2 files not checked\n",
+    ]
+    assert status == 1
+
+
+def test_check_fail_fast_stops_starting_files(ssort, tmp_path):
+    (tmp_path / "src").mkdir()
+    paths = _write_fixtures(
+        tmp_path / "src", [_good, _unsorted, _good, _syntax]
+    )
+
+    stdout, stderr, status = ssort(
+        "--check",
+        "--fail-fast",
+        "--jobs=1",
+        "--trace",
+        tmp_path / "trace.json",
+        tmp_path / "src",
+    )
+
+    assert status == 1
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    # Every file that is started is read, whether or not it is reported.
+    assert [
+        event["args"]["path"]
+        for event in events
+        if event["ph"] == "X" and event["name"] == "read"
+    ] == [escape_path(paths[0]), escape_path(paths[1])]
+
+
+def test_check_fail_fast_all_well(ssort, tmp_path):
+    _write_fixtures(tmp_path, [_good, _good])
+
+    stdout, stderr, status = ssort("--check", "--fail-fast", tmp_path)
+
+    assert stdout == b""
+    assert _messages(stderr) == ["2 files would be left unchanged\n"]
+    assert status == 0
+
+
+def test_ssort_fail_fast_requires_check(ssort, tmp_path):
+    stdout, stderr, status = ssort("--fail-fast", tmp_path)
+
+    assert stdout == b""
+    assert "can only be used with --check" in stderr.decode("utf-8")
+    assert status == 2
+
+
+def test_check_changed_since_not_a_repository(ssort, tmp_path):
+    _write_fixtures(tmp_path, [_good])
+
+    stdout, stderr, status = ssort(
+        "--check", "--changed-since", "HEAD", cwd=tmp_path
+    )
+
+    assert stdout == b""
+    assert _messages(stderr)[0].startswith(
+        "ERROR: could not list changed files:"
+    )
+    assert status == 1
+
+
 def test_ssort_version(ssort):
     stdout, stderr, status = ssort("--version")
     assert (
@@ -424,24 +1287,94 @@ def test_ssort_version(ssort):
 def test_ssort_help(ssort):
     stdout, stderr, status = ssort("--help")
 
-    assert (
-        stdout.decode("utf-8").replace("\r\n", "\n")
-        == f"""
-usage: ssort [-h] [--version] [--diff] [--check] [files ...]
+    assert stdout.decode("utf-8").replace("\r\n", "\n") == f"""
+usage: ssort [-h] [--version] [--diff] [--check] [--fail-fast]
+             [--changed-since REF] [--staged] [--cache-dir DIR] [-j N]
+             [--executor {{thread,process,interpreter}}] [--resume] [--progress]
+             [--stats] [--top N] [--explain] [--memory-report] [--trace FILE]
+             [--profile-slow SECONDS] [--profile-dir DIR]
+             [--max-in-flight-bytes BYTES] [--shard INDEX/COUNT]
+             [--shard-by {{path,size}}] [--summary-json FILE]
+             [--merge-summaries FILE [FILE ...]]
+             [files ...]
 
 Sort python statements into dependency order
 
 positional arguments:
-  files       One or more python files to sort, or '-' for stdin.
+  files                 One or more python files to sort, or '-' for stdin.
 
 {"optional arguments" if sys.version_info < (3, 10) else "options"}:
-  -h, --help  show this help message and exit
-  --version   Outputs version information and then exit
-  --diff      Prints a diff of all changes ssort would make to a file.
-  --check     Check the file for unsorted statements. Returns 0 if nothing
-              needs to be changed. Otherwise returns 1.
+  -h, --help            show this help message and exit
+  --version             Outputs version information and then exit
+  --diff                Prints a diff of all changes ssort would make to a
+                        file.
+  --check               Check the file for unsorted statements. Returns 0 if
+                        nothing needs to be changed. Otherwise returns 1.
+  --fail-fast           With --check, stop as soon as one file is found to be
+                        unsorted or unsortable.
+  --changed-since REF   Only sort files that differ from the given git
+                        revision.
+  --staged              Only sort files with staged changes, reading their
+                        contents from the git index.
+  --cache-dir DIR       Directory in which to remember files that are already
+                        sorted.
+  {"-j N, --jobs N" if sys.version_info < (3, 13) else "-j, --jobs N":<22}Number of files to sort in parallel, or 0 to use one
+                        job per CPU. Defaults to 1.
+  --executor {{thread,process,interpreter}}
+                        Whether parallel jobs are run in threads, in processes
+                        or in subinterpreters. Defaults to threads on free-
+                        threaded builds of python, and to processes otherwise.
+  --resume              Carry on from where an interrupted run with the same
+                        arguments left off, skipping files that it completed
+                        and that haven't changed since. Requires a cache
+                        directory.
+  --progress            Show the throughput, cache hit rate, estimated time
+                        remaining and slowest file in progress on stderr.
+                        Ignored if stderr is not a terminal.
+  --stats               Print the time spent in each phase of sorting, from
+                        reading files to writing them back, along with a
+                        breakdown of the slowest files.
+  --top N               Number of files to break down with --stats and
+                        --memory-report, or of statements to list with
+                        --explain. Defaults to 10.
+  --explain             Instead of sorting, list the statements in each file
+                        that take longest to analyse, with the number of
+                        requirements that each has and its degree in the
+                        dependency graph.
+  --memory-report       Print the peak memory allocated in each phase of
+                        sorting, along with the files with the highest peaks
+                        and the lines that allocated the most. Files are
+                        measured one at a time in each process.
+  --trace FILE          Write a timeline of the run to FILE, in the Chrome
+                        trace event format, for viewing in Perfetto or
+                        chrome://tracing.
+  --profile-slow SECONDS
+                        Sort each file under cProfile, and save the profiles
+                        of files that take at least SECONDS to --profile-dir.
+                        Profiling slows sorting down, and only one file is
+                        profiled at a time in each process.
+  --profile-dir DIR     Directory in which to save profiles for --profile-
+                        slow, named after the path of each file. Defaults to
+                        ssort-profiles.
+  --max-in-flight-bytes BYTES
+                        When sorting in parallel, stop reading new files while
+                        the files that have been read but not yet reported add
+                        up to more than this many bytes. Defaults to 33554432.
+  --shard INDEX/COUNT   Only sort one of COUNT disjoint slices of the files
+                        found, counting from 1. Used to split a run between
+                        several machines.
+  --shard-by {{path,size}}
+                        Assign files to shards by a hash of their path, which
+                        is stable as files are added and removed, or so as to
+                        balance the total size of each shard. Defaults to
+                        path.
+  --summary-json FILE   Write a summary of the run to FILE, for use with
+                        --merge-summaries.
+  --merge-summaries FILE [FILE ...]
+                        Combine the summaries written by --summary-json from
+                        several runs, such as one per shard, and exit with the
+                        status of the combined run. No files are sorted.
 """.lstrip()
-    )
     assert stderr == b""
     assert status == 0
 
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import concurrent.futures
+import pathlib
+import sys
+import threading
+
+import pytest
+
+from ssort._executors import (
+    SerialExecutor,
+    cancel,
+    completed,
+    create_executor,
+)
+
+
+def test_serial_executor_runs_immediately() -> None:
+    calls: list[int] = []
+    future = SerialExecutor().submit(calls.append, 1)
+
+    assert calls == [1]
+    assert future.done()
+    assert future.result() is None
+
+
+def test_serial_executor_captures_exceptions() -> None:
+    future = SerialExecutor().submit(int, "one")
+
+    with pytest.raises(ValueError):
+        future.result()
+
+
+def test_cancel() -> None:
+    release = threading.Event()
+    executor = create_executor("thread", 2)
+    running = [executor.submit(release.wait) for _ in range(2)]
+    queued = executor.submit(int, "1")
+
+    cancel(executor)
+
+    assert queued.cancelled()
+    release.set()
+    assert all(future.result() for future in running)
+
+
+def test_completed() -> None:
+    future = completed(1)
+
+    assert future.done()
+    assert future.result() == 1
+
+
+def test_create_executor_single_job() -> None:
+    assert isinstance(create_executor("process", 1), SerialExecutor)
+
+
+def test_create_executor_thread() -> None:
+    with create_executor("thread", 2) as executor:
+        assert isinstance(executor, concurrent.futures.ThreadPoolExecutor)
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 14),
+    reason="subinterpreter pools require python 3.14",
+)
+def test_create_executor_interpreter() -> None:
+    from ssort._worker import Status, sort_file
+
+    with create_executor("interpreter", 2) as executor:
+        future = executor.submit(
+            sort_file, pathlib.Path("test.py"), b"b = a\na = 1\n"
+        )
+        result = future.result()
+
+    assert result.status == Status.UNSORTED
+    assert result.updated_bytes == b"a = 1\nb = a\n"
+
+
+def test_create_executor_unknown() -> None:
+    with pytest.raises(ValueError, match="unknown executor backend"):
+        create_executor("fibre", 2)
+
+
+def test_thread_executor_runs_in_parallel() -> None:
+    # Both tasks must be running at the same time for the barrier to be
+    # passed.  This holds even with the GIL, as the tasks block rather than
+    # spin.
+    barrier = threading.Barrier(2, timeout=10)
+
+    with create_executor("thread", 2) as executor:
+        futures = [executor.submit(barrier.wait) for _ in range(2)]
+        assert sorted(future.result() for future in futures) == [0, 1]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pytest
+
+from ssort._exceptions import ParseError
+from ssort._explain import StatementCost, explain, format_explanation
+
+_text = """
+import os
+
+TABLE = {
+    "a": os.sep,
+    "b": os.sep,
+    "c": os.sep,
+}
+
+class A:
+    x = TABLE
+
+    def f(self):
+        return self._g()
+
+    def _g(self):
+        return self.x
+
+print(A)
+"""
+
+
+def test_explain() -> None:
+    costs = {cost.name: cost for cost in explain(_text)}
+
+    assert set(costs) == {
+        "os",
+        "TABLE",
+        "A",
+        "A.x",
+        "A.f",
+        "A._g",
+        "print(A)",
+    }
+
+    assert costs["TABLE"].lineno == 4
+    assert costs["TABLE"].requirements == 3
+    assert costs["TABLE"].dependencies == 1
+    assert costs["TABLE"].dependants == 1
+    assert costs["os"].dependants == 1
+
+    assert costs["A._g"].lineno == 16
+    assert costs["A.f"].dependencies == 1
+    assert costs["A._g"].dependants == 1
+
+
+def test_explain_ranked() -> None:
+    seconds = [cost.seconds for cost in explain(_text)]
+
+    assert seconds == sorted(seconds, reverse=True)
+
+
+def test_explain_unresolved() -> None:
+    (cost,) = explain("a = b\n")
+
+    assert cost.requirements == 1
+    assert cost.dependencies is None
+    assert cost.dependants is None
+
+
+def test_explain_syntax_error() -> None:
+    with pytest.raises(ParseError):
+        explain("def f(\n")
+
+
+def test_format_explanation() -> None:
+    costs = [
+        StatementCost("A.f", 12, 0.5, 3, 1, 2),
+        StatementCost("a", 1, 0.25, 1, None, None),
+        StatementCost("b", 2, 0.125, 1, 0, 0),
+    ]
+
+    assert [line.split() for line in format_explanation(costs, top=2)] == [
+        ["seconds", "reqs", "deps", "users", "line", "statement"],
+        ["0.5000", "3", "1", "2", "12", "A.f"],
+        ["0.2500", "1", "-", "-", "1", "a"],
+    ]
@@ -4,7 +4,13 @@ import pathlib
 
 import pytest
 
-from ssort._files import is_ignored
+from ssort._config import Config, ConfigError
+from ssort._files import (
+    find_python_files,
+    get_config,
+    is_excluded,
+    is_ignored,
+)
 
 
 def test_ignore_git(
@@ -221,3 +227,115 @@ def test_ignore_symlink_circular(
 
     assert not is_ignored("link1")
     assert not is_ignored("link2")
+
+
+def test_get_config_nearest(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.ssort]\nexclude = ["parent"]\n'
+    )
+    (tmp_path / "sub" / "src").mkdir(parents=True)
+    (tmp_path / "sub" / "setup.cfg").write_text("[ssort]\nexclude = child\n")
+
+    assert get_config(tmp_path) == Config(root=tmp_path, exclude=("parent",))
+    assert get_config(tmp_path / "src") == Config(
+        root=tmp_path, exclude=("parent",)
+    )
+    assert get_config(tmp_path / "sub" / "src") == Config(
+        root=tmp_path / "sub", exclude=("child",)
+    )
+
+
+def test_get_config_stops_at_project_root(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.ssort]\nexclude = ["parent"]\n'
+    )
+    (tmp_path / "repo" / ".git").mkdir(parents=True)
+
+    assert get_config(tmp_path / "repo") == Config()
+
+
+def test_get_config_skips_broken_nested(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.ssort]\nexclude = ["parent"]\n'
+    )
+    (tmp_path / "fixtures" / "broken").mkdir(parents=True)
+    (tmp_path / "fixtures" / "broken" / "pyproject.toml").write_text(
+        "[tool.ssort\n"
+    )
+    (tmp_path / "fixtures" / "unknown").mkdir(parents=True)
+    (tmp_path / "fixtures" / "unknown" / "pyproject.toml").write_text(
+        "[tool.ssort]\nline-length = 3\n"
+    )
+
+    with pytest.raises(ConfigError, match="could not parse"):
+        get_config(tmp_path / "fixtures" / "broken")
+
+    for name in ["broken", "unknown"]:
+        assert get_config(
+            tmp_path / "fixtures" / name, strict=False
+        ) == Config(root=tmp_path, exclude=("parent",))
+
+    broken, unknown = capsys.readouterr().err.splitlines()
+    assert broken.startswith(
+        "WARNING: ignoring configuration: could not parse "
+        f"{tmp_path / 'fixtures' / 'broken' / 'pyproject.toml'}: "
+    )
+    assert unknown == (
+        "WARNING: ignoring configuration: unknown option 'line-length' in "
+        f"{tmp_path / 'fixtures' / 'unknown' / 'pyproject.toml'}"
+    )
+
+
+def test_exclude(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.ssort]\nexclude = ["generated/", "*_pb2.py"]\n'
+    )
+
+    assert not is_excluded("main.py")
+    assert not is_excluded("src/main.py")
+
+    assert is_excluded("generated/main.py")
+    assert is_excluded("src/generated/main.py")
+
+    assert is_excluded("main_pb2.py")
+    assert is_excluded("src/main_pb2.py")
+
+
+def test_find_python_files_exclude(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.ssort]\nexclude = ["generated/"]\n'
+    )
+    (tmp_path / "src" / "generated").mkdir(parents=True)
+    (tmp_path / "src" / "main.py").write_text("")
+    (tmp_path / "src" / "generated" / "main.py").write_text("")
+
+    assert list(find_python_files(["src"])) == [pathlib.Path("src/main.py")]
+    assert list(find_python_files(["src/generated/main.py"])) == [
+        pathlib.Path("src/generated/main.py")
+    ]
@@ -0,0 +1,129 @@
+import os
+import subprocess
+
+import pytest
+
+from ssort._cache import blob_sha
+from ssort._git import (
+    BlobReader,
+    GitError,
+    get_changed_files,
+    get_clean_blobs,
+    get_index_blobs,
+)
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        [
+            "git",
+            "-c",
+            "user.name=ssort",
+            "-c",
+            "user.email=ssort@example.com",
+            *args,
+        ],
+        cwd=cwd,
+        capture_output=True,
+        check=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    repo = tmp_path.resolve()
+    (repo / "clean.py").write_bytes(b"a = 1\n")
+    (repo / "dirty.py").write_bytes(b"b = 2\n")
+    (repo / "staged.py").write_bytes(b"c = 3\n")
+    (repo / "sub").mkdir()
+    (repo / "sub" / "nested.py").write_bytes(b"d = 4\n")
+
+    _git(repo, "init", "--quiet")
+    _git(repo, "add", "--all")
+    _git(repo, "commit", "--quiet", "-m", "initial")
+
+    (repo / "dirty.py").write_bytes(b"b = 5\n")
+    (repo / "staged.py").write_bytes(b"c = 6\n")
+    _git(repo, "add", "staged.py")
+    (repo / "untracked.py").write_bytes(b"e = 7\n")
+
+    monkeypatch.chdir(repo / "sub")
+    return repo
+
+
+def test_get_changed_files(repo):
+    assert get_changed_files("HEAD") == {
+        repo / "dirty.py",
+        repo / "staged.py",
+    }
+
+
+def test_get_changed_files_unstaged(repo):
+    assert get_changed_files() == {repo / "dirty.py"}
+
+
+def test_get_changed_files_staged(repo):
+    assert get_changed_files(staged=True) == {repo / "staged.py"}
+
+
+def test_get_changed_files_bad_ref(repo):
+    with pytest.raises(GitError):
+        get_changed_files("does-not-exist")
+
+
+def test_get_index_blobs(repo):
+    assert get_index_blobs() == {
+        repo / "clean.py": blob_sha(b"a = 1\n"),
+        repo / "dirty.py": blob_sha(b"b = 2\n"),
+        repo / "staged.py": blob_sha(b"c = 6\n"),
+        repo / "sub" / "nested.py": blob_sha(b"d = 4\n"),
+    }
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "symlink"), reason="symlinks not supported"
+)
+def test_get_index_blobs_skips_symlinks(repo):
+    (repo / "link.py").symlink_to(repo / "clean.py")
+    _git(repo, "add", "link.py")
+
+    assert repo / "link.py" not in get_index_blobs()
+
+
+def test_get_clean_blobs(repo):
+    assert get_clean_blobs() == {
+        repo / "clean.py": blob_sha(b"a = 1\n"),
+        repo / "staged.py": blob_sha(b"c = 6\n"),
+        repo / "sub" / "nested.py": blob_sha(b"d = 4\n"),
+    }
+
+
+def test_get_clean_blobs_not_a_repository(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(GitError):
+        get_clean_blobs()
+
+
+def test_blob_reader(repo):
+    reader = BlobReader()
+    try:
+        assert reader.read(blob_sha(b"c = 6\n")) == b"c = 6\n"
+        assert reader.read(blob_sha(b"a = 1\n")) == b"a = 1\n"
+        assert reader.read(blob_sha(b"c = 6\n")) == b"c = 6\n"
+    finally:
+        reader.close()
+
+
+def test_blob_reader_missing(repo):
+    reader = BlobReader()
+    try:
+        with pytest.raises(GitError):
+            reader.read(blob_sha(b"missing\n"))
+        # The reader can still be used after a blob is not found.
+        assert reader.read(blob_sha(b"a = 1\n")) == b"a = 1\n"
+    finally:
+        reader.close()
+
+
+def test_blob_reader_close_unused():
+    BlobReader().close()
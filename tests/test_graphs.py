@@ -1,6 +1,6 @@
 import random
 
-from ssort._graphs import Graph, topological_sort
+from ssort._graphs import Graph, replace_cycles, topological_sort
 
 
 def test_topological_sort_chain():
@@ -90,3 +90,90 @@ def test_random_stable():
         graph.add_dependency(nodes[src_index], nodes[tgt_index])
 
     assert topological_sort(graph) == nodes
+
+
+def test_replace_cycles_count():
+    graph = Graph()
+
+    for node in range(1, 6):
+        graph.add_node(node)
+
+    graph.add_dependency(1, 2)
+    graph.add_dependency(2, 1)
+    graph.add_dependency(3, 4)
+    graph.add_dependency(4, 3)
+    graph.add_dependency(5, 5)
+
+    assert replace_cycles(graph, key=lambda node: node) == 2
+    assert topological_sort(graph) == [1, 2, 3, 4, 5]
+
+
+def test_replace_cycles_overlapping():
+    graph = Graph()
+
+    for node in range(1, 6):
+        graph.add_node(node)
+
+    graph.add_dependency(1, 3)
+    graph.add_dependency(3, 2)
+    graph.add_dependency(2, 1)
+    graph.add_dependency(3, 5)
+    graph.add_dependency(5, 4)
+    graph.add_dependency(4, 3)
+
+    replace_cycles(graph, key=lambda node: node)
+
+    assert topological_sort(graph) == [1, 2, 3, 4, 5]
+
+
+def test_remove_node():
+    graph = Graph()
+
+    for node in range(1, 4):
+        graph.add_node(node)
+
+    graph.add_dependency(2, 1)
+    graph.add_dependency(3, 2)
+
+    graph.remove_node(2)
+
+    assert list(graph.nodes) == [1, 3]
+    assert not graph.dependants[1]
+    assert not graph.dependencies[3]
+
+
+class _Node:
+    # Statements hash by identity, so their hashes differ from run to run.
+    def __init__(self, label, hash_value):
+        self.label = label
+        self.hash_value = hash_value
+
+    def __hash__(self):
+        return self.hash_value
+
+
+def test_replace_cycles_independent_of_hashes():
+    rng = random.Random(0)
+    edges = [(rng.randrange(30), rng.randrange(30)) for _ in range(90)]
+
+    results = []
+    for seed in range(5):
+        hashes = random.Random(seed)
+        nodes = [_Node(label, hashes.getrandbits(60)) for label in range(30)]
+
+        graph = Graph()
+        for node in nodes:
+            graph.add_node(node)
+        for node, dependency in edges:
+            graph.add_dependency(nodes[node], nodes[dependency])
+        replace_cycles(graph, key=lambda node: node.label)
+
+        results.append(
+            {
+                (node.label, dependency.label)
+                for node in graph.nodes
+                for dependency in graph.dependencies[node]
+            }
+        )
+
+    assert all(result == results[0] for result in results)
@@ -0,0 +1,62 @@
+import subprocess
+import sys
+
+# Modules that make up the bulk of ssort's import time, and which should only
+# be loaded when they are actually needed.
+_HEAVY_MODULES = {
+    "difflib",
+    "pathspec",
+    "ssort._dependencies",
+    "ssort._parsing",
+    "ssort._ssort",
+}
+
+
+def _import_times(*args, input=""):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        input=input,
+        encoding="utf-8",
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_package_is_lazy():
+    times = _import_times("-c", "import ssort")
+    assert "ssort" in times
+    assert not _HEAVY_MODULES & times.keys()
+
+
+def test_import_package_loads_on_access():
+    times = _import_times("-c", "import ssort; ssort.ssort")
+    assert "ssort._ssort" in times
+
+
+def test_version_is_lazy():
+    times = _import_times("-m", "ssort", "--version")
+    assert "ssort._main" in times
+    assert not _HEAVY_MODULES & times.keys()
+
+
+def test_empty_stdin_is_lazy():
+    times = _import_times("-m", "ssort", "-", input="")
+    assert "ssort._main" in times
+    assert not _HEAVY_MODULES & times.keys()
+
+
+def test_import_package_skips_typing():
+    # `typing` is only needed by type checkers, but costs more to import than
+    # the rest of the package put together.
+    times = _import_times("-c", "import ssort")
+    assert "typing" not in times
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import pathlib
+
+import pytest
+
+from ssort._executors import SerialExecutor
+from ssort._io import ReadAhead, create_io_executor
+
+
+def _write_files(dirpath: pathlib.Path, count: int) -> list[pathlib.Path]:
+    paths = []
+    for index in range(count):
+        path = dirpath / f"file_{index}.py"
+        path.write_bytes(f"a = {index}\n".encode())
+        paths.append(path)
+    return paths
+
+
+def test_read_ahead_reads_in_order(tmp_path: pathlib.Path) -> None:
+    paths = _write_files(tmp_path, 5)
+
+    with create_io_executor() as executor:
+        read_ahead = ReadAhead(
+            executor,
+            paths,
+            [4, 2, 0, 1, 3],
+            count=2,
+            should_read=lambda index: True,
+        )
+        contents = [(index, read_ahead.read(index)) for index in read_ahead]
+
+    assert contents == [
+        (index, f"a = {index}\n".encode()) for index in [4, 2, 0, 1, 3]
+    ]
+
+
+def test_read_ahead_reads_ahead(tmp_path: pathlib.Path) -> None:
+    paths = _write_files(tmp_path, 5)
+
+    read_ahead = ReadAhead(
+        SerialExecutor(),
+        paths,
+        range(5),
+        count=2,
+        should_read=lambda index: True,
+    )
+    indices = iter(read_ahead)
+    assert next(indices) == 0
+
+    # Files that have already been read aren't affected by later changes.
+    for path in paths:
+        path.write_bytes(b"")
+
+    assert read_ahead.read(0) == b"a = 0\n"
+    assert read_ahead.read(1) == b"a = 1\n"
+    assert read_ahead.read(2) == b"a = 2\n"
+    assert read_ahead.read(3) == b""
+
+
+def test_read_ahead_skips(tmp_path: pathlib.Path) -> None:
+    paths = _write_files(tmp_path, 3)
+    paths[1].unlink()
+
+    read_ahead = ReadAhead(
+        SerialExecutor(),
+        paths,
+        range(3),
+        count=3,
+        should_read=lambda index: index != 1,
+    )
+
+    assert list(read_ahead) == [0, 1, 2]
+    with pytest.raises(FileNotFoundError):
+        read_ahead.read(1)
+
+
+def test_read_ahead_errors(tmp_path: pathlib.Path) -> None:
+    paths = [tmp_path / "missing.py"]
+
+    with create_io_executor() as executor:
+        read_ahead = ReadAhead(
+            executor, paths, [0], count=1, should_read=lambda index: True
+        )
+        assert list(read_ahead) == [0]
+
+        with pytest.raises(FileNotFoundError):
+            read_ahead.read(0)
+
+
+def test_read_ahead_max_bytes(tmp_path: pathlib.Path) -> None:
+    paths = _write_files(tmp_path, 4)
+
+    read_ahead = ReadAhead(
+        SerialExecutor(),
+        paths,
+        range(4),
+        count=3,
+        should_read=lambda index: True,
+        sizes=[10, 10, 10, 10],
+        max_bytes=25,
+    )
+    indices = iter(read_ahead)
+    assert next(indices) == 0
+
+    for path in paths:
+        path.write_bytes(b"")
+
+    assert read_ahead.read(0) == b"a = 0\n"
+    assert read_ahead.read(1) == b"a = 1\n"
+    assert read_ahead.read(2) == b""
+
+
+def test_read_ahead_release(tmp_path: pathlib.Path) -> None:
+    paths = _write_files(tmp_path, 4)
+
+    read_ahead = ReadAhead(
+        SerialExecutor(),
+        paths,
+        range(4),
+        count=2,
+        should_read=lambda index: True,
+        sizes=[10, 10, 20, 10],
+        max_bytes=20,
+    )
+    indices = iter(read_ahead)
+    assert next(indices) == 0
+    assert read_ahead.read(0) == b"a = 0\n"
+
+    # The third file only fits once both of the first two are released, and
+    # the fourth file isn't read ahead of it.
+    read_ahead.release(0)
+    assert next(indices) == 1
+    assert read_ahead.read(1) == b"a = 1\n"
+    paths[3].write_bytes(b"")
+    read_ahead.release(1)
+    assert next(indices) == 2
+
+    paths[2].write_bytes(b"")
+    assert read_ahead.read(2) == b"a = 2\n"
+    assert read_ahead.read(3) == b""
+
+
+def test_read_ahead_stop(tmp_path: pathlib.Path) -> None:
+    paths = _write_files(tmp_path, 5)
+
+    read_ahead = ReadAhead(
+        SerialExecutor(),
+        paths,
+        range(5),
+        count=2,
+        should_read=lambda index: True,
+    )
+    indices = iter(read_ahead)
+    assert next(indices) == 0
+
+    # Indices that have already been read ahead are dropped as well.
+    read_ahead.stop()
+    assert list(indices) == []
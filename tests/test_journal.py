@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import pathlib
+
+from ssort._journal import Journal, JournalEntry, run_id
+from ssort._worker import FileResult, Status
+
+
+def test_journal_roundtrip(tmp_path: pathlib.Path) -> None:
+    journal = Journal(tmp_path, "run")
+    journal.open(resume=False)
+    journal.record(
+        "a.py",
+        "abc",
+        FileResult(Status.UNSORTED, messages=("WARNING: x\n",), diff=("-",)),
+    )
+    journal.record("b.py", "def", FileResult(Status.UNCHANGED))
+    journal.close()
+
+    assert Journal(tmp_path, "run").load() == {
+        "a.py": JournalEntry(
+            "abc",
+            FileResult(
+                Status.UNSORTED, messages=("WARNING: x\n",), diff=("-",)
+            ),
+        ),
+        "b.py": JournalEntry("def", FileResult(Status.UNCHANGED)),
+    }
+
+
+def test_journal_resume_appends(tmp_path: pathlib.Path) -> None:
+    journal = Journal(tmp_path, "run")
+    journal.open(resume=False)
+    journal.record("a.py", "abc", FileResult(Status.UNCHANGED))
+    journal.close()
+
+    journal.open(resume=True)
+    journal.record("b.py", "def", FileResult(Status.UNCHANGED))
+    journal.close()
+
+    assert sorted(journal.load()) == ["a.py", "b.py"]
+
+    journal.open(resume=False)
+    journal.close()
+
+    assert journal.load() == {}
+
+
+def test_journal_truncated(tmp_path: pathlib.Path) -> None:
+    journal = Journal(tmp_path, "run")
+    journal.open(resume=False)
+    journal.record("a.py", "abc", FileResult(Status.UNCHANGED))
+    journal.close()
+
+    (path,) = tmp_path.glob("journal-*")
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"path": "b.py", "key": "d')
+
+    assert list(journal.load()) == ["a.py"]
+
+
+def test_journal_missing(tmp_path: pathlib.Path) -> None:
+    assert Journal(tmp_path / "missing", "run").load() == {}
+
+
+def test_journal_remove(tmp_path: pathlib.Path) -> None:
+    journal = Journal(tmp_path, "run")
+    journal.open(resume=False)
+    journal.remove()
+
+    assert not list(tmp_path.glob("journal-*"))
+
+
+def test_run_id() -> None:
+    assert run_id({"check": True}) == run_id({"check": True})
+    assert run_id({"check": True}) != run_id({"check": False})
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import tracemalloc
+
+from ssort._memory import MemoryUsage, format_memory_report, measuring_memory
+from ssort._phases import PhaseRecorder, phase, recording
+
+
+def test_measuring_memory() -> None:
+    with measuring_memory() as recorder:
+        with phase("parse"):
+            with phase("split"):
+                data = bytearray(2_000_000)
+                del data
+            data = bytearray(1_000_000)
+        with phase("render"):
+            pass
+
+    usage = recorder.usage()
+    phases = dict(usage.phases)
+
+    assert usage.peak >= 2_000_000
+    # The peak of a phase includes the peaks of phases nested within it.
+    assert phases["parse"] >= 2_000_000
+    assert phases["split"] >= 2_000_000
+    assert phases["render"] < 1_000_000
+    assert any(__file__ in site for site, _ in usage.sites)
+    del data
+
+
+def test_measuring_memory_passes_on_phases() -> None:
+    with recording(PhaseRecorder()) as phase_recorder:
+        with measuring_memory():
+            with phase("parse"):
+                pass
+
+    assert list(phase_recorder.totals()) == ["parse"]
+
+
+def test_format_memory_report() -> None:
+    lines = format_memory_report(
+        [
+            (
+                "a.py",
+                MemoryUsage(
+                    peak=3_000_000,
+                    phases=(("render", 500), ("parse", 3_000_000)),
+                    sites=(("ast.py:50", 2_500_000),),
+                ),
+            ),
+            ("b.py", MemoryUsage(peak=1_000, phases=(("parse", 1_000),))),
+        ],
+        top=1,
+    )
+
+    assert [line.split() for line in lines] == [
+        ["phase", "peak"],
+        ["parse", "3.0", "MB"],
+        ["render", "0.5", "kB"],
+        ["highest", "peaks:"],
+        ["3.0", "MB", "a.py", "(parse", "3.0", "MB,", "render", "0.5", "kB)"],
+        ["2.5", "MB", "ast.py:50"],
+    ]
+
+
+def test_measuring_memory_stops_tracing() -> None:
+    with measuring_memory():
+        pass
+
+    assert not tracemalloc.is_tracing()
+
+
+def test_sort_file_memory_excludes_imports() -> None:
+    # Run in a fresh interpreter, as other tests will already have imported
+    # the analysis stack.
+    script = """
+import json, pathlib
+from ssort._worker import sort_file
+result = sort_file(
+    pathlib.Path("a.py"), b"b = a\\na = 1\\n", diff=True, memory=True
+)
+print(json.dumps({"peak": result.memory.peak, "sites": result.memory.sites}))
+"""
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        encoding="utf-8",
+        check=True,
+    ).stdout
+    usage = json.loads(output)
+
+    assert usage["peak"] < 500_000
+    assert not any("importlib" in site for site, _ in usage["sites"])
@@ -0,0 +1,99 @@
+from ssort import ssort
+from ssort._phases import PhaseRecorder, recording
+
+_original = """
+import os
+
+class A:
+    def a(self):
+        return self._b()
+
+    def _b(self):
+        return os.sep
+
+def f():
+    return g()
+
+def g():
+    return f()
+
+class B:
+    pass
+"""
+
+
+def _record(text, **kwargs):
+    events = []
+
+    def on_phase(*, phase, event, **counters):
+        events.append((phase, event, counters))
+
+    ssort(text, on_phase=on_phase, **kwargs)
+    return events
+
+
+def test_on_phase_events():
+    events = _record(_original)
+
+    assert [(phase, event) for phase, event, _ in events] == [
+        ("parse", "start"),
+        ("parse", "end"),
+        ("split", "start"),
+        ("split", "end"),
+        ("requirements", "start"),
+        ("requirements", "end"),
+        ("graph", "start"),
+        ("graph", "end"),
+        ("replace_cycles", "start"),
+        ("replace_cycles", "end"),
+        ("topological_sort", "start"),
+        ("topological_sort", "end"),
+        ("render", "start"),
+        ("sort_class", "start"),
+        ("sort_class", "end"),
+        ("sort_class", "start"),
+        ("sort_class", "end"),
+        ("render", "end"),
+    ]
+
+
+def test_on_phase_counters():
+    counters = {
+        (phase, counters.get("name")): counters
+        for phase, event, counters in _record(_original)
+        if event == "end"
+    }
+
+    assert counters["split", None] == {"statements": 5}
+    assert counters["requirements", None] == {
+        "requirements": 3,
+        "bindings": 5,
+    }
+    assert counters["graph", None] == {"nodes": 5, "edges": 3}
+    assert counters["replace_cycles", None] == {"cycles": 1}
+    assert counters["sort_class", "A"] == {"name": "A", "resorted": True}
+    assert counters["sort_class", "B"] == {"name": "B", "resorted": False}
+
+
+def test_on_phase_bytes():
+    events = _record(b"a = 1\n")
+
+    assert events[:2] == [
+        ("detect_encoding", "start", {}),
+        ("detect_encoding", "end", {"encoding": "utf-8"}),
+    ]
+
+
+def test_on_phase_error():
+    events = _record("a = b\n", on_unresolved="ignore")
+
+    assert events[-2:] == [("graph", "start", {}), ("graph", "end", {})]
+
+
+def test_on_phase_does_not_interrupt_recording():
+    recorder = PhaseRecorder()
+    with recording(recorder):
+        events = _record(_original)
+
+    assert events
+    assert set(recorder.totals()) == {phase for phase, _, _ in events}
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import time
+
+from ssort._phases import PhaseRecorder, format_stats, phase, recording
+from ssort._ssort import ssort
+
+
+def test_phase_without_recorder() -> None:
+    with phase("parse"):
+        pass
+
+
+def test_recorder_attributes_time_to_innermost_phase() -> None:
+    recorder = PhaseRecorder()
+    with recording(recorder):
+        with phase("render"):
+            with phase("sort_class"):
+                time.sleep(0.01)
+
+    totals = recorder.totals()
+    assert totals["sort_class"] >= 0.01
+    assert totals["render"] < totals["sort_class"]
+
+
+def test_recording_is_scoped() -> None:
+    recorder = PhaseRecorder()
+    with recording(recorder):
+        pass
+    with phase("parse"):
+        pass
+
+    assert recorder.totals() == {}
+
+
+def test_ssort_records_phases() -> None:
+    recorder = PhaseRecorder()
+    with recording(recorder):
+        ssort(b"class A:\n    def a(self):\n        pass\n")
+
+    assert set(recorder.totals()) == {
+        "detect_encoding",
+        "decode",
+        "parse",
+        "split",
+        "requirements",
+        "graph",
+        "replace_cycles",
+        "topological_sort",
+        "sort_class",
+        "render",
+    }
+
+
+def test_format_stats() -> None:
+    lines = format_stats(
+        [
+            ("a.py", {"parse": 1.0, "read": 0.5}),
+            ("b.py", {"parse": 2.0}),
+            ("c.py", {"parse": 0.25}),
+        ],
+        top=2,
+    )
+
+    assert lines[0].split() == ["phase", "total", "share"]
+    assert lines[1].split() == ["read", "0.500s", "13.3%"]
+    assert lines[2].split() == ["parse", "3.250s", "86.7%"]
+    assert lines[3].split() == ["total", "3.750s"]
+    assert lines[4] == "slowest files:\n"
+    assert lines[5].split() == ["2.000s", "b.py", "(parse", "2.000s)"]
+    assert lines[6].split() == [
+        "1.500s",
+        "a.py",
+        "(parse",
+        "1.000s,",
+        "read",
+        "0.500s)",
+    ]
+    assert len(lines) == 7
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import concurrent.futures
+import io
+import threading
+
+from ssort._progress import Progress, _format_duration
+
+
+def test_format_duration() -> None:
+    assert _format_duration(5.9) == "5s"
+    assert _format_duration(65) == "1m05s"
+    assert _format_duration(3 * 3600 + 7 * 60) == "3h07m"
+
+
+def test_progress_line() -> None:
+    progress = Progress(4, None)
+    for index in range(3):
+        progress.start(index, f"file_{index}.py")
+    progress.read(100)
+    progress.cached()
+
+    assert list(progress.track([(0, "a"), (1, "b")])) == [(0, "a"), (1, "b")]
+
+    line = progress.line()
+    assert line.startswith("2/4 files, ")
+    assert "50% cached" in line
+    assert "ETA " in line
+    assert "slowest file_2.py" in line
+
+
+def test_progress_track_erases_line() -> None:
+    stream = io.StringIO()
+    progress = Progress(2, stream, interval=0)
+
+    for _ in progress.track([(0, "a"), (1, "b")]):
+        # Nothing that the caller writes should follow a partial line.
+        output = stream.getvalue()
+        assert not output or output.endswith(("\n", "\r"))
+        stream.write("message\n")
+
+    output = stream.getvalue()
+    assert "1/2 files" in output
+    assert output.endswith("\r")
+    assert output.replace("\r", "\n").splitlines()[-1].strip() == ""
+
+
+def test_progress_without_stream() -> None:
+    progress = Progress(1, None, interval=0)
+
+    assert list(progress.track([(0, "a")])) == [(0, "a")]
+
+
+def test_progress_redraws_while_waiting() -> None:
+    stream = io.StringIO()
+    progress = Progress(1, stream, interval=0.01)
+    progress.start(0, "slow.py")
+    future: concurrent.futures.Future[str] = concurrent.futures.Future()
+    threading.Timer(0.2, future.set_result, ["a"]).start()
+
+    for _ in progress.track([(0, future)]):
+        # The line kept being redrawn while the result was outstanding, and
+        # was erased before it was passed on.
+        assert stream.getvalue().count("slowest slow.py") > 1
+        assert stream.getvalue().endswith("\r")
@@ -1,9 +1,13 @@
+import concurrent.futures
 import pathlib
 
 from ssort import ssort
 
 
 def pytest_generate_tests(metafunc):
+    if "sample" not in metafunc.fixturenames:
+        return
+
     samples_dir = pathlib.Path("test_data/samples")
 
     samples = []
@@ -53,3 +57,29 @@ def test_idempotent(sample):
     )
 
     assert resorted_text == sorted_text
+
+
+def test_samples_threaded():
+    # Sorting many files at once from different threads should give exactly
+    # the same results as sorting them one at a time.
+    samples_dir = pathlib.Path("test_data/samples")
+    input_paths = sorted(samples_dir.glob("*_input.py"))
+
+    def _sort(input_path):
+        return ssort(
+            input_path.read_bytes(),
+            filename=str(input_path),
+            on_wildcard_import=lambda **kwargs: None,
+        )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        actual = list(executor.map(_sort, input_paths * 4))
+
+    expected = [
+        (
+            samples_dir / f"{path.name[: -len('_input.py')]}_output.py"
+        ).read_bytes()
+        for path in input_paths
+    ] * 4
+
+    assert actual == expected
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+
+import pytest
+
+from ssort._executors import SerialExecutor, completed
+from ssort._scheduling import (
+    estimate_costs,
+    largest_first,
+    run_as_completed,
+    run_in_order,
+)
+
+
+def test_estimate_costs_from_sizes() -> None:
+    assert estimate_costs([10, 30, 20], [None, None, None]) == [10, 30, 20]
+
+
+def test_estimate_costs_prefers_timings() -> None:
+    # The first file took 1 second for 10 bytes, so the second file, which
+    # hasn't been timed, is estimated at 2 seconds.
+    assert estimate_costs([10, 20, 30], [1.0, None, 0.5]) == pytest.approx(
+        [1.0, 20 * 1.5 / 40, 0.5]
+    )
+
+
+def test_largest_first() -> None:
+    assert largest_first([1, 3, 2, 3]) == [1, 3, 2, 0]
+
+
+def test_run_in_order_serial() -> None:
+    started = []
+
+    def _start(index: int) -> concurrent.futures.Future[int]:
+        started.append(index)
+        return SerialExecutor().submit(lambda: index * 10)
+
+    results = [
+        (index, future.result())
+        for index, future in run_in_order(_start, [2, 0, 1], window=1)
+    ]
+
+    assert started == [2, 0, 1]
+    assert results == [(0, 0), (1, 10), (2, 20)]
+
+
+def test_run_in_order_reports_in_index_order() -> None:
+    # The first task is started last, and so nothing can be reported until
+    # all of the others have been started.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+
+        def _start(index: int) -> concurrent.futures.Future[int]:
+            if index == 0:
+                return completed(0)
+            return executor.submit(lambda: index)
+
+        results = [
+            (index, future.result())
+            for index, future in run_in_order(_start, [3, 2, 1, 0], window=2)
+        ]
+
+    assert results == [(0, 0), (1, 1), (2, 2), (3, 3)]
+
+
+def test_run_in_order_limits_running_tasks() -> None:
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def _task() -> None:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        threading.Event().wait(0.01)
+        with lock:
+            running -= 1
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        for _, future in run_in_order(
+            lambda index: executor.submit(_task), range(20), window=3
+        ):
+            future.result()
+
+    assert peak <= 3
+
+
+def test_run_in_order_limits_bytes() -> None:
+    sizes = [10] * 20
+    held = 0
+    peak = 0
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+
+        def _start(index: int) -> concurrent.futures.Future[int]:
+            nonlocal held, peak
+            held += sizes[index]
+            peak = max(peak, held)
+            return executor.submit(lambda: index)
+
+        # Starting in reverse order means that nothing can be yielded until
+        # the first task is started, which the limit forces to happen early.
+        results = []
+        for index, future in run_in_order(
+            _start,
+            reversed(range(20)),
+            window=8,
+            sizes=sizes,
+            max_bytes=35,
+        ):
+            results.append(future.result())
+            held -= sizes[index]
+
+    assert results == list(range(20))
+    # Only the next task to be yielded may go over the limit.
+    assert peak <= 35 + 10
+
+
+def test_run_as_completed_yields_in_completion_order() -> None:
+    release = threading.Event()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+
+        def _start(index: int) -> concurrent.futures.Future[int]:
+            if index == 0:
+                return executor.submit(lambda: release.wait() and index)
+            return executor.submit(lambda: index)
+
+        results = []
+        for index, future in run_as_completed(_start, range(4), window=2):
+            results.append(future.result())
+            if index == 3:
+                release.set()
+
+    assert results == [1, 2, 3, 0]
+
+
+def test_run_as_completed_limits_running_tasks() -> None:
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def _task() -> None:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        threading.Event().wait(0.01)
+        with lock:
+            running -= 1
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        indices = [
+            index
+            for index, future in run_as_completed(
+                lambda index: executor.submit(_task), range(20), window=3
+            )
+        ]
+
+    assert sorted(indices) == list(range(20))
+    assert peak <= 3
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pathlib
+
+import pytest
+
+from ssort._shards import shard_by_path, shard_by_size
+
+_PATHS = [pathlib.Path(f"src/module_{index}.py") for index in range(50)]
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7])
+def test_shard_by_path_partitions(count: int) -> None:
+    shards = [
+        shard_by_path(_PATHS, index, count) for index in range(1, count + 1)
+    ]
+
+    assert sorted(path for shard in shards for path in shard) == sorted(_PATHS)
+    for shard in shards:
+        assert shard == [path for path in _PATHS if path in shard]
+
+
+def test_shard_by_path_is_stable() -> None:
+    # Removing a file mustn't move any other file to a different shard.
+    before = shard_by_path(_PATHS, 1, 3)
+    after = shard_by_path(_PATHS[1:], 1, 3)
+
+    assert [path for path in before if path != _PATHS[0]] == after
+
+
+def test_shard_by_path_is_deterministic() -> None:
+    assert shard_by_path(_PATHS, 2, 3) == shard_by_path(list(_PATHS), 2, 3)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7])
+def test_shard_by_size_partitions(count: int) -> None:
+    sizes = [(index * 7919) % 1000 for index in range(len(_PATHS))]
+    shards = [
+        shard_by_size(_PATHS, sizes, index, count)
+        for index in range(1, count + 1)
+    ]
+
+    assert sorted(path for shard in shards for path in shard) == sorted(_PATHS)
+
+
+def test_shard_by_size_balances() -> None:
+    paths = [pathlib.Path(name) for name in ["a", "b", "c", "d", "e"]]
+    sizes = [100, 60, 50, 30, 20]
+
+    assert shard_by_size(paths, sizes, 1, 2) == [paths[0], paths[3]]
+    assert shard_by_size(paths, sizes, 2, 2) == [
+        paths[1],
+        paths[2],
+        paths[4],
+    ]
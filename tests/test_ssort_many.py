@@ -0,0 +1,222 @@
+import concurrent.futures
+import pickle
+import threading
+import weakref
+
+import pytest
+
+from ssort import (
+    ParseError,
+    ResolutionError,
+    UnknownEncodingError,
+    WildcardImportError,
+    ssort,
+    ssort_many,
+)
+from ssort._executors import SerialExecutor
+
+_UNSORTED = "b = a\na = 1\n"
+_SORTED = "a = 1\nb = a\n"
+
+
+def test_ssort_many_in_order():
+    texts = [
+        ("first.py", _UNSORTED),
+        ("second.py", _UNSORTED.encode()),
+        ("third.py", _SORTED),
+    ]
+
+    assert list(ssort_many(texts)) == [
+        ("first.py", _SORTED),
+        ("second.py", _SORTED.encode()),
+        ("third.py", _SORTED),
+    ]
+
+
+def test_ssort_many_matches_ssort():
+    texts = [(f"{index}.py", f"x{index} = y\ny = 1\n") for index in range(5)]
+
+    assert list(ssort_many(texts)) == [
+        (name, ssort(text)) for name, text in texts
+    ]
+
+
+def test_ssort_many_as_completed():
+    texts = [(f"{index}.py", f"x{index} = y\ny = 1\n") for index in range(20)]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            ssort_many(texts, executor=executor, ordered=False, max_pending=3)
+        )
+
+    assert sorted(results) == sorted(
+        (name, ssort(text)) for name, text in texts
+    )
+
+
+def test_ssort_many_is_lazy():
+    consumed = 0
+
+    def _texts():
+        nonlocal consumed
+        for index in range(10):
+            consumed += 1
+            yield f"{index}.py", _UNSORTED
+
+    results = ssort_many(_texts(), max_pending=2)
+
+    assert next(results) == ("0.py", _SORTED)
+    assert consumed <= 2
+
+
+def test_ssort_many_is_bounded_behind_slow_text():
+    consumed = 0
+    consumed_while_slow = []
+
+    def _on_unresolved(message, **kwargs):
+        # Give the other worker time to race ahead.
+        threading.Event().wait(0.2)
+        consumed_while_slow.append(consumed)
+
+    def _texts():
+        nonlocal consumed
+        for index in range(20):
+            consumed += 1
+            yield f"{index}.py", "a = b\n" if index == 0 else "a = 1\n"
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(
+            ssort_many(
+                _texts(),
+                on_unresolved=_on_unresolved,
+                executor=executor,
+                max_pending=3,
+            )
+        )
+
+    assert len(results) == 20
+    # One more text than `max_pending` may have been taken from the input
+    # while waiting for room to start it.
+    assert consumed_while_slow[0] <= 4
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_ssort_many_callbacks_get_filename(ordered):
+    unresolved = []
+
+    def _on_unresolved(message, *, name, filename, **kwargs):
+        unresolved.append((filename, name))
+
+    texts = [("a.py", "b = c\n"), ("b.py", "b = c\n"), ("c.py", "b = d\n")]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(
+            ssort_many(
+                texts,
+                on_unresolved=_on_unresolved,
+                executor=executor,
+                ordered=ordered,
+            )
+        )
+
+    assert sorted(results) == texts
+    # Texts with the same content are sorted, and reported, separately.
+    assert sorted(unresolved) == [("a.py", "c"), ("b.py", "c"), ("c.py", "d")]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_ssort_many_continues_after_error(ordered):
+    errors = []
+
+    def _on_parse_error(message, *, lineno, filename, **kwargs):
+        errors.append((filename, lineno))
+
+    texts = [("a.py", _UNSORTED), ("b.py", "x = (\n"), ("c.py", _UNSORTED)]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(
+            ssort_many(
+                texts,
+                on_parse_error=_on_parse_error,
+                executor=executor,
+                ordered=ordered,
+            )
+        )
+
+    assert sorted(results) == [
+        ("a.py", _SORTED),
+        ("b.py", "x = (\n"),
+        ("c.py", _SORTED),
+    ]
+    assert errors == [("b.py", 1)]
+
+
+def test_ssort_many_releases_results():
+    futures = []
+
+    class _Executor(SerialExecutor):
+        def submit(self, fn, /, *args, **kwargs):
+            future = super().submit(fn, *args, **kwargs)
+            futures.append(weakref.ref(future))
+            return future
+
+    texts = ((f"{index}.py", f"x{index} = 1\n") for index in range(20))
+    results = ssort_many(texts, executor=_Executor(), max_pending=2)
+
+    for _ in range(10):
+        next(results)
+
+    assert len(futures) >= 10
+    assert sum(future() is not None for future in futures) <= 2
+
+
+def test_ssort_many_raises_in_order():
+    texts = [("good.py", _UNSORTED), ("bad.py", "a = (\n")]
+
+    results = ssort_many(texts)
+
+    assert next(results) == ("good.py", _SORTED)
+    with pytest.raises(ParseError):
+        next(results)
+    # Raising ends the batch.
+    assert list(results) == []
+
+
+def test_ssort_many_ignore():
+    texts = [("bad.py", "a = (\n"), ("good.py", _UNSORTED)]
+
+    assert list(ssort_many(texts, on_parse_error="ignore")) == [
+        ("bad.py", "a = (\n"),
+        ("good.py", _SORTED),
+    ]
+
+
+def test_ssort_many_process_pool():
+    texts = [("good.py", _UNSORTED), ("bad.py", "a = 1\nb = (\n")]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        results = ssort_many(texts, executor=executor)
+
+        assert next(results) == ("good.py", _SORTED)
+        with pytest.raises(ParseError) as exc_info:
+            next(results)
+
+    assert exc_info.value.lineno == 2
+
+
+@pytest.mark.parametrize(
+    "exception",
+    [
+        UnknownEncodingError("message", encoding="invalid"),
+        ParseError("message", lineno=1, col_offset=2),
+        ResolutionError("message", name="name", lineno=1, col_offset=2),
+        WildcardImportError("message", lineno=1, col_offset=2),
+    ],
+    ids=lambda exception: type(exception).__name__,
+)
+def test_exceptions_can_be_pickled(exception):
+    copy = pickle.loads(pickle.dumps(exception))
+
+    assert type(copy) is type(exception)
+    assert copy.args == exception.args
+    assert vars(copy) == vars(exception)
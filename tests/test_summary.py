@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import pathlib
+
+import pytest
+
+from ssort._summary import (
+    Summary,
+    SummaryError,
+    dump_summary,
+    load_summary,
+    merge_summaries,
+)
+
+
+def test_summary_roundtrip(tmp_path: pathlib.Path) -> None:
+    summary = Summary(
+        check=True,
+        unsorted=1,
+        unchanged=2,
+        unsortable=3,
+        skipped=4,
+        shard=(2, 4),
+    )
+    dump_summary(summary, tmp_path / "summary.json")
+
+    assert load_summary(tmp_path / "summary.json") == summary
+
+
+def test_load_summary_missing(tmp_path: pathlib.Path) -> None:
+    with pytest.raises(SummaryError, match="could not read"):
+        load_summary(tmp_path / "summary.json")
+
+
+def test_load_summary_invalid(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "summary.json").write_text('{"check": true, "unsorted": -1}')
+
+    with pytest.raises(SummaryError, match="must be a non-negative integer"):
+        load_summary(tmp_path / "summary.json")
+
+
+def test_merge_summaries() -> None:
+    merged = merge_summaries(
+        [
+            Summary(check=True, unsorted=1, unchanged=2, shard=(1, 2)),
+            Summary(check=True, unchanged=3, unsortable=1, shard=(2, 2)),
+        ]
+    )
+
+    assert merged == Summary(check=True, unsorted=1, unchanged=5, unsortable=1)
+
+
+def test_merge_summaries_missing_shard() -> None:
+    with pytest.raises(SummaryError, match="missing summary for shard 2/3"):
+        merge_summaries(
+            [
+                Summary(check=True, shard=(1, 3)),
+                Summary(check=True, shard=(3, 3)),
+            ]
+        )
+
+
+def test_merge_summaries_duplicate_shard() -> None:
+    with pytest.raises(SummaryError, match="duplicate summaries for shard"):
+        merge_summaries(
+            [
+                Summary(check=True, shard=(1, 2)),
+                Summary(check=True, shard=(1, 2)),
+                Summary(check=True, shard=(2, 2)),
+            ]
+        )
+
+
+def test_merge_summaries_mixed_check() -> None:
+    with pytest.raises(SummaryError, match="with and without --check"):
+        merge_summaries([Summary(check=True), Summary(check=False)])
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import time
+
+from ssort._trace import Trace, worker_id
+
+
+def test_worker_id() -> None:
+    pid, tid = worker_id()
+    assert pid == os.getpid()
+    assert tid
+
+
+def test_trace_dump(tmp_path: pathlib.Path) -> None:
+    trace = Trace()
+    start = time.perf_counter()
+    trace.add(
+        "parse",
+        start,
+        0.5,
+        worker=(1, 2),
+        thread_name="worker",
+        args={"path": "a.py"},
+    )
+    trace.add("split", start + 0.5, 0.25, worker=(1, 2), thread_name="worker")
+    trace.dump(tmp_path / "trace.json")
+
+    document = json.loads((tmp_path / "trace.json").read_text())
+    metadata, parse, split = document["traceEvents"]
+
+    assert metadata == {
+        "name": "thread_name",
+        "ph": "M",
+        "pid": 1,
+        "tid": 2,
+        "args": {"name": "worker"},
+    }
+    assert parse["name"] == "parse"
+    assert parse["ph"] == "X"
+    assert (parse["pid"], parse["tid"]) == (1, 2)
+    assert parse["dur"] == 500_000
+    assert parse["args"] == {"path": "a.py"}
+    assert split["ts"] - parse["ts"] == 500_000
+    assert "args" not in split